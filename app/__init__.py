@@ -1,10 +1,82 @@
+import inspect
+from contextlib import contextmanager
+from functools import wraps
 from flask import Flask
 from flask_moment import Moment
-from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy import SignallingSession, SQLAlchemy
+from sqlalchemy import orm
 from config import config
 
+
+class RoutingSession(SignallingSession):
+    """
+    Session sending the statements of read_only calls to the READ_REPLICA_BIND engine and all others,
+    writes included, to the primary. Once the session has written, by a flush or an UPDATE, INSERT or
+    DELETE statement, reads stay on the primary until the session is removed at the end of the request,
+    so a request reads its own writes. Without READ_REPLICA_BIND everything goes to the primary.
+    Writes also mark the transaction as written until it ends, for response_cache to bump the data version.
+    """
+
+    def get_bind(self, mapper=None, clause=None):
+        if self._flushing or getattr(clause, 'is_dml', False):
+            self.info['pinned'] = True
+            self.info['written'] = True
+        elif self.info.get('read_only') and not self.info.get('pinned'):
+            replica_bind = self.app.config['READ_REPLICA_BIND']
+            if replica_bind is not None and (mapper is None or
+                                             mapper.persist_selectable.info.get('bind_key') is None):
+                return db.get_engine(self.app, bind=replica_bind)
+        return super().get_bind(mapper, clause)
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    def create_session(self, options):
+        """
+        Creates the session factory of RoutingSession
+        :param options:
+        :return: sessionmaker
+        """
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+
 moment = Moment()
-db = SQLAlchemy()
+db = RoutingSQLAlchemy()
+
+
+def read_only(func):
+    """
+    Decorator of service functions which only read, sending their queries to the read replica.
+    Calls made while a read_only call runs are read only too, generators while they are iterated.
+    :param func:
+    :return: function
+    """
+    if inspect.isgeneratorfunction(func):
+        @wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            with reading(db.session()):
+                yield from func(*args, **kwargs)
+        return generator_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with reading(db.session()):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def reading(session):
+    """
+    Marks the session read only while the block runs, restoring the previous mark afterwards
+    :param session:
+    :return: session
+    """
+    previous = session.info.get('read_only', False)
+    session.info['read_only'] = True
+    try:
+        yield session
+    finally:
+        session.info['read_only'] = previous
 
 
 def create_app(config_name):
@@ -13,8 +85,18 @@ def create_app(config_name):
     config[config_name].init_app(app)
 
     moment.init_app(app)
+    from . import sqlite_pragmas
     db.init_app(app)
 
+    from . import json_serializer, response_cache, query_stats
+    json_serializer.init_app(app)
+    response_cache.init_app(app)
+    query_stats.init_app(app)
+
+    from .service import item_index, item_cache
+    item_index.init_app(app)
+    item_cache.init_app(app)
+
     from .api import api as api_blueprint
     app.register_blueprint(api_blueprint, url_prefix='/api/v1')
 
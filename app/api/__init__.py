@@ -2,4 +2,4 @@ from flask import Blueprint
 
 api = Blueprint('api', __name__)
 
-from . import shopping_list, shopping_list_search
+from . import shopping_list, shopping_list_search, shopping_list_summary
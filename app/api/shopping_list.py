@@ -1,8 +1,12 @@
-from flask_restful import reqparse, abort, Api, Resource
+from flask import current_app
+from flask_restful import abort, Api, Resource
 from . import api as api_blueprint
+from .validation import Field, JsonBody
+from app.json_serializer import output_json
 from app.service import shopping_service
 
 api = Api(api_blueprint)
+api.representation('application/json')(output_json)
 
 
 class ShoppingList(Resource):
@@ -11,8 +15,7 @@ class ShoppingList(Resource):
         Restful endpoint to add a new shopping list.
         :return: shopping_list_id
         """
-        parser = get_shopping_list_post_req_parser()
-        args = parser.parse_args()
+        args = shopping_list_post_body.parse()
         title = args['title']
         store_name = args['store']
         shopping_list_id = shopping_service.add_shopping_list(title, store_name)
@@ -25,14 +28,15 @@ class ShoppingList(Resource):
         Restful endpoint to update title/store_name of the shopping list
         :return: shopping_list_id
         """
-        parser = get_shopping_list_put_req_parser()
-        args = parser.parse_args()
+        args = shopping_list_put_body.parse()
         shopping_list_id = args['id']
         title = args['title']
         store_name = args['store']
         if not title and not store_name:
             abort(400, message='Either title or store name is required')
         shopping_list_id = shopping_service.update_shopping_list(shopping_list_id, title, store_name)
+        if shopping_list_id is None:
+            abort(409, message='Shopping List already exist')
         if not shopping_list_id:
             abort(409, message='Shopping List does not exist')
         return {"shopping_list_id": shopping_list_id}, 201
@@ -42,8 +46,7 @@ class ShoppingList(Resource):
         Restful endpoint to delete the shopping list
         :return:
         """
-        parser = get_shopping_list_delete_req_parser()
-        args = parser.parse_args()
+        args = shopping_list_delete_body.parse()
         shopping_list_id = args['id']
         shopping_list_id = shopping_service.delete_shopping_list(shopping_list_id)
         if not shopping_list_id:
@@ -51,14 +54,51 @@ class ShoppingList(Resource):
         return '', 204
 
 
+class ShoppingListBatch(Resource):
+    def post(self):
+        """
+        Restful endpoint to add many shopping lists in one transaction.
+        Every entry gets either its shopping_list_id or a message if it already exist.
+        :return: list of results in request order
+        """
+        args = shopping_lists_post_body.parse()
+        title_store_names = args['shopping_lists']
+        shopping_list_ids = shopping_service.add_shopping_lists(title_store_names)
+        data = []
+        for (title, store_name), shopping_list_id in zip(title_store_names, shopping_list_ids):
+            result = {"title": title, "store": store_name}
+            if shopping_list_id:
+                result["shopping_list_id"] = shopping_list_id
+            else:
+                result["message"] = 'Shopping List already exist'
+            data.append(result)
+        return {"shopping_lists": data}, 201
+
+    def delete(self):
+        """
+        Restful endpoint to delete many shopping lists in one transaction.
+        Every entry gets a message if the shopping list does not exist.
+        :return: list of results in request order
+        """
+        args = shopping_lists_delete_body.parse()
+        shopping_list_ids = args['ids']
+        deleted_ids = shopping_service.delete_shopping_lists(shopping_list_ids)
+        data = []
+        for shopping_list_id, deleted_id in zip(shopping_list_ids, deleted_ids):
+            result = {"shopping_list_id": shopping_list_id}
+            if not deleted_id:
+                result["message"] = 'Shopping List does not exist'
+            data.append(result)
+        return {"shopping_lists": data}, 200
+
+
 class ShoppingListItem(Resource):
     def put(self):
         """
         Restful endpoint to add item in the shopping list
         :return: shopping list contents
         """
-        parser = get_shopping_list_item_put_req_parser()
-        args = parser.parse_args()
+        args = shopping_list_item_put_body.parse()
         shopping_list_id = args['shopping_list_id']
         item_id = args['item_id']
         quantity = args['quantity']
@@ -76,39 +116,86 @@ class ShoppingListItem(Resource):
         return data, 201
 
 
-def get_shopping_list_post_req_parser():
-    """
-    Creates request parser for ShoppingList.post method
-    :return: parser
-    """
-    parser = reqparse.RequestParser()
-    parser.add_argument('title', type=non_empty_string_argument, required=True, location='json')
-    parser.add_argument('store', type=non_empty_string_argument, required=True, location='json')
-    return parser
+class ShoppingListItemBatch(Resource):
+    def put(self):
+        """
+        Restful endpoint to add many items in the shopping list in one transaction
+        :return: shopping list contents
+        """
+        args = shopping_list_items_put_body.parse()
+        shopping_list_id = args['shopping_list_id']
+        item_quantities = args['items']
 
+        items = shopping_service.get_items([item_id for item_id, quantity in item_quantities])
+        if len(items) != len({item_id for item_id, quantity in item_quantities}):
+            abort(409, message='Item does not exist')
 
-def get_shopping_list_put_req_parser():
-    """
-    Creates request parser for ShoppingList.put method
-    :return: parser
-    """
-    parser = reqparse.RequestParser()
-    parser.add_argument('id', type=int, required=True, location='json')
-    parser.add_argument('title', type=str, required=False, location='json')
-    parser.add_argument('store', type=str, required=False, location='json')
-    return parser
+        shopping_list = shopping_service.get_shopping_list(shopping_list_id)
+        if not shopping_list:
+            abort(409, message='Shopping List does not exist')
+
+        data = shopping_service.add_items_to_shopping_list(
+            shopping_list, [(items[item_id], quantity) for item_id, quantity in item_quantities])
+
+        return data, 201
 
 
-def get_shopping_list_item_put_req_parser():
+def title_store_names_argument(value, name):
     """
-    Creates request parser for ShoppingListItem.put method
-    :return: parser
+    Validates if the request parameter is a non empty list of {title, store} with non empty strings
+    and at most SHOPPING_LIST_BULK_SIZE entries
+    :param value:
+    :param name:
+    :return: list of (title, store)
+    """
+    if not isinstance(value, list) or not value:
+        raise ValueError('{} is not provided'.format(name))
+    bulk_size = current_app.config['SHOPPING_LIST_BULK_SIZE']
+    if len(value) > bulk_size:
+        raise ValueError('{} can not have more than {} entries'.format(name, bulk_size))
+    title_store_names = []
+    for entry in value:
+        if not isinstance(entry, dict) or not isinstance(entry.get('title'), str) or \
+                not isinstance(entry.get('store'), str) or not entry['title'] or not entry['store']:
+            raise ValueError('{} must be a list of title and store'.format(name))
+        title_store_names.append((entry['title'], entry['store']))
+    return title_store_names
+
+
+def item_quantities_argument(value, name):
     """
-    parser = reqparse.RequestParser()
-    parser.add_argument('shopping_list_id', type=int, required=True, location='json')
-    parser.add_argument('item_id', type=int, required=True, location='json')
-    parser.add_argument('quantity', type=int, required=True, location='json')
-    return parser
+    Validates if the request parameter is a non empty list of {item_id, quantity}
+    with at most SHOPPING_LIST_ITEMS_BATCH_SIZE entries
+    :param value:
+    :param name:
+    :return: list of (item_id, quantity)
+    """
+    if not isinstance(value, list) or not value:
+        raise ValueError('{} is not provided'.format(name))
+    batch_size = current_app.config['SHOPPING_LIST_ITEMS_BATCH_SIZE']
+    if len(value) > batch_size:
+        raise ValueError('{} can not have more than {} entries'.format(name, batch_size))
+    item_quantities = []
+    for entry in value:
+        if not isinstance(entry, dict) or 'item_id' not in entry or 'quantity' not in entry:
+            raise ValueError('{} must be a list of item_id and quantity'.format(name))
+        item_quantities.append((integer_argument(entry['item_id'], '{} item_id'.format(name)),
+                                integer_argument(entry['quantity'], '{} quantity'.format(name))))
+    return item_quantities
+
+
+def integer_argument(value, name):
+    """
+    Converts the request parameter to int, as a ValueError naming the parameter when it is not a number.
+    A TypeError would make the body parser retry the validator without the name.
+    :param value:
+    :param name:
+    :return: int value
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError('{} must be an integer'.format(name))
 
 
 def non_empty_string_argument(value, name):
@@ -123,15 +210,35 @@ def non_empty_string_argument(value, name):
     return value
 
 
-def get_shopping_list_delete_req_parser():
+def shopping_list_ids_argument(value, name):
     """
-    Creates request parser for ShoppingList.put method
-    :return: parser
+    Validates if the request parameter is a non empty list of shopping list ids
+    with at most SHOPPING_LIST_BULK_SIZE entries
+    :param value:
+    :param name:
+    :return: list of shopping_list_id
     """
-    parser = reqparse.RequestParser()
-    parser.add_argument('id', type=int, required=True, location='json')
-    return parser
-
+    if not isinstance(value, list) or not value:
+        raise ValueError('{} is not provided'.format(name))
+    bulk_size = current_app.config['SHOPPING_LIST_BULK_SIZE']
+    if len(value) > bulk_size:
+        raise ValueError('{} can not have more than {} entries'.format(name, bulk_size))
+    return [integer_argument(shopping_list_id, '{} entry'.format(name)) for shopping_list_id in value]
+
+
+shopping_list_post_body = JsonBody(Field('title', non_empty_string_argument, required=True),
+                                   Field('store', non_empty_string_argument, required=True))
+shopping_lists_post_body = JsonBody(Field('shopping_lists', title_store_names_argument, required=True))
+shopping_list_put_body = JsonBody(Field('id', int, required=True), Field('title', str), Field('store', str))
+shopping_list_item_put_body = JsonBody(Field('shopping_list_id', int, required=True),
+                                       Field('item_id', int, required=True),
+                                       Field('quantity', int, required=True))
+shopping_list_items_put_body = JsonBody(Field('shopping_list_id', int, required=True),
+                                        Field('items', item_quantities_argument, required=True))
+shopping_list_delete_body = JsonBody(Field('id', int, required=True))
+shopping_lists_delete_body = JsonBody(Field('ids', shopping_list_ids_argument, required=True))
 
 api.add_resource(ShoppingList, '/shoppingList')
+api.add_resource(ShoppingListBatch, '/shoppingLists')
 api.add_resource(ShoppingListItem, '/shoppingListItem')
+api.add_resource(ShoppingListItemBatch, '/shoppingListItems')
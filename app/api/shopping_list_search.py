@@ -1,59 +1,256 @@
-from flask_restful import reqparse, abort, Api, output_json
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, request, Response, stream_with_context
+from flask_restful import reqparse, abort, inputs, Api
 from . import api as api_blueprint
+from app.json_serializer import get_serializer, output_json
+from app.response_cache import get_response_cache, read_data_version
 from app.service import shopping_service
+from app.service.fieldsets import create_fieldset, fields_argument, include_argument
 
 api = Api(api_blueprint)
+api.representation('application/json')(output_json)
+
+
+@api_blueprint.errorhandler(400)
+def bad_request(error):
+    """
+    Renders request parser errors of the search endpoints as json like the restful resources do
+    :param error:
+    :return: data
+    """
+    return output_json(getattr(error, 'data', {'message': error.description}), 400)
+
+
+def cached_response(view):
+    """
+    Serves the view from the response cache, keyed on the path and query parameters.
+    Entries are stored at the data version read before rendering, so a write during rendering
+    leaves the entry unreachable instead of stale.
+    :param view:
+    :return: view
+    """
+    @wraps(view)
+    def cached_view(*args, **kwargs):
+        cache = get_response_cache()
+        if cache is None:
+            return view(*args, **kwargs)
+        version = read_data_version()
+        key = request.path + '?' + urlencode(sorted(request.args.items(multi=True)))
+        cached = cache.get(version, key)
+        if cached is not None:
+            body, status, headers = cached
+            return Response(body, status, headers=headers).make_conditional(request)
+        response = view(*args, **kwargs)
+        if response.status_code == 200 and not response.is_streamed:
+            headers = [(name, value) for name, value in response.headers if name in ('Content-Type', 'ETag')]
+            cache.set(version, key, response.get_data(), response.status_code, headers)
+        return response
+    return cached_view
 
 
 @api_blueprint.route('/allShoppingList', methods=['GET'])
+@cached_response
 def get_all_shopping_list():
     """
-    Restful endpoint to get all shopping lists with items
+    Restful endpoint to get all shopping lists with items.
+    With stream=true the whole json array is sent as a chunked response, one shopping list at a time.
     :return: data
     """
-    data = shopping_service.get_all_shopping_list()
-    return output_json(data, 200)
+    limit, cursor = get_pagination_args()
+    fieldset = get_fieldset()
+    if get_stream_req_parser().parse_args()['stream']:
+        if limit is not None:
+            abort(400, message='stream can not be combined with limit or cursor')
+        batch_size = current_app.config['SHOPPING_LIST_STREAM_BATCH_SIZE']
+        data = shopping_service.iter_all_shopping_list(batch_size, fieldset)
+        return Response(stream_with_context(stream_json_array(data)), 200, mimetype='application/json')
+    return conditional_output(shopping_service.get_all_shopping_list, limit, cursor, fieldset=fieldset)
 
 
 @api_blueprint.route('/shoppingListByTitle/<title>', methods=['GET'])
+@cached_response
 def get_shopping_list_by_title(title):
     """
     Restful endpoint to get all shopping lists based on title
     :param title:
     :return: data
     """
-    data = shopping_service.get_shopping_list_by_title(title)
-    return output_json(data, 200)
+    limit, cursor = get_pagination_args()
+    return conditional_output(shopping_service.get_shopping_list_by_title, title, limit, cursor,
+                              fieldset=get_fieldset())
 
 
 @api_blueprint.route('/searchShoppingListsByTitle/<title>', methods=['GET'])
+@cached_response
 def search_shopping_list_by_title_keyword(title):
     """
     Restful endpoint to get all shopping lists which contains given keyword in title
     :param title:
     :return: data
     """
-    data = shopping_service.search_shopping_list_by_title_keyword(title)
-    return output_json(data, 200)
+    limit, cursor = get_pagination_args()
+    return conditional_output(shopping_service.search_shopping_list_by_title_keyword, title, limit, cursor,
+                              fieldset=get_fieldset())
 
 
 @api_blueprint.route('/shoppingListByItemId/<int:item_id>', methods=['GET'])
+@cached_response
 def get_shopping_list_by_item_id(item_id):
     """
     Restful endpoint to get all shopping lists containing given item
     :param item_id:
     :return: data
     """
-    data = shopping_service.get_shopping_list_by_item_id(item_id)
-    return output_json(data, 200)
+    limit, cursor = get_pagination_args()
+    return conditional_output(shopping_service.get_shopping_list_by_item_id, item_id, limit, cursor,
+                              fieldset=get_fieldset())
 
 
 @api_blueprint.route('/searchShoppingListByItemName/<title>', methods=['GET'])
+@cached_response
 def search_shopping_list_by_item_name_keyword(title):
     """
     Restful endpoint to get all shopping lists having item which contains given keyword in tile
     :param title:
     :return: data
     """
-    data = shopping_service.search_shopping_list_by_item_name_keyword(title)
-    return output_json(data, 200)
\ No newline at end of file
+    limit, cursor = get_pagination_args()
+    return conditional_output(shopping_service.search_shopping_list_by_item_name_keyword, title, limit, cursor,
+                              fieldset=get_fieldset())
+
+
+def conditional_output(search, *args, fieldset=None):
+    """
+    Renders the result of the service search as json with a strong ETag derived from the query parameters,
+    the revisions of the shopping lists and the titles of the items it was rendered from.
+    If-None-Match is answered with 304 Not Modified from the revisions and item titles alone, without rendering.
+    :param search: service read method accepting revisions_only, fieldset and with_version
+    :param args:
+    :param fieldset:
+    :return: response
+    """
+    if request.if_none_match:
+        etag = output_etag(search(*args, revisions_only=True, fieldset=fieldset))
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+    # the ETag of a rendered response comes from the rows it was rendered from, not from a query of its own
+    data, version = search(*args, fieldset=fieldset, with_version=True)
+    response = output_json(data, 200)
+    response.set_etag(output_etag(version))
+    return response
+
+
+def output_etag(version):
+    """
+    Creates the ETag of a response rendered from the given shopping list revisions and item titles
+    :param version: OutputVersion
+    :return: etag
+    """
+    digest = hashlib.sha1(urlencode(sorted(request.args.items(multi=True))).encode('utf-8'))
+    for shopping_list_id, revision in version.revisions:
+        digest.update(';{}:{}'.format(shopping_list_id, revision).encode('ascii'))
+    for item_id, title in version.item_titles:
+        digest.update(';item {}:{}'.format(item_id, title).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def stream_json_array(rows):
+    """
+    Serializes rows as a json array, yielding one chunk per row
+    :param rows:
+    :return: generator of chunks
+    """
+    dumps = get_serializer().dumps
+    separator = b'['
+    for row in rows:
+        yield separator + dumps(row)
+        separator = b','
+    yield b'[]' if separator == b'[' else b']'
+
+
+def get_stream_req_parser():
+    """
+    Creates request parser for the stream query parameter of get_all_shopping_list
+    :return: parser
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('stream', type=inputs.boolean, default=False, location='args')
+    return parser
+
+
+def get_pagination_args():
+    """
+    Reads limit and cursor query parameters of the search endpoints.
+    Both are None when the client does not ask for pagination.
+    A cursor without limit uses SHOPPING_LIST_PAGE_SIZE and
+    limit is capped at SHOPPING_LIST_MAX_PAGE_SIZE.
+    :return: limit, cursor
+    """
+    args = get_pagination_req_parser().parse_args()
+    limit = args['limit']
+    cursor = args['cursor']
+    if limit is None and cursor is None:
+        return None, None
+    if limit is None:
+        limit = current_app.config['SHOPPING_LIST_PAGE_SIZE']
+    return min(limit, current_app.config['SHOPPING_LIST_MAX_PAGE_SIZE']), cursor
+
+
+def get_pagination_req_parser():
+    """
+    Creates request parser for pagination query parameters
+    :return: parser
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('limit', type=positive_int_argument, required=False, location='args')
+    parser.add_argument('cursor', type=cursor_argument, required=False, location='args')
+    return parser
+
+
+def get_fieldset():
+    """
+    Reads fields and include query parameters of the search endpoints.
+    None when the client asks for neither, to render the full output.
+    :return: FieldSet or None
+    """
+    args = get_fieldset_req_parser().parse_args()
+    return create_fieldset(args['fields'], args['include'])
+
+
+def get_fieldset_req_parser():
+    """
+    Creates request parser for sparse fieldset query parameters
+    :return: parser
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('fields', type=fields_argument, required=False, location='args')
+    parser.add_argument('include', type=include_argument, required=False, location='args')
+    return parser
+
+
+def positive_int_argument(value, name):
+    """
+    Validates if the request parameter is a positive integer
+    :param value:
+    :param name:
+    :return: value
+    """
+    value = int(value)
+    if value < 1:
+        raise ValueError('{} must be a positive integer'.format(name))
+    return value
+
+
+def cursor_argument(value, name):
+    """
+    Validates if the request parameter is a cursor returned as next_cursor
+    :param value:
+    :param name:
+    :return: value
+    """
+    shopping_service.decode_cursor(value)
+    return value
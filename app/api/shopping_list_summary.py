@@ -0,0 +1,93 @@
+from datetime import date, datetime, timedelta
+from flask_restful import reqparse
+from . import api as api_blueprint
+from .shopping_list_search import cached_response, get_pagination_args
+from app.json_serializer import output_json
+from app.service import summary_service
+
+
+@api_blueprint.route('/summary/stores', methods=['GET'])
+@cached_response
+def get_store_summary():
+    """
+    Restful endpoint to get the number of shopping lists, items, quantity and totals per store
+    :return: data
+    """
+    created_from, created_to = get_created_time_args()
+    return output_json(summary_service.get_store_summary(created_from, created_to), 200)
+
+
+@api_blueprint.route('/summary/items', methods=['GET'])
+@cached_response
+def get_item_summary():
+    """
+    Restful endpoint to get the number of shopping lists, quantity and totals per item
+    :return: data
+    """
+    created_from, created_to = get_created_time_args()
+    return output_json(summary_service.get_item_summary(created_from, created_to), 200)
+
+
+@api_blueprint.route('/summary/shoppingLists', methods=['GET'])
+@cached_response
+def get_shopping_list_summary():
+    """
+    Restful endpoint to get the number of items, quantity and totals per shopping list
+    :return: data
+    """
+    created_from, created_to = get_created_time_args()
+    limit, cursor = get_pagination_args()
+    return output_json(summary_service.get_shopping_list_summary(created_from, created_to, limit, cursor), 200)
+
+
+def get_created_time_args():
+    """
+    Reads created_from and created_to query parameters of the summary endpoints,
+    restricting them to shopping lists created in [created_from, created_to).
+    :return: created_from, created_to
+    """
+    args = get_created_time_req_parser().parse_args()
+    return args['created_from'], args['created_to']
+
+
+def get_created_time_req_parser():
+    """
+    Creates request parser for the created time range query parameters
+    :return: parser
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('created_from', type=date_time_argument, required=False, location='args')
+    parser.add_argument('created_to', type=end_date_time_argument, required=False, location='args')
+    return parser
+
+
+def date_time_argument(value, name):
+    """
+    Validates if the request parameter is an ISO 8601 date or date and time in UTC
+    :param value:
+    :param name:
+    :return: datetime
+    """
+    try:
+        value = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError('{} must be an ISO 8601 date or date and time'.format(name))
+    if value.tzinfo is not None:
+        value = (value - value.utcoffset()).replace(tzinfo=None)
+    return value
+
+
+def end_date_time_argument(value, name):
+    """
+    Validates if the request parameter is an ISO 8601 date or date and time in UTC.
+    A date ends the range after that day.
+    :param value:
+    :param name:
+    :return: datetime
+    """
+    end = date_time_argument(value, name)
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return end
+    return end + timedelta(days=1)
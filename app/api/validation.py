@@ -0,0 +1,82 @@
+"""
+Request body validation compiled once per endpoint at import time.
+The body is read in one pass with the conversions and error messages of flask_restful.reqparse.
+"""
+from flask import request
+from flask_restful import abort, reqparse
+
+MISSING_MESSAGE = 'Missing required parameter in the JSON body'
+
+
+def compile_converter(type):
+    """
+    Returns a function converting a value like reqparse.Argument.convert does with the given type.
+    Builtin types are called with the value only, validators with the value and the parameter name,
+    falling back to the value only on TypeError.
+    :param type: builtin type or validator
+    :return: function of value and name
+    """
+    if type in (int, float, str, bool):
+        return lambda value, name: type(value)
+
+    def convert(value, name):
+        try:
+            return type(value, name)
+        except TypeError:
+            return type(value)
+    return convert
+
+
+class Field:
+    """Parameter of the JSON body"""
+
+    def __init__(self, name, type=str, required=False):
+        self.name = name
+        self.type = type
+        self.required = required
+        self.convert = compile_converter(type)
+
+
+class JsonBody:
+    """
+    Validates the JSON body of a request against its fields. A missing optional field is None and
+    a null value is kept as None without conversion. The first invalid field aborts with 400
+    and the message reqparse gives.
+    """
+
+    def __init__(self, *fields):
+        self.fields = tuple((field.name, field.convert, field.required) for field in fields)
+        self.definitions = fields
+
+    def parse(self, body=None):
+        """
+        Validates the body, the JSON body of the current request if None
+        :param body:
+        :return: dict of converted values by field name
+        """
+        if body is None:
+            body = request.json
+        if not isinstance(body, dict):
+            body = {}
+        args = {}
+        for name, convert, required in self.fields:
+            value = body.get(name)
+            if value is not None:
+                try:
+                    value = convert(value, name)
+                except Exception as error:
+                    abort(400, message={name: str(error)})
+            elif required and name not in body:
+                abort(400, message={name: MISSING_MESSAGE})
+            args[name] = value
+        return args
+
+    def request_parser(self):
+        """
+        Creates the reqparse.RequestParser equivalent to the fields
+        :return: parser
+        """
+        parser = reqparse.RequestParser()
+        for field in self.definitions:
+            parser.add_argument(field.name, type=field.type, required=field.required, location='json')
+        return parser
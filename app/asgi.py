@@ -0,0 +1,159 @@
+"""ASGI application serving the read-only search endpoints with async handlers on the SQLAlchemy asyncio engine"""
+import os
+from urllib.parse import parse_qsl
+from flask import Config
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import Map, Rule
+from config import config
+from app.api.shopping_list_search import cursor_argument, positive_int_argument
+from app.json_serializer import create_serializer
+from app.service.fieldsets import create_fieldset, fields_argument, include_argument
+from app.service import async_shopping_service
+
+async_drivers = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg'
+}
+
+url_map = Map([
+    Rule('/api/v1/allShoppingList', endpoint=async_shopping_service.get_all_shopping_list, methods=['GET']),
+    Rule('/api/v1/shoppingListByTitle/<title>', endpoint=async_shopping_service.get_shopping_list_by_title,
+         methods=['GET']),
+    Rule('/api/v1/searchShoppingListsByTitle/<title>',
+         endpoint=async_shopping_service.search_shopping_list_by_title_keyword, methods=['GET']),
+    Rule('/api/v1/shoppingListByItemId/<int:item_id>', endpoint=async_shopping_service.get_shopping_list_by_item_id,
+         methods=['GET']),
+    Rule('/api/v1/searchShoppingListByItemName/<title>',
+         endpoint=async_shopping_service.search_shopping_list_by_item_name_keyword, methods=['GET']),
+], strict_slashes=False)
+
+
+class ArgumentError(ValueError):
+    """Invalid query parameter, reported like the request parser of the Flask application does"""
+
+    def __init__(self, name, message):
+        super().__init__(message)
+        self.name = name
+        self.message = message
+
+
+def validate_args(args, validators):
+    """
+    Validates the query parameters with the request parser validators, None when missing.
+    Raises ArgumentError for an invalid parameter.
+    :param args: dict of query parameters
+    :param validators: (name, validator) pairs
+    :return: dict of validated values by name
+    """
+    parsed = {}
+    for name, validate in validators:
+        parsed[name] = None
+        if name in args:
+            try:
+                parsed[name] = validate(args[name], name)
+            except ValueError as e:
+                raise ArgumentError(name, str(e))
+    return parsed
+
+
+def async_database_uri(uri):
+    """
+    Returns the database uri using the asyncio driver of the database
+    :param uri:
+    :return: uri
+    """
+    scheme, rest = uri.split('://', 1)
+    return async_drivers[scheme.split('+')[0]] + '://' + rest
+
+
+class AsyncReadApp:
+    """
+    ASGI application answering the search endpoints with the same json as the Flask application.
+    Pagination and sparse fieldsets are supported, streaming, response caching and ETags are left to the
+    Flask application.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.engine = create_async_engine(settings.get('SQLALCHEMY_ASYNC_DATABASE_URI') or
+                                          async_database_uri(settings['SQLALCHEMY_DATABASE_URI']))
+        self.urls = url_map.bind('localhost')
+        self.serializer = create_serializer(settings)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        status, data = await self.handle(scope)
+        body = self.serializer.dumps(data) + b'\n'
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode('ascii'))]
+        })
+        await send({'type': 'http.response.body', 'body': body if scope['method'] != 'HEAD' else b''})
+
+    async def lifespan(self, receive, send):
+        """
+        Answers the ASGI lifespan events, closing the database connections on shutdown
+        :param receive:
+        :param send:
+        :return: void
+        """
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def handle(self, scope):
+        """
+        Runs the endpoint matching the request path
+        :param scope:
+        :return: status, data
+        """
+        try:
+            endpoint, values = self.urls.match(scope['path'], method=scope['method'])
+        except HTTPException as e:
+            return e.code, {"message": e.description}
+        args = dict(parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True))
+        try:
+            limit, cursor = self.pagination_args(args)
+            fieldset_args = validate_args(args, (('fields', fields_argument), ('include', include_argument)))
+            fieldset = create_fieldset(fieldset_args['fields'], fieldset_args['include'])
+        except ArgumentError as e:
+            return 400, {"message": {e.name: e.message}}
+        async with AsyncSession(self.engine) as session:
+            return 200, await endpoint(session, limit=limit, cursor=cursor, fieldset=fieldset, **values)
+
+    def pagination_args(self, args):
+        """
+        Reads limit and cursor query parameters like shopping_list_search.get_pagination_args.
+        Raises ArgumentError for an invalid parameter.
+        :param args:
+        :return: limit, cursor
+        """
+        parsed = validate_args(args, (('limit', positive_int_argument), ('cursor', cursor_argument)))
+        limit, cursor = parsed['limit'], parsed['cursor']
+        if limit is None and cursor is None:
+            return None, None
+        if limit is None:
+            limit = self.settings['SHOPPING_LIST_PAGE_SIZE']
+        return min(limit, self.settings['SHOPPING_LIST_MAX_PAGE_SIZE']), cursor
+
+
+def create_asgi_app(config_name):
+    """
+    Creates the ASGI application with the settings of the named configuration
+    :param config_name:
+    :return: AsyncReadApp
+    """
+    settings = Config(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    settings.from_object(config[config_name])
+    return AsyncReadApp(settings)
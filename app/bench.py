@@ -0,0 +1,198 @@
+"""End to end benchmark of every API endpoint through the Flask test client or a threaded WSGI server"""
+import http.client
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from werkzeug.serving import make_server
+from app.seed import WORDS
+from app.service.shopping_service import encode_cursor
+
+
+def endpoints(shopping_lists, items, run_id):
+    """
+    Returns the benchmarked endpoints as (name, method, request) where request(index) returns the path
+    and json body of the index-th request. Reads come first, then the writes, deletes last.
+    :param shopping_lists: number of seeded shopping lists
+    :param items: number of seeded items
+    :param run_id: added to written titles so runs on the same data do not conflict
+    :return: list of endpoints
+    """
+    def shopping_list_id(index):
+        return index * 7919 % shopping_lists + 1
+
+    def item_id(index):
+        return index * 31 % items + 1
+
+    return [
+        ('all shopping lists', 'GET', lambda index: (
+            '/api/v1/allShoppingList?limit=100&cursor=' + encode_cursor(shopping_list_id(index) - 1), None)),
+        ('shopping lists by title', 'GET', lambda index: (
+            '/api/v1/shoppingListByTitle/{}?limit=100'.format(
+                quote('{} list {}'.format(WORDS[index % len(WORDS)], index % 1000))), None)),
+        ('search shopping lists by title', 'GET', lambda index: (
+            '/api/v1/searchShoppingListsByTitle/{}?limit=100'.format(WORDS[index % len(WORDS)]), None)),
+        ('shopping lists by item id', 'GET', lambda index: (
+            '/api/v1/shoppingListByItemId/{}?limit=100'.format(item_id(index)), None)),
+        ('search shopping lists by item name', 'GET', lambda index: (
+            '/api/v1/searchShoppingListByItemName/{}?limit=100'.format(WORDS[index % len(WORDS)].lower()), None)),
+        ('store summary', 'GET', lambda index: ('/api/v1/summary/stores?created_from=2020-{:02d}-01'.format(
+            index % 12 + 1), None)),
+        ('item summary', 'GET', lambda index: ('/api/v1/summary/items?created_to=2020-{:02d}-28'.format(
+            index % 12 + 1), None)),
+        ('shopping list summary', 'GET', lambda index: (
+            '/api/v1/summary/shoppingLists?limit=100&cursor=' + encode_cursor(shopping_list_id(index) - 1), None)),
+        ('add shopping list', 'POST', lambda index: (
+            '/api/v1/shoppingList', {"title": 'Bench {} {}'.format(run_id, index), "store": 'Bench store'})),
+        ('add shopping lists', 'POST', lambda index: (
+            '/api/v1/shoppingLists', {"shopping_lists": [{"title": 'Bench batch {} {}'.format(run_id, index),
+                                                          "store": 'Bench store {}'.format(number)}
+                                                         for number in range(10)]})),
+        ('update shopping list', 'PUT', lambda index: (
+            '/api/v1/shoppingList', {"id": shopping_list_id(index),
+                                     "title": 'Renamed {} {}'.format(run_id, index)})),
+        ('add item', 'PUT', lambda index: (
+            '/api/v1/shoppingListItem', {"shopping_list_id": shopping_list_id(index), "item_id": item_id(index),
+                                         "quantity": 1})),
+        ('add items', 'PUT', lambda index: (
+            '/api/v1/shoppingListItems', {"shopping_list_id": shopping_list_id(index),
+                                          "items": [{"item_id": item_id(index + number), "quantity": 1}
+                                                    for number in range(5)]})),
+        ('delete shopping list', 'DELETE', lambda index: (
+            '/api/v1/shoppingList', {"id": shopping_lists - index})),
+        ('delete shopping lists', 'DELETE', lambda index: (
+            '/api/v1/shoppingLists', {"ids": [shopping_lists // 2 - index * 5 - number for number in range(5)]})),
+    ]
+
+
+class TestClientSender:
+    """Sends requests through the Flask test client, one client per thread"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def send(self, method, path, body):
+        """
+        Sends the request
+        :param method:
+        :param path:
+        :param body: json body or None
+        :return: status, number of queries or None
+        """
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body)
+        return response.status_code, response.headers.get('X-DB-Queries')
+
+    def close(self):
+        pass
+
+
+class ServerSender:
+    """Sends requests over HTTP to the application served by a threaded WSGI server on a free local port"""
+
+    def __init__(self, app):
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def send(self, method, path, body):
+        """
+        Sends the request
+        :param method:
+        :param path:
+        :param body: json body or None
+        :return: status, number of queries or None
+        """
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.server_port)
+        try:
+            headers = {}
+            data = None
+            if body is not None:
+                data = json.dumps(body)
+                headers['Content-Type'] = 'application/json'
+            connection.request(method, path, data, headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status, response.getheader('X-DB-Queries')
+        finally:
+            connection.close()
+
+    def close(self):
+        self.server.shutdown()
+        self.thread.join()
+
+
+def percentile(values, percent):
+    """
+    Returns the nearest rank percentile of the sorted values
+    :param values:
+    :param percent:
+    :return: value
+    """
+    if not values:
+        return None
+    rank = max(int(math.ceil(percent / 100.0 * len(values))) - 1, 0)
+    return values[rank]
+
+
+def run_endpoint(sender, method, request, requests, concurrency):
+    """
+    Sends requests requests to the endpoint, concurrency at a time
+    :param sender:
+    :param method:
+    :param request: function returning the path and json body of the index-th request
+    :param requests:
+    :param concurrency:
+    :return: dict of statistics
+    """
+    def send(index):
+        path, body = request(index)
+        started = time.perf_counter()
+        status, queries = sender.send(method, path, body)
+        return time.perf_counter() - started, status, queries
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(send, range(requests)))
+    else:
+        samples = [send(index) for index in range(requests)]
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency * 1000 for latency, status, queries in samples)
+    queries = [int(queries) for latency, status, queries in samples if queries is not None]
+    return {
+        "requests": requests,
+        "errors": sum(1 for latency, status, queries in samples if status >= 400),
+        "requests_per_second": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None
+    }
+
+
+def run_bench(app, shopping_lists, items, requests, concurrency=1, server=False):
+    """
+    Benchmarks every endpoint of the application on a dataset seeded by seed_dataset.
+    Call it outside of an application context so every request gets its own.
+    :param app:
+    :param shopping_lists: number of seeded shopping lists
+    :param items: number of seeded items
+    :param requests: requests per endpoint
+    :param concurrency: requests in flight, the test client sends one at a time when 1
+    :param server: send requests over HTTP to a threaded WSGI server instead of the test client
+    :return: dict of endpoint name to statistics
+    """
+    sender = ServerSender(app) if server else TestClientSender(app)
+    try:
+        run_id = int(time.time())
+        return {name: run_endpoint(sender, method, request, requests, concurrency)
+                for name, method, request in endpoints(shopping_lists, items, run_id)}
+    finally:
+        sender.close()
@@ -0,0 +1,29 @@
+"""Bulk statement execution shared by the services and the CLI commands"""
+from operator import itemgetter
+from app import db
+
+
+def execute_many(statement, names, rows, connection=None):
+    """
+    This method executes statement once per row with a single DBAPI executemany.
+    The statement is compiled once and the rows are passed to the driver as they are,
+    skipping the per row parameter processing of SQLAlchemy.
+    :param statement:
+    :param names: bind parameter names of the row values
+    :param rows: iterable of tuples of values in names order
+    :param connection: connection of the session if None
+    :return: void
+    """
+    if connection is None:
+        connection = db.session.connection()
+    compiled = statement.compile(dialect=connection.dialect)
+    if compiled.positional:
+        positions = [names.index(name) for name in compiled.positiontup]
+        if len(positions) == 1:
+            parameters = [(row[positions[0]],) for row in rows]
+        else:
+            values = itemgetter(*positions)
+            parameters = [values(row) for row in rows]
+    else:
+        parameters = [dict(zip(names, row)) for row in rows]
+    connection.exec_driver_sql(str(compiled), parameters)
@@ -0,0 +1,143 @@
+"""SQLite FTS5 full text search over shopping_list.title"""
+import re
+import weakref
+from sqlalchemy import DDL, event, literal_column, select, table, column, text
+
+FTS_TABLES = {
+    'shopping_list': 'shopping_list_fts'
+}
+
+INSERT_TRIGGER = "CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN " \
+                 "INSERT INTO {fts}(rowid, title) VALUES (new.id, new.title); END"
+
+_fts_enabled_engines = weakref.WeakKeyDictionary()
+
+
+def fts_statements(table_name):
+    """
+    Returns the statements creating the external content FTS5 table of the given table
+    and the triggers keeping it in sync with the title column
+    :param table_name:
+    :return: statements
+    """
+    fts_table = FTS_TABLES[table_name]
+    return [
+        "CREATE VIRTUAL TABLE {fts} USING fts5(title, content='{table}', content_rowid='id')",
+        INSERT_TRIGGER,
+        "CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        "INSERT INTO {fts}({fts}, rowid, title) VALUES ('delete', old.id, old.title); END",
+        "CREATE TRIGGER {fts}_au AFTER UPDATE OF title ON {table} BEGIN "
+        "INSERT INTO {fts}({fts}, rowid, title) VALUES ('delete', old.id, old.title); "
+        "INSERT INTO {fts}(rowid, title) VALUES (new.id, new.title); END",
+    ]
+
+
+def suspend_fts_indexing(connection, table_name):
+    """
+    Drops the trigger adding inserted rows of table_name to its FTS5 table, for bulk loads.
+    resume_fts_indexing has to be called before the end of the transaction.
+    :param connection:
+    :param table_name:
+    :return: void
+    """
+    connection.exec_driver_sql('DROP TRIGGER {}_ai'.format(FTS_TABLES[table_name]))
+
+
+def resume_fts_indexing(connection, table_name):
+    """
+    Creates the insert trigger of table_name again and rebuilds its FTS5 table from the table content
+    :param connection:
+    :param table_name:
+    :return: void
+    """
+    fts_table = FTS_TABLES[table_name]
+    connection.exec_driver_sql(INSERT_TRIGGER.format(fts=fts_table, table=table_name))
+    connection.exec_driver_sql("INSERT INTO {fts}({fts}) VALUES ('rebuild')".format(fts=fts_table))
+
+
+def fts5_available(ddl, target, bind, **kw):
+    """
+    DDL condition: true when the connection is SQLite built with FTS5
+    :param ddl:
+    :param target:
+    :param bind:
+    :param kw:
+    :return: boolean
+    """
+    if bind.dialect.name != 'sqlite':
+        return False
+    return bool(bind.execute(text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")).scalar())
+
+
+def register_fts(model_table):
+    """
+    Creates the FTS5 table and triggers of model_table together with it in create_all
+    and drops them in drop_all. Nothing is created when FTS5 is not available.
+    :param model_table:
+    :return: void
+    """
+    fts_table = FTS_TABLES[model_table.name]
+    for statement in fts_statements(model_table.name):
+        ddl = DDL(statement.format(fts=fts_table, table=model_table.name))
+        event.listen(model_table, 'after_create', ddl.execute_if(callable_=fts5_available))
+    event.listen(model_table, 'before_drop',
+                 DDL('DROP TABLE IF EXISTS {}'.format(fts_table)).execute_if(dialect='sqlite'))
+
+
+def fts_enabled(engine):
+    """
+    Checks once per engine whether the FTS5 tables exist in its database
+    :param engine:
+    :return: boolean
+    """
+    enabled = _fts_enabled_engines.get(engine)
+    if enabled is None:
+        with engine.connect() as connection:
+            enabled = fts_enabled_on_connection(connection)
+    return enabled
+
+
+def fts_enabled_on_connection(connection):
+    """
+    Checks once per engine whether the FTS5 tables exist, using the given connection of the engine.
+    Usable through AsyncConnection.run_sync.
+    :param connection:
+    :return: boolean
+    """
+    enabled = _fts_enabled_engines.get(connection.engine)
+    if enabled is None:
+        enabled = False
+        if connection.dialect.name == 'sqlite':
+            names = connection.execute(text(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name IN ('{}')".format(
+                    "', '".join(FTS_TABLES.values())))).scalar()
+            enabled = names == len(FTS_TABLES)
+        _fts_enabled_engines[connection.engine] = enabled
+    return enabled
+
+
+def match_expression(keyword):
+    """
+    Converts a search keyword into an FTS5 query matching rows containing every word
+    of the keyword as a word prefix. Returns None if the keyword has no words.
+    :param keyword:
+    :return: query
+    """
+    words = re.findall(r'[^\W_]+', keyword)
+    if not words:
+        return None
+    return ' '.join('"{}"*'.format(word) for word in words)
+
+
+def fts_match(table_name, keyword):
+    """
+    Returns select of rowid and rank of rows of table_name matching the keyword,
+    best match first in rank order
+    :param table_name:
+    :param keyword:
+    :return: select
+    """
+    fts_table = FTS_TABLES[table_name]
+    fts = table(fts_table, column('rowid'), column('rank'))
+    return select([fts.c.rowid, fts.c.rank]).where(
+        literal_column(fts_table).op('MATCH')(match_expression(keyword)))
@@ -0,0 +1,102 @@
+"""Serializes the API responses with orjson when it is installed, else with a compact stdlib encoder"""
+import json
+from flask import current_app, make_response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class StdlibSerializer:
+    """
+    json encoder of the standard library created once, without indentation or whitespace
+    and skipping the circular reference check. RESTFUL_JSON settings override the defaults.
+    """
+
+    def __init__(self, settings):
+        options = {'separators': (',', ':'), 'ensure_ascii': False, 'check_circular': False}
+        options.update(settings)
+        encoder_class = options.pop('cls', None) or json.JSONEncoder
+        self.encoder = encoder_class(**options)
+
+    def dumps(self, data):
+        """
+        Serializes data
+        :param data:
+        :return: utf-8 bytes
+        """
+        return self.encoder.encode(data).encode('utf-8')
+
+
+class OrjsonSerializer:
+    """orjson encoder, honoring the sort_keys, indent and default RESTFUL_JSON settings"""
+
+    def __init__(self, settings):
+        self.option = orjson.OPT_NON_STR_KEYS
+        if settings.get('sort_keys'):
+            self.option |= orjson.OPT_SORT_KEYS
+        if settings.get('indent'):
+            self.option |= orjson.OPT_INDENT_2
+        self.default = settings.get('default')
+
+    def dumps(self, data):
+        """
+        Serializes data
+        :param data:
+        :return: utf-8 bytes
+        """
+        return orjson.dumps(data, default=self.default, option=self.option)
+
+
+serializers = {
+    'json': StdlibSerializer,
+    'orjson': OrjsonSerializer
+}
+
+
+def create_serializer(settings):
+    """
+    Creates the serializer named by JSON_SERIALIZER: a name in serializers, a serializer class
+    taking the RESTFUL_JSON settings, or auto for orjson when it is installed and json otherwise.
+    :param settings: application config
+    :return: serializer
+    """
+    serializer = settings.get('JSON_SERIALIZER', 'auto')
+    if serializer == 'auto':
+        serializer = 'orjson' if orjson is not None else 'json'
+    if isinstance(serializer, str):
+        serializer = serializers[serializer]
+    return serializer(settings.get('RESTFUL_JSON', {}))
+
+
+def init_app(app):
+    """
+    Creates the json serializer of the application
+    :param app:
+    :return: void
+    """
+    app.extensions['json_serializer'] = create_serializer(app.config)
+
+
+def get_serializer():
+    """
+    Returns the json serializer of the current application
+    :return: serializer
+    """
+    return current_app.extensions['json_serializer']
+
+
+def output_json(data, code, headers=None):
+    """
+    Makes a response with the json body, replacing flask_restful.output_json which indents in debug mode
+    and encodes with a new json.dumps call every time
+    :param data:
+    :param code:
+    :param headers:
+    :return: response
+    """
+    response = make_response(get_serializer().dumps(data) + b'\n', code)
+    response.mimetype = 'application/json'
+    response.headers.extend(headers or {})
+    return response
@@ -1,5 +1,7 @@
 from . import db
+from .fts import register_fts
 from datetime import datetime
+from sqlalchemy import DDL, event
 
 
 Units = ['EACH', 'PACK']
@@ -28,8 +30,8 @@ class UnitMeasurement(db.Model):
 class ShoppingListItems(db.Model):
     """Database mapping class for many to many relationship between shopping_list and item tables"""
     __tablename__ = 'shopping_list_items'
-    shopping_list_id = db.Column(db.Integer, db.ForeignKey('shopping_list.id'), primary_key=True)
-    item_id = db.Column(db.Integer, db.ForeignKey('item.id'), primary_key=True)
+    shopping_list_id = db.Column(db.Integer, db.ForeignKey('shopping_list.id', ondelete='CASCADE'), primary_key=True)
+    item_id = db.Column(db.Integer, db.ForeignKey('item.id'), primary_key=True, index=True)
     quantity = db.Column(db.Integer, default=0)
     actual_item_price = db.Column(db.Float, default=0)
     discount_percentage = db.Column(db.Float, default=0)
@@ -37,13 +39,15 @@ class ShoppingListItems(db.Model):
     discounted_item_price = db.Column(db.Float, default=0)
     actual_total_price = db.Column(db.Float, default=0)
     discounted_total_price = db.Column(db.Float, default=0)
+    shopping_list = db.relationship("ShoppingList", back_populates="items")
+    item = db.relationship("Item")
 
 
 class Item(db.Model):
     """Database maping class for item table"""
     __tablename__ = 'item'
     id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(64))
+    title = db.Column(db.String(64), index=True)
     price = db.Column(db.Float)
     discount_percentage = db.Column(db.Float, default=0)
     unit_measurement_id = db.Column(db.Integer, db.ForeignKey('unit_measurement.id'))
@@ -87,8 +91,35 @@ class Item(db.Model):
 class ShoppingList(db.Model):
     """Database mapping class for shopping_list table"""
     __tablename__ = 'shopping_list'
+    # ids of deleted shopping lists are not reused, (id, revision) identifies the content in ETags
+    __table_args__ = (db.Index('ix_shopping_list_title_store_name', 'title', 'store_name', unique=True),
+                      {'sqlite_autoincrement': True})
     id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(64))
+    title = db.Column(db.String(64), index=True)
     store_name = db.Column(db.String(64))
-    created_time = db.Column(db.DateTime, default=datetime.utcnow)
+    created_time = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_time = db.Column(db.DateTime, default=datetime.utcnow)
+    revision = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    item_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total_quantity = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    actual_total = db.Column(db.Float, nullable=False, default=0, server_default='0')
+    discounted_total = db.Column(db.Float, nullable=False, default=0, server_default='0')
+    items = db.relationship("ShoppingListItems", back_populates="shopping_list", passive_deletes=True)
+
+
+register_fts(ShoppingList.__table__)
+
+
+class DataVersion(db.Model):
+    """
+    Database maping class for data_version table, its single row counts the committed write transactions
+    and, in item_version, the committed transactions writing to item
+    """
+    __tablename__ = 'data_version'
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    item_version = db.Column(db.Integer, nullable=False, default=0)
+
+
+event.listen(DataVersion.__table__, 'after_create',
+             DDL('INSERT INTO data_version (id, version, item_version) VALUES (1, 0, 0)'))
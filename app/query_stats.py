@@ -0,0 +1,37 @@
+"""Per request statistics of the SQL queries recorded by Flask-SQLAlchemy"""
+from flask import g, request
+from flask_sqlalchemy import get_debug_queries
+
+
+def init_app(app):
+    """
+    Logs the query count and database time of every request and the statements slower than
+    SLOW_QUERY_THRESHOLD seconds, and adds them as X-DB-Queries and X-DB-Time (milliseconds) headers
+    when DB_QUERY_HEADERS is set. Needs SQLALCHEMY_RECORD_QUERIES, nothing is done without it.
+    :param app:
+    :return: void
+    """
+    if not app.config['SQLALCHEMY_RECORD_QUERIES']:
+        return
+
+    @app.before_request
+    def mark_recorded_queries():
+        # requests may share the application context, e.g. in tests, so only later queries are counted
+        g.recorded_queries = len(get_debug_queries())
+
+    @app.after_request
+    def report_recorded_queries(response):
+        queries = get_debug_queries()[g.pop('recorded_queries', 0):]
+        duration = sum(query.duration for query in queries)
+        threshold = app.config['SLOW_QUERY_THRESHOLD']
+        for query in queries:
+            if query.duration >= threshold:
+                app.logger.warning('Slow query %.1f ms in %s %s: %s; parameters: %r; %s',
+                                   query.duration * 1000, request.method, request.path,
+                                   query.statement, query.parameters, query.context)
+        app.logger.debug('%s %s: %d queries in %.1f ms', request.method, request.path, len(queries),
+                         duration * 1000)
+        if app.config['DB_QUERY_HEADERS']:
+            response.headers['X-DB-Queries'] = str(len(queries))
+            response.headers['X-DB-Time'] = '{:.3f}'.format(duration * 1000)
+        return response
@@ -0,0 +1,167 @@
+"""
+Cache of rendered read responses, invalidated by the data version which every write transaction bumps.
+The version is kept in the data_version table and bumped in the transaction of the write, so writes of
+every process, other workers and the CLI commands included, make the cached responses of all processes stale.
+"""
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from sqlalchemy import event
+from app import db, reading
+from app.models import DataVersion
+
+
+class MemoryBackend:
+    """Process-local LRU backend with per entry expiry"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the value stored under key, None if missing or expired
+        :param key:
+        :return: value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        """
+        Stores value under key for ttl seconds, evicting the least recently used entries over max_entries
+        :param key:
+        :param value:
+        :param ttl: seconds or None to keep until evicted
+        :return: void
+        """
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes every entry
+        :return: void
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+backends = {
+    'memory': MemoryBackend
+}
+
+
+class ResponseCache:
+    """Stores rendered responses under keys prefixed with the data version they were rendered at"""
+
+    def __init__(self, backend, ttl, max_entry_bytes):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+
+    def get(self, version, key):
+        """
+        Returns the response cached under key at the data version
+        :param version:
+        :param key:
+        :return: (body, status, headers) or None
+        """
+        return self.backend.get('{}:{}'.format(version, key))
+
+    def set(self, version, key, body, status, headers):
+        """
+        Caches the response under key at the data version unless the body is over max_entry_bytes
+        :param version:
+        :param key:
+        :param body:
+        :param status:
+        :param headers: list of (name, value)
+        :return: void
+        """
+        if len(body) <= self.max_entry_bytes:
+            self.backend.set('{}:{}'.format(version, key), (body, status, headers), self.ttl)
+
+
+def init_app(app):
+    """
+    Creates the response cache of the application when RESPONSE_CACHE_ENABLED is set.
+    RESPONSE_CACHE_BACKEND is a name in backends or a backend class taking max_entries.
+    :param app:
+    :return: void
+    """
+    if not app.config['RESPONSE_CACHE_ENABLED']:
+        app.extensions['response_cache'] = None
+        return
+    backend = app.config['RESPONSE_CACHE_BACKEND']
+    if isinstance(backend, str):
+        backend = backends[backend]
+    app.extensions['response_cache'] = ResponseCache(backend(app.config['RESPONSE_CACHE_MAX_ENTRIES']),
+                                                     app.config['RESPONSE_CACHE_TTL'],
+                                                     app.config['RESPONSE_CACHE_MAX_ENTRY_BYTES'])
+
+
+def get_response_cache():
+    """
+    Returns the response cache of the current application, None if disabled
+    :return: ResponseCache
+    """
+    return current_app.extensions.get('response_cache')
+
+
+def read_data_version():
+    """
+    Returns the current data version, read like the data of the read only service calls
+    so a replica serves the version of its own data
+    :return: version
+    """
+    with reading(db.session()) as session:
+        return session.query(DataVersion.version).filter(DataVersion.id == 1).scalar() or 0
+
+
+def bump_data_version(connection):
+    """
+    Makes every cached response stale once the transaction of connection commits.
+    Needed for writes on connections of their own, writes of the session bump it on commit.
+    :param connection: connection or session
+    :return: void
+    """
+    connection.execute(DataVersion.__table__.update().where(DataVersion.id == 1)
+                       .values(version=DataVersion.version + 1))
+
+
+@event.listens_for(db.session, 'before_commit')
+def bump_data_version_on_write(session):
+    """
+    Bumps the data version in the transaction being committed if it wrote anything
+    :param session:
+    :return: void
+    """
+    session.flush()
+    if session.info.get('written'):
+        bump_data_version(session)
+
+
+@event.listens_for(db.session, 'after_commit')
+@event.listens_for(db.session, 'after_rollback')
+def reset_written(session):
+    """
+    Starts the next transaction of the session without writes
+    :param session:
+    :return: void
+    """
+    session.info.pop('written', None)
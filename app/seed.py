@@ -0,0 +1,175 @@
+"""
+Generates large synthetic datasets with Core executemany batches instead of one ORM object per row.
+The data only depends on the seed of the random generator.
+"""
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import bindparam
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from app import db
+from app.bulk import execute_many
+from app.fts import FTS_TABLES, fts_enabled_on_connection, resume_fts_indexing, suspend_fts_indexing
+from app.models import DataVersion, Item, ShoppingList, ShoppingListItems, UnitMeasurement, Units
+from app.service.item_events import notify_item_changes
+
+WORDS = ['Rice', 'Water', 'Soap', 'Sugar', 'Tea', 'Coffee', 'Milk', 'Bread', 'Apple', 'Orange',
+         'Pen', 'Notebook', 'Juice', 'Butter', 'Cheese', 'Flour']
+
+SEED_START = datetime(2020, 1, 1)
+
+ITEM_COLUMNS = ('id', 'title', 'price', 'discount_percentage', 'unit_measurement_id')
+SHOPPING_LIST_COLUMNS = ('id', 'title', 'store_name', 'created_time', 'updated_time', 'revision', 'item_count',
+                         'total_quantity', 'actual_total', 'discounted_total')
+SHOPPING_LIST_ITEM_COLUMNS = ('shopping_list_id', 'item_id', 'quantity', 'actual_item_price', 'discount_percentage',
+                              'discount_per_item', 'discounted_item_price', 'actual_total_price',
+                              'discounted_total_price')
+
+
+def insert_rows(connection, table, names, rows):
+    """
+    Inserts the rows with one executemany
+    :param connection:
+    :param table:
+    :param names: column names
+    :param rows: list of tuples of values in names order
+    :return: number of inserted rows
+    """
+    if rows:
+        statement = table.insert().values({name: bindparam(name) for name in names})
+        execute_many(statement, names, rows, connection)
+    return len(rows)
+
+
+def item_rows(items, rng):
+    """
+    Generates the item catalog
+    :param items:
+    :param rng: random.Random
+    :return: list of tuples in ITEM_COLUMNS order
+    """
+    return [(index + 1, '{} {}'.format(WORDS[index % len(WORDS)], index + 1),
+             round(rng.uniform(1, 1000), 2), float(rng.randrange(0, 30)), rng.randint(1, len(Units)))
+            for index in range(items)]
+
+
+def shopping_list_batches(shopping_lists, items_per_list, catalog, rng, batch_size, days):
+    """
+    Generates the shopping lists with their items, about batch_size shopping list items at a time.
+    Every shopping list holds items_per_list distinct items of the catalog with prices snapshot
+    from the catalog, and is created at a random time in the days days after SEED_START.
+    :param shopping_lists:
+    :param items_per_list:
+    :param catalog: list of item tuples, by item id - 1
+    :param rng: random.Random
+    :param batch_size:
+    :param days:
+    :return: generator of (shopping list tuples, shopping list item tuples)
+    """
+    list_batch = []
+    line_batch = []
+    period = days * 86400
+    for index in range(shopping_lists):
+        shopping_list_id = index + 1
+        actual_total = 0
+        discounted_total = 0
+        total_quantity = 0
+        for item_index in rng.sample(range(len(catalog)), items_per_list):
+            item_id, title, price, discount_percentage, unit_measurement_id = catalog[item_index]
+            quantity = rng.randint(1, 5)
+            discount_per_item = price * discount_percentage / 100
+            discounted_item_price = price - discount_per_item
+            line_batch.append((shopping_list_id, item_id, quantity, price, discount_percentage, discount_per_item,
+                               discounted_item_price, price * quantity, discounted_item_price * quantity))
+            actual_total += price * quantity
+            discounted_total += discounted_item_price * quantity
+            total_quantity += quantity
+        created_time = SEED_START + timedelta(seconds=rng.randrange(period))
+        list_batch.append((shopping_list_id, '{} list {}'.format(WORDS[index % len(WORDS)], index % 1000),
+                           'Store {}'.format(shopping_list_id), created_time, created_time, 1, items_per_list,
+                           total_quantity, actual_total, discounted_total))
+        if len(line_batch) >= batch_size or len(list_batch) >= batch_size:
+            yield list_batch, line_batch
+            list_batch = []
+            line_batch = []
+    if list_batch:
+        yield list_batch, line_batch
+
+
+def disable_foreign_keys(connection):
+    """
+    Turns off SQLite foreign key enforcement on the connection, outside of any transaction.
+    Other databases keep checking, the rows are inserted parents first.
+    :param connection:
+    :return: previous setting or None
+    """
+    if connection.dialect.name != 'sqlite':
+        return None
+    enabled = connection.exec_driver_sql('PRAGMA foreign_keys').scalar()
+    connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+    return enabled
+
+
+def seed_dataset(shopping_lists, items_per_list, items=None, batch_size=10000, seed=0, days=365):
+    """
+    Replaces the content of the database with shopping_lists shopping lists of items_per_list items each,
+    taken from a catalog of items items. The rows are loaded in one transaction with the secondary indexes
+    dropped, SQLite foreign key checks off and the full text search tables rebuilt once at the end.
+    :param shopping_lists:
+    :param items_per_list:
+    :param items: catalog size, four times items_per_list if None
+    :param batch_size: rows per executemany
+    :param seed: seed of the random generator, the same seed generates the same data
+    :param days: the shopping lists are created in the days days after SEED_START
+    :return: dict of inserted rows per table
+    """
+    items = max(items or items_per_list * 4, items_per_list)
+    rng = random.Random(seed)
+    try:
+        data_version, item_version = db.session.query(DataVersion.version, DataVersion.item_version).filter(
+            DataVersion.id == 1).first() or (0, 0)
+    except (OperationalError, ProgrammingError):
+        data_version, item_version = 0, 0
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    tables = [Item.__table__, ShoppingList.__table__, ShoppingListItems.__table__]
+    counts = {table.name: 0 for table in tables}
+    with db.engine.connect() as connection:
+        foreign_keys = disable_foreign_keys(connection)
+        try:
+            with connection.begin():
+                fts_tables = [table.name for table in tables
+                              if table.name in FTS_TABLES and fts_enabled_on_connection(connection)]
+                indexes = [index for table in tables for index in table.indexes]
+                for index in indexes:
+                    index.drop(connection)
+                for table_name in fts_tables:
+                    suspend_fts_indexing(connection, table_name)
+
+                insert_rows(connection, UnitMeasurement.__table__, ('id', 'title'),
+                            [(index + 1, title) for index, title in enumerate(Units)])
+                catalog = item_rows(items, rng)
+                for start in range(0, len(catalog), batch_size):
+                    counts['item'] += insert_rows(connection, Item.__table__, ITEM_COLUMNS,
+                                                  catalog[start:start + batch_size])
+                for list_batch, line_batch in shopping_list_batches(shopping_lists, items_per_list, catalog,
+                                                                    rng, batch_size, days):
+                    counts['shopping_list'] += insert_rows(connection, ShoppingList.__table__,
+                                                           SHOPPING_LIST_COLUMNS, list_batch)
+                    counts['shopping_list_items'] += insert_rows(connection, ShoppingListItems.__table__,
+                                                                 SHOPPING_LIST_ITEM_COLUMNS, line_batch)
+
+                for index in indexes:
+                    index.create(connection)
+                for table_name in fts_tables:
+                    resume_fts_indexing(connection, table_name)
+                # the recreated data_version starts over, responses cached and item title indexes built
+                # before the seed have to stay stale
+                connection.execute(DataVersion.__table__.update().values(version=data_version + 1,
+                                                                         item_version=item_version + 1))
+        finally:
+            if foreign_keys:
+                connection.exec_driver_sql('PRAGMA foreign_keys=ON')
+    # items were written without the ORM, the item caches have to be dropped
+    notify_item_changes(None)
+    return counts
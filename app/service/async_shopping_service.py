@@ -0,0 +1,192 @@
+"""Read-only shopping list queries on the SQLAlchemy asyncio engine, served by the ASGI entry point"""
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app.fts import fts_enabled_on_connection, fts_match, match_expression
+from app.models import Item, ShoppingList, ShoppingListItems
+from app.service.fieldsets import create_sparse_output, shopping_list_columns, shopping_list_items_statement, \
+    uses_item_titles
+from app.service.shopping_service import create_shopping_list_output, decode_cursor, encode_cursor
+
+SHOPPING_LIST_CHUNK_SIZE = 500
+
+
+async def load_catalog(session, item_ids):
+    """
+    This method reads the titles of the given items in one query.
+    The in-process item cache is not used, the ASGI process never sees the writes invalidating it.
+    :param session: AsyncSession
+    :param item_ids: set of item_id
+    :return: dict of item_id to row with the item title
+    """
+    if not item_ids:
+        return {}
+    result = await session.execute(select(Item.id, Item.title).where(Item.id.in_(item_ids)))
+    return {row.id: row for row in result}
+
+
+async def render_shopping_lists(session, shopping_lists):
+    """
+    This method renders shopping lists like create_shopping_list_output, reading the item titles in one query.
+    :param session: AsyncSession
+    :param shopping_lists:
+    :return: data
+    """
+    item_ids = {shopping_list_item.item_id for shopping_list in shopping_lists
+                for shopping_list_item in shopping_list.items}
+    return create_shopping_list_output(shopping_lists, await load_catalog(session, item_ids))
+
+
+async def render_fieldset(session, rows, fieldset):
+    """
+    This method renders shopping lists like shopping_service.create_fieldset_output.
+    :param session: AsyncSession
+    :param rows: rows of fieldsets.shopping_list_columns
+    :param fieldset:
+    :return: data
+    """
+    lines = None
+    catalog = None
+    if fieldset.item_fields is not None:
+        shopping_list_ids = [row[0] for row in rows]
+        lines = {}
+        for start in range(0, len(shopping_list_ids), SHOPPING_LIST_CHUNK_SIZE):
+            statement = shopping_list_items_statement(fieldset,
+                                                      shopping_list_ids[start:start + SHOPPING_LIST_CHUNK_SIZE])
+            for line in await session.execute(statement):
+                lines.setdefault(line.shopping_list_id, []).append(line)
+        if uses_item_titles(fieldset):
+            catalog = await load_catalog(session, {line.item_id for list_lines in lines.values()
+                                                   for line in list_lines})
+    return create_sparse_output(rows, lines, catalog, fieldset)
+
+
+async def create_paginated_output(session, query, limit, cursor, order_by=None, fieldset=None):
+    """
+    This method renders one page of the ShoppingList select like shopping_service.create_paginated_output.
+    :param session: AsyncSession
+    :param query: select of ShoppingList
+    :param limit:
+    :param cursor:
+    :param order_by:
+    :param fieldset:
+    :return: data
+    """
+    paginated = limit is not None or cursor is not None
+    if not paginated:
+        query = query.order_by(order_by if order_by is not None else ShoppingList.id)
+    else:
+        if cursor is not None:
+            query = query.where(ShoppingList.id > decode_cursor(cursor))
+        query = query.order_by(ShoppingList.id).limit(limit + 1)
+
+    if fieldset is not None:
+        result = await session.execute(query.with_only_columns(shopping_list_columns(fieldset)))
+        shopping_lists = result.all()
+    else:
+        result = await session.execute(query.options(selectinload(ShoppingList.items)))
+        shopping_lists = result.scalars().all()
+
+    async def render(page):
+        if fieldset is not None:
+            return await render_fieldset(session, page, fieldset)
+        return await render_shopping_lists(session, page)
+
+    if not paginated:
+        return await render(shopping_lists)
+
+    next_cursor = None
+    if len(shopping_lists) > limit:
+        shopping_lists = shopping_lists[:limit]
+        next_cursor = encode_cursor(shopping_lists[-1].id)
+    return {
+        "shopping_lists": await render(shopping_lists),
+        "next_cursor": next_cursor
+    }
+
+
+async def get_all_shopping_list(session, limit=None, cursor=None, fieldset=None):
+    """
+    This method returns all shopping lists and items
+    :param session: AsyncSession
+    :param limit:
+    :param cursor:
+    :param fieldset:
+    :return: data
+    """
+    return await create_paginated_output(session, select(ShoppingList), limit, cursor, fieldset=fieldset)
+
+
+async def get_shopping_list_by_title(session, title, limit=None, cursor=None, fieldset=None):
+    """
+    This method returns all shopping lists with given title
+    :param session: AsyncSession
+    :param title:
+    :param limit:
+    :param cursor:
+    :param fieldset:
+    :return: data
+    """
+    return await create_paginated_output(session, select(ShoppingList).where(ShoppingList.title == title),
+                                         limit, cursor, fieldset=fieldset)
+
+
+async def use_full_text_search(session, keyword):
+    """
+    This method checks if keyword search can use the FTS5 tables, like shopping_service.use_full_text_search.
+    :param session: AsyncSession
+    :param keyword:
+    :return: boolean
+    """
+    if match_expression(keyword) is None:
+        return False
+    connection = await session.connection()
+    return await connection.run_sync(fts_enabled_on_connection)
+
+
+async def search_shopping_list_by_title_keyword(session, title, limit=None, cursor=None, fieldset=None):
+    """
+    This method returns all shopping lists which contains given keyword in title.
+    :param session: AsyncSession
+    :param title:
+    :param limit:
+    :param cursor:
+    :param fieldset:
+    :return: data
+    """
+    if not await use_full_text_search(session, title):
+        query = select(ShoppingList).where(ShoppingList.title.like('%' + title + '%'))
+        return await create_paginated_output(session, query, limit, cursor, fieldset=fieldset)
+    matches = fts_match('shopping_list', title).subquery()
+    query = select(ShoppingList).join(matches, matches.c.rowid == ShoppingList.id)
+    return await create_paginated_output(session, query, limit, cursor, order_by=matches.c.rank,
+                                         fieldset=fieldset)
+
+
+async def get_shopping_list_by_item_id(session, item_id, limit=None, cursor=None, fieldset=None):
+    """
+    This method returns all shopping lists which contains given item
+    :param session: AsyncSession
+    :param item_id:
+    :param limit:
+    :param cursor:
+    :param fieldset:
+    :return: data
+    """
+    query = select(ShoppingList).where(ShoppingList.items.any(item_id=item_id))
+    return await create_paginated_output(session, query, limit, cursor, fieldset=fieldset)
+
+
+async def search_shopping_list_by_item_name_keyword(session, title, limit=None, cursor=None, fieldset=None):
+    """
+    This method returns all shopping lists having item which contains given keyword in title.
+    Items are matched in the item table ignoring case, the in-process item title index is not used.
+    :param session: AsyncSession
+    :param title:
+    :param limit:
+    :param cursor:
+    :param fieldset:
+    :return: data
+    """
+    item_ids = select(Item.id).where(Item.title.ilike('%' + title + '%'))
+    query = select(ShoppingList).where(ShoppingList.items.any(ShoppingListItems.item_id.in_(item_ids)))
+    return await create_paginated_output(session, query, limit, cursor, fieldset=fieldset)
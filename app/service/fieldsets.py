@@ -0,0 +1,135 @@
+"""Sparse fieldsets of the shopping list output, rendered from the selected columns only"""
+from collections import OrderedDict, namedtuple
+from sqlalchemy import select
+from app.models import ShoppingList, ShoppingListItems
+
+SHOPPING_LIST_FIELDS = OrderedDict([
+    ('shopping_list_title', ShoppingList.title),
+    ('store_name', ShoppingList.store_name),
+    ('item_count', ShoppingList.item_count),
+    ('total_quantity', ShoppingList.total_quantity),
+    ('actual_total', ShoppingList.actual_total),
+    ('discounted_total', ShoppingList.discounted_total)
+])
+
+# item_title comes from the item cache
+ITEM_FIELDS = OrderedDict([
+    ('item_title', None),
+    ('actual_item_price', ShoppingListItems.actual_item_price),
+    ('discount_percentage', ShoppingListItems.discount_percentage),
+    ('discounted_item_price', ShoppingListItems.discounted_item_price),
+    ('quantity', ShoppingListItems.quantity),
+    ('actual_total_price', ShoppingListItems.actual_total_price),
+    ('discounted_total_price', ShoppingListItems.discounted_total_price)
+])
+
+INCLUDES = ['items']
+
+FieldSet = namedtuple('FieldSet', ['shopping_list_fields', 'item_fields'])
+FieldSet.__doc__ = 'Fields of the shopping list output in output order, item_fields is None without items'
+
+
+def fields_argument(value, name):
+    """
+    Validates if the request parameter is a comma separated list of shopping list fields,
+    items and items.<item field>
+    :param value:
+    :param name:
+    :return: list of field names
+    """
+    fields = value.split(',')
+    allowed = list(SHOPPING_LIST_FIELDS) + INCLUDES + ['items.' + field for field in ITEM_FIELDS]
+    if any(field not in allowed for field in fields):
+        raise ValueError('{} must be a comma separated list of {}'.format(name, ', '.join(allowed)))
+    return fields
+
+
+def include_argument(value, name):
+    """
+    Validates if the request parameter is a comma separated list of includes, empty to include nothing
+    :param value:
+    :param name:
+    :return: list of includes
+    """
+    includes = [include for include in value.split(',') if include]
+    if any(include not in INCLUDES for include in includes):
+        raise ValueError('{} must be a comma separated list of {}'.format(name, ', '.join(INCLUDES)))
+    return includes
+
+
+def create_fieldset(fields=None, includes=None):
+    """
+    Creates the fieldset of the fields and includes request parameters, None when neither is given.
+    Without fields every shopping list field is rendered, with items unless includes leaves them out.
+    With fields only the named ones are, with items if items, an items.<item field> or the items include
+    is named. Items have every item field unless items.<item field> names some.
+    :param fields: list of field names or None
+    :param includes: list of includes or None
+    :return: FieldSet or None
+    """
+    if fields is None and includes is None:
+        return None
+    if fields is None:
+        fields = list(SHOPPING_LIST_FIELDS)
+    named = set(fields).union(includes or [])
+    item_fields = [field for field in ITEM_FIELDS if 'items.' + field in named]
+    if not item_fields and 'items' in named:
+        item_fields = list(ITEM_FIELDS)
+    return FieldSet([field for field in SHOPPING_LIST_FIELDS if field in fields], item_fields or None)
+
+
+def shopping_list_columns(fieldset):
+    """
+    Returns the columns read for the fieldset, the shopping list id first
+    :param fieldset:
+    :return: columns
+    """
+    return [ShoppingList.id] + [SHOPPING_LIST_FIELDS[field] for field in fieldset.shopping_list_fields]
+
+
+def shopping_list_items_statement(fieldset, shopping_list_ids):
+    """
+    Returns the select of the item fields of the line items of the given shopping lists
+    :param fieldset:
+    :param shopping_list_ids:
+    :return: select
+    """
+    columns = [ITEM_FIELDS[field] for field in fieldset.item_fields if ITEM_FIELDS[field] is not None]
+    return select([ShoppingListItems.shopping_list_id, ShoppingListItems.item_id] + columns).where(
+        ShoppingListItems.shopping_list_id.in_(shopping_list_ids))
+
+
+def uses_item_titles(fieldset):
+    """
+    Checks if rendering the fieldset needs the item titles
+    :param fieldset:
+    :return: boolean
+    """
+    return fieldset.item_fields is not None and 'item_title' in fieldset.item_fields
+
+
+def create_sparse_output(rows, lines, catalog, fieldset):
+    """
+    Renders the shopping lists like create_shopping_list_output, with the fields of the fieldset only
+    :param rows: rows of shopping_list_columns
+    :param lines: dict of shopping_list_id to rows of shopping_list_items_statement, None without items
+    :param catalog: dict of item_id to an object with the item title, None without item titles
+    :param fieldset:
+    :return: data
+    """
+    data = []
+    for row in rows:
+        list_data = dict(zip(fieldset.shopping_list_fields, row[1:]))
+        if fieldset.item_fields is not None:
+            items = []
+            for line in lines.get(row[0], []):
+                item_data = {}
+                for field in fieldset.item_fields:
+                    if field == 'item_title':
+                        item_data[field] = catalog[line.item_id].title
+                    else:
+                        item_data[field] = getattr(line, field)
+                items.append(item_data)
+            list_data["items"] = items
+        data.append(list_data)
+    return data
@@ -0,0 +1,142 @@
+"""Process-local, bounded LRU cache of Item rows"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from flask import current_app
+from app import db
+from app.models import Item
+from app.service.item_events import item_changes_listener
+
+CachedItem = namedtuple('CachedItem', ['id', 'title', 'price', 'discount_percentage', 'unit_measurement_id'])
+
+
+class ItemCache:
+    """
+    Keeps the max_size most recently used items by id, each for at most ttl seconds.
+    Writes of this process evict items on commit, the ttl bounds how long writes of
+    other processes go unnoticed.
+    """
+
+    def __init__(self, max_size, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._generation = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, item_ids, load):
+        """
+        Returns cached items by id, loading the missing ones with load(missing_ids).
+        Ids of items which do not exist are left out.
+        :param item_ids:
+        :param load: function returning CachedItem rows for the given ids
+        :return: dict of item_id to CachedItem
+        """
+        found = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for item_id in set(item_ids):
+                entry = self._items.get(item_id)
+                if entry is None or entry[1] <= now:
+                    missing.append(item_id)
+                else:
+                    self._items.move_to_end(item_id)
+                    found[item_id] = entry[0]
+            self.hits += len(found)
+            self.misses += len(missing)
+            generation = self._generation
+        if missing:
+            loaded = {item.id: item for item in load(missing)}
+            with self._lock:
+                # items invalidated while loading may be stale, they are returned but not cached
+                if generation != self._generation:
+                    loaded_items = []
+                else:
+                    loaded_items = loaded.values()
+                expires_at = now + self.ttl if self.ttl is not None else float('inf')
+                for item in loaded_items:
+                    self._items[item.id] = (item, expires_at)
+                    self._items.move_to_end(item.id)
+                while len(self._items) > self.max_size:
+                    self._items.popitem(last=False)
+            found.update(loaded)
+        return found
+
+    def invalidate(self, item_id=None):
+        """
+        Drops the item from the cache, or every item when item_id is None
+        :param item_id:
+        :return: void
+        """
+        with self._lock:
+            self._generation += 1
+            if item_id is None:
+                self._items.clear()
+            else:
+                self._items.pop(item_id, None)
+
+    def stats(self):
+        """
+        Returns the hit and miss counters and the cache size
+        :return: stats
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._items), "max_size": self.max_size}
+
+
+def init_app(app):
+    """
+    Creates the item cache of the application sized by ITEM_CACHE_SIZE, keeping items for ITEM_CACHE_TTL seconds
+    :param app:
+    :return: void
+    """
+    app.extensions['item_cache'] = ItemCache(app.config['ITEM_CACHE_SIZE'], app.config['ITEM_CACHE_TTL'])
+
+
+def load_items(item_ids):
+    """
+    Loads the cached columns of the given items in one query
+    :param item_ids:
+    :return: list of CachedItem
+    """
+    rows = db.session.query(Item.id, Item.title, Item.price, Item.discount_percentage, Item.unit_measurement_id)\
+        .filter(Item.id.in_(item_ids)).all()
+    return [CachedItem(*row) for row in rows]
+
+
+def get_items(item_ids):
+    """
+    Returns the given items by id, reading the database only for items not cached yet
+    :param item_ids:
+    :return: dict of item_id to CachedItem
+    """
+    return current_app.extensions['item_cache'].get_many(item_ids, load_items)
+
+
+def get_item(item_id):
+    """
+    Returns the item, reading the database only if it is not cached yet
+    :param item_id:
+    :return: CachedItem or None
+    """
+    return get_items([item_id]).get(item_id)
+
+
+@item_changes_listener
+def evict_changed_items(changes):
+    """
+    Drops committed item writes from the item cache
+    :param changes: list of (item_id, title, deleted) or None when every item may have changed
+    :return: void
+    """
+    cache = current_app.extensions.get('item_cache')
+    if cache is None:
+        return
+    if changes is None:
+        cache.invalidate()
+        return
+    for item_id, title, deleted in changes:
+        cache.invalidate(item_id)
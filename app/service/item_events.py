@@ -0,0 +1,69 @@
+"""Notifies the in-process item caches about committed writes to Item"""
+from flask import has_app_context
+from sqlalchemy import event
+from app import db
+from app.models import Item
+
+_listeners = []
+
+
+def item_changes_listener(func):
+    """
+    Registers func to be called with the list of (item_id, title, deleted) changes
+    of every committed transaction writing to Item through the ORM
+    :param func:
+    :return: func
+    """
+    _listeners.append(func)
+    return func
+
+
+def notify_item_changes(changes):
+    """
+    Calls the item change listeners. Code writing to the item table without the ORM
+    calls it with the written item ids, or with None to drop everything cached.
+    :param changes: list of (item_id, title, deleted) or None
+    :return: void
+    """
+    for listener in _listeners:
+        listener(changes)
+
+
+@event.listens_for(db.session, 'after_flush')
+def collect_item_changes(session, flush_context):
+    """
+    Remembers the items written by the flush until the transaction commits
+    :param session:
+    :param flush_context:
+    :return: void
+    """
+    changes = session.info.setdefault('item_changes', [])
+    for item in session.new.union(session.dirty):
+        if isinstance(item, Item):
+            changes.append((item.id, item.title, False))
+    for item in session.deleted:
+        if isinstance(item, Item):
+            changes.append((item.id, None, True))
+
+
+@event.listens_for(db.session, 'after_commit')
+def publish_item_changes(session):
+    """
+    Passes the committed item writes to the listeners
+    :param session:
+    :return: void
+    """
+    changes = session.info.pop('item_changes', None)
+    if changes and has_app_context():
+        notify_item_changes(changes)
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def discard_item_changes(session, previous_transaction):
+    """
+    Forgets the item writes of a rolled back transaction
+    :param session:
+    :param previous_transaction:
+    :return: void
+    """
+    session.info.pop('item_changes', None)
@@ -0,0 +1,223 @@
+"""In-process trigram index answering substring searches over Item.title"""
+import threading
+from collections import defaultdict
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from app import db
+from app.models import DataVersion, Item
+from app.service.item_events import item_changes_listener
+
+
+def trigrams(text):
+    """
+    Returns the set of three character substrings of text
+    :param text:
+    :return: trigrams
+    """
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+class ItemTitleIndex:
+    """Maps every trigram of the lower cased item titles to the ids of the items containing it"""
+
+    def __init__(self):
+        self.built = False
+        self.version = None
+        self._titles = {}
+        self._postings = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def build(self, rows, version=None):
+        """
+        Replaces the index content with the given (item_id, title) rows
+        :param rows:
+        :param version: item version the rows were read at
+        :return: void
+        """
+        with self._lock:
+            self._titles = {}
+            self._postings = defaultdict(set)
+            for item_id, title in rows:
+                self._add(item_id, title)
+            self.built = True
+            self.version = version
+
+    def add(self, item_id, title):
+        """
+        Indexes the item title, replacing the previous title of the item
+        :param item_id:
+        :param title:
+        :return: void
+        """
+        with self._lock:
+            self._remove(item_id)
+            self._add(item_id, title)
+
+    def remove(self, item_id):
+        """
+        Removes the item from the index
+        :param item_id:
+        :return: void
+        """
+        with self._lock:
+            self._remove(item_id)
+
+    def invalidate(self):
+        """
+        Marks the index stale so it is rebuilt from the database on next use
+        :return: void
+        """
+        self.built = False
+
+    def search(self, keyword):
+        """
+        Returns ids of the items whose title contains keyword, ignoring case
+        :param keyword:
+        :return: item_ids
+        """
+        keyword = keyword.lower()
+        with self._lock:
+            keyword_trigrams = trigrams(keyword)
+            if keyword_trigrams:
+                candidates = set.intersection(*(self._postings.get(trigram, set()) for trigram in keyword_trigrams))
+            else:
+                candidates = self._titles.keys()
+            return {item_id for item_id in candidates if keyword in self._titles[item_id]}
+
+    def _add(self, item_id, title):
+        title = (title or '').lower()
+        self._titles[item_id] = title
+        for trigram in trigrams(title):
+            self._postings[trigram].add(item_id)
+
+    def _remove(self, item_id):
+        title = self._titles.pop(item_id, None)
+        if title is None:
+            return
+        for trigram in trigrams(title):
+            postings = self._postings[trigram]
+            postings.discard(item_id)
+            if not postings:
+                del self._postings[trigram]
+
+
+def init_app(app):
+    """
+    Creates the item title index of the application and builds it if the item table exists,
+    otherwise it is built on first use
+    :param app:
+    :return: void
+    """
+    index = ItemTitleIndex()
+    app.extensions['item_index'] = index
+    with app.app_context():
+        try:
+            build_item_index(index)
+        except (OperationalError, ProgrammingError):
+            pass
+        finally:
+            db.session.remove()
+
+
+def build_item_index(index):
+    """
+    Builds the index from the item table, reading the item version first
+    so writes committed meanwhile make the index stale rather than lost
+    :param index:
+    :return: void
+    """
+    version = read_item_version()
+    index.build(db.session.query(Item.id, Item.title).all(), version)
+
+
+def get_item_index():
+    """
+    Returns the item title index of the current application, building it if needed.
+    Items are written by other processes too, the CLI commands and other workers, whose writes
+    do not reach apply_item_changes: the index is rebuilt when the item version of the data_version row,
+    bumped by every transaction writing to item, differs from the version it was built at.
+    :return: ItemTitleIndex
+    """
+    index = current_app.extensions['item_index']
+    if not index.built or index.version != read_item_version():
+        build_item_index(index)
+    return index
+
+
+def read_item_version():
+    """
+    Returns the current item version
+    :return: version
+    """
+    return db.session.query(DataVersion.item_version).filter(DataVersion.id == 1).scalar() or 0
+
+
+def bump_item_version(connection):
+    """
+    Makes every item title index stale once the transaction of connection commits.
+    Needed for item writes without the ORM, ORM writes of the session bump it on commit.
+    :param connection: connection or session
+    :return: void
+    """
+    connection.execute(DataVersion.__table__.update().where(DataVersion.id == 1)
+                       .values(item_version=DataVersion.item_version + 1))
+
+
+@event.listens_for(db.session, 'before_commit')
+def bump_item_version_on_write(session):
+    """
+    Bumps the item version in the transaction being committed if it wrote to item,
+    remembering the new version for the index of this process
+    :param session:
+    :return: void
+    """
+    session.flush()
+    if session.info.get('item_changes'):
+        bump_item_version(session)
+        session.info['item_version'] = read_item_version()
+
+
+@event.listens_for(db.session, 'after_commit')
+def advance_item_index_version(session):
+    """
+    Moves the index of this process to the committed item version when the index was current
+    before the transaction, the committed item changes being applied to it by apply_item_changes
+    :param session:
+    :return: void
+    """
+    version = session.info.pop('item_version', None)
+    index = current_app.extensions.get('item_index') if version is not None and has_app_context() else None
+    if index is not None and index.built and index.version == version - 1:
+        index.version = version
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def discard_item_version(session, previous_transaction):
+    """
+    Forgets the item version of a rolled back transaction
+    :param session:
+    :param previous_transaction:
+    :return: void
+    """
+    session.info.pop('item_version', None)
+
+
+@item_changes_listener
+def apply_item_changes(changes):
+    """
+    Applies committed item writes to the item title index
+    :param changes: list of (item_id, title, deleted) or None when every item may have changed
+    :return: void
+    """
+    index = current_app.extensions.get('item_index')
+    if index is None or not index.built:
+        return
+    if changes is None:
+        index.invalidate()
+        return
+    for item_id, title, deleted in changes:
+        if deleted:
+            index.remove(item_id)
+        else:
+            index.add(item_id, title)
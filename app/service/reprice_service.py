@@ -0,0 +1,107 @@
+"""Refreshes the prices snapshot in shopping list items from the current item prices"""
+import numpy as np
+from flask import current_app
+from sqlalchemy import and_, bindparam, or_, select, tuple_
+from app import db
+from app.bulk import execute_many
+from app.models import Item, ShoppingList, ShoppingListItems
+
+lines = ShoppingListItems.__table__
+items = Item.__table__
+shopping_lists = ShoppingList.__table__
+line_key = tuple_(lines.c.shopping_list_id, lines.c.item_id)
+
+
+def reprice_shopping_list_items(item_ids=None, batch_size=None):
+    """
+    This method recomputes the prices of the shopping list items whose price or discount percentage
+    differs from their item, and applies the differences to the shopping list totals.
+    Stale rows are processed in primary key order, batch_size rows per transaction.
+    :param item_ids: only reprice these items, every item if None
+    :param batch_size: defaults to SHOPPING_LIST_REPRICE_BATCH_SIZE
+    :return: number of repriced shopping list items
+    """
+    batch_size = batch_size or current_app.config['SHOPPING_LIST_REPRICE_BATCH_SIZE']
+    stale = and_(items.c.id == lines.c.item_id,
+                 or_(lines.c.actual_item_price != items.c.price,
+                     lines.c.discount_percentage != items.c.discount_percentage))
+    if item_ids is not None:
+        stale = and_(stale, lines.c.item_id.in_(item_ids))
+
+    repriced = 0
+    last_key = None
+    while True:
+        query = select([lines.c.shopping_list_id, lines.c.item_id]).where(stale)\
+            .order_by(lines.c.shopping_list_id, lines.c.item_id).limit(batch_size)
+        if last_key is not None:
+            query = query.where(line_key > tuple_(*last_key))
+        keys = db.session.execute(query).fetchall()
+        if not keys:
+            break
+        first_key, last_key = tuple(keys[0]), tuple(keys[-1])
+        repriced += reprice_batch(and_(stale, line_key >= tuple_(*first_key), line_key <= tuple_(*last_key)),
+                                  first_key[0], last_key[0])
+    return repriced
+
+
+def reprice_batch(batch, first_shopping_list_id, last_shopping_list_id):
+    """
+    This method reprices the shopping list items matching batch in one transaction.
+    The affected shopping lists are updated first, so items added to them concurrently wait
+    and the quantities read here stay current until commit.
+    :param batch: condition selecting the stale shopping list items joined with their item
+    :param first_shopping_list_id:
+    :param last_shopping_list_id:
+    :return: number of repriced shopping list items
+    """
+    db.session.execute(shopping_lists.update().where(and_(
+        shopping_lists.c.id.between(first_shopping_list_id, last_shopping_list_id),
+        select([lines.c.item_id]).where(and_(
+            batch, lines.c.shopping_list_id == shopping_lists.c.id)).exists()
+    )).values(revision=shopping_lists.c.revision + 1))
+
+    rows = db.session.execute(select([lines.c.shopping_list_id, lines.c.item_id, lines.c.quantity,
+                                      lines.c.actual_item_price, lines.c.discounted_item_price,
+                                      items.c.price, items.c.discount_percentage]).where(batch)).fetchall()
+    if not rows:
+        db.session.commit()
+        return 0
+
+    columns = list(zip(*rows))
+    shopping_list_ids = np.array(columns[0], dtype=np.int64)
+    item_ids = np.array(columns[1], dtype=np.int64)
+    quantity = np.array(columns[2], dtype=np.float64)
+    old_price = np.array(columns[3], dtype=np.float64)
+    old_discounted_price = np.array(columns[4], dtype=np.float64)
+    price = np.array(columns[5], dtype=np.float64)
+    discount = np.array(columns[6], dtype=np.float64)
+
+    discount_per_item = price * discount / 100
+    discounted_price = price - discount_per_item
+    list_ids, list_index = np.unique(shopping_list_ids, return_inverse=True)
+    actual_deltas = np.bincount(list_index, weights=(price - old_price) * quantity)
+    discounted_deltas = np.bincount(list_index, weights=(discounted_price - old_discounted_price) * quantity)
+
+    # totals are computed from the stored quantity, the arrays only carry the per item prices
+    execute_many(lines.update().where(and_(
+        lines.c.shopping_list_id == bindparam('line_shopping_list_id'),
+        lines.c.item_id == bindparam('line_item_id')
+    )).values(
+        actual_item_price=bindparam('new_price'),
+        discount_percentage=bindparam('new_discount'),
+        discount_per_item=bindparam('new_discount_per_item'),
+        discounted_item_price=bindparam('new_discounted_price'),
+        actual_total_price=bindparam('new_price') * lines.c.quantity,
+        discounted_total_price=bindparam('new_discounted_price') * lines.c.quantity
+    ), ('line_shopping_list_id', 'line_item_id', 'new_price', 'new_discount', 'new_discount_per_item',
+        'new_discounted_price'),
+        zip(shopping_list_ids.tolist(), item_ids.tolist(), price.tolist(), discount.tolist(),
+            discount_per_item.tolist(), discounted_price.tolist()))
+
+    execute_many(shopping_lists.update().where(shopping_lists.c.id == bindparam('list_id')).values(
+        actual_total=shopping_lists.c.actual_total + bindparam('actual_delta'),
+        discounted_total=shopping_lists.c.discounted_total + bindparam('discounted_delta')
+    ), ('list_id', 'actual_delta', 'discounted_delta'),
+        zip(list_ids.tolist(), actual_deltas.tolist(), discounted_deltas.tolist()))
+    db.session.commit()
+    return len(rows)
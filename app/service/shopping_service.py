@@ -1,28 +1,105 @@
-from app.models import ShoppingList, Item, ShoppingListItems
-from app import db
+import base64
+import binascii
+import json
+from collections import OrderedDict, namedtuple
+from functools import partial
+from flask import current_app
+from sqlalchemy import and_, bindparam, case, func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from app.models import Item, ShoppingList, ShoppingListItems
+from app import db, read_only
+from app.fts import fts_enabled, fts_match, match_expression
+from app.service import item_cache
+from app.service.fieldsets import create_sparse_output, shopping_list_columns, shopping_list_items_statement, \
+    uses_item_titles
+from app.service.item_index import get_item_index
+
+# revisions of the shopping lists read for the output, in output order, and the titles of the items it renders
+OutputVersion = namedtuple('OutputVersion', ['revisions', 'item_titles'])
+
+upsert_dialects = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert
+}
 
 
 def add_shopping_list(title, store_name):
     """
     This method will add a new shopping list.
-    If shopping list already exist then will return null
+    If shopping list already exist then will return null.
+    Duplicates are detected by the unique (title, store_name) index, not by a lookup.
     :param title:
     :param store_name:
     :return: shopping_list_id
     """
-    shopping_list = ShoppingList.query.filter_by(title=title, store_name=store_name).first()
-    if shopping_list is None:
-        shopping_list = ShoppingList(title=title, store_name=store_name)
-        db.session.add(shopping_list)
+    shopping_list = ShoppingList(title=title, store_name=store_name)
+    db.session.add(shopping_list)
+    try:
         db.session.commit()
-    else:
+    except IntegrityError:
+        db.session.rollback()
         return ""
     return shopping_list.id
 
 
+def add_shopping_lists(title_store_names):
+    """
+    This method adds many shopping lists in a single transaction.
+    Existing shopping lists are found with one set based query per chunk of SHOPPING_LIST_BULK_CHUNK_SIZE
+    and the new ones are inserted with a single executemany.
+    Like add_shopping_list null is returned for a shopping list which already exist,
+    including repeats of the same title and store_name within title_store_names.
+    :param title_store_names: list of (title, store_name)
+    :return: list of shopping_list_id in the order of title_store_names
+    """
+    chunk_size = current_app.config['SHOPPING_LIST_BULK_CHUNK_SIZE']
+    keys = list(OrderedDict.fromkeys(title_store_names))
+    for attempt in range(2):
+        existing = find_shopping_list_ids(keys, chunk_size)
+        new_keys = [key for key in keys if key not in existing]
+        if new_keys:
+            db.session.execute(ShoppingList.__table__.insert(),
+                               [{"title": title, "store_name": store_name} for title, store_name in new_keys])
+        try:
+            db.session.commit()
+            break
+        except IntegrityError:
+            # created concurrently since the lookup, look them up again
+            db.session.rollback()
+            if attempt:
+                raise
+
+    created = find_shopping_list_ids(new_keys, chunk_size)
+    shopping_list_ids = []
+    for key in title_store_names:
+        shopping_list_ids.append(created.pop(key, ""))
+    return shopping_list_ids
+
+
+def find_shopping_list_ids(title_store_names, chunk_size):
+    """
+    This method looks up the ids of the shopping lists with given title and store_name.
+    :param title_store_names: list of (title, store_name)
+    :param chunk_size:
+    :return: dict of (title, store_name) to shopping_list_id
+    """
+    shopping_list_ids = {}
+    key = tuple_(ShoppingList.title, ShoppingList.store_name)
+    for start in range(0, len(title_store_names), chunk_size):
+        rows = db.session.query(ShoppingList.title, ShoppingList.store_name, ShoppingList.id)\
+            .filter(key.in_(title_store_names[start:start + chunk_size])).all()
+        for title, store_name, shopping_list_id in rows:
+            shopping_list_ids[(title, store_name)] = shopping_list_id
+    return shopping_list_ids
+
+
 def update_shopping_list(shopping_list_id, title, store_name):
     """
     This method updates title/store_name of the shopping list.
+    If shopping list does not exist then will return null,
+    if another shopping list already has the new title and store_name then will return None.
     :param shopping_list_id:
     :param title:
     :param store_name:
@@ -34,8 +111,13 @@ def update_shopping_list(shopping_list_id, title, store_name):
             shopping_list.title = title
         if store_name:
             shopping_list.store_name = store_name
+        shopping_list.revision = ShoppingList.revision + 1
         db.session.add(shopping_list)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return None
     else:
         return ""
     return shopping_list_id
@@ -44,15 +126,17 @@ def update_shopping_list(shopping_list_id, title, store_name):
 def get_item(item_id):
     """
     This method retrieve the Item and returns the same.
+    Items are served from the item cache, the database is read only on a cache miss.
     :param item_id:
-    :return: Item
+    :return: CachedItem
     """
-    return Item.query.filter_by(id=item_id).first()
+    return item_cache.get_item(item_id)
 
 
 def get_shopping_list(shopping_list_id):
     """
     This methos retrieve the ShoppingList and returns the same.
+    Not read only, it reads the primary as it finds the shopping list a write is about to change.
     :param shopping_list_id:
     :return: ShoppingList
     """
@@ -67,76 +151,182 @@ def add_item_to_shopping_list(shopping_list, item, quantity):
     :param quantity:
     :return: data
     """
-    shopping_list_items = ShoppingListItems.query.filter_by(shopping_list_id=shopping_list.id, item_id=item.id).first()
-    if shopping_list_items is None:
-        shopping_list_items = ShoppingListItems(shopping_list_id=shopping_list.id, item_id=item.id,
-                                                discount_percentage=item.discount_percentage,
-                                                actual_item_price=item.price,
-                                                quantity=0)
-        shopping_list_items.discount_per_item = \
-            shopping_list_items.actual_item_price * shopping_list_items.discount_percentage / 100
-        shopping_list_items.discounted_item_price = \
-            shopping_list_items.actual_item_price - shopping_list_items.discount_per_item
-
-    shopping_list_items.quantity += quantity
-    shopping_list_items.actual_total_price = shopping_list_items.actual_item_price * shopping_list_items.quantity
-    shopping_list_items.discounted_total_price = \
-        shopping_list_items.discounted_item_price * shopping_list_items.quantity
-
-    db.session.add(shopping_list_items)
+    return add_items_to_shopping_list(shopping_list, [(item, quantity)])
+
+
+def add_items_to_shopping_list(shopping_list, item_quantities):
+    """
+    This method adds every item with its quantity in the shopping list in a single transaction.
+    Shopping list items are upserted by SQL statements which add to the stored quantity,
+    so concurrent adds of the same item are never lost. The shopping list row is updated first,
+    which makes concurrent adds to the same shopping list wait for each other.
+    The totals of the shopping list are updated in the same transaction.
+    :param shopping_list:
+    :param item_quantities: list of (item, quantity), quantities of repeated items are added up
+    :return: data
+    """
+    quantities = {}
+    for item, quantity in item_quantities:
+        quantities[item.id] = quantities.get(item.id, 0) + quantity
+
+    ShoppingList.query.filter_by(id=shopping_list.id).update({
+        ShoppingList.revision: ShoppingList.revision + 1,
+        ShoppingList.total_quantity: ShoppingList.total_quantity + sum(quantities.values())
+    }, synchronize_session=False)
+
+    lines = ShoppingListItems.__table__
+    batch_lines = and_(lines.c.shopping_list_id == shopping_list.id, lines.c.item_id.in_(list(quantities)))
+    existing = db.session.execute(select([func.count()]).select_from(lines).where(batch_lines)).scalar()
+    upsert_shopping_list_items([{"shopping_list_id": shopping_list.id, "item_id": item_id, "quantity": quantity}
+                                for item_id, quantity in quantities.items()])
+
+    # totals are maintained by applying the deltas, never by aggregating shopping_list_items
+    added_quantity = case(quantities, value=lines.c.item_id)
+    ShoppingList.query.filter_by(id=shopping_list.id).update({
+        ShoppingList.item_count: ShoppingList.item_count + len(quantities) - existing,
+        ShoppingList.actual_total: ShoppingList.actual_total + batch_sum(
+            lines.c.actual_item_price * added_quantity, batch_lines),
+        ShoppingList.discounted_total: ShoppingList.discounted_total + batch_sum(
+            lines.c.discounted_item_price * added_quantity, batch_lines)
+    }, synchronize_session=False)
     db.session.commit()
 
-    all_shopping_list_items = ShoppingListItems.query.filter_by(shopping_list_id=shopping_list.id).all()
-    all_items = []
-    for shopping_list_item in all_shopping_list_items:
-        item = Item.query.filter_by(id=shopping_list_item.item_id).first()
-        item_data = {
-            "item_title": item.title,
-            "actual_item_price": shopping_list_item.actual_item_price,
-            "discount_percentage": shopping_list_item.discount_percentage,
-            "discounted_item_price": shopping_list_item.discounted_item_price,
-            "quantity": shopping_list_item.quantity,
-            "actual_total_price": shopping_list_item.actual_total_price,
-            "discounted_total_price": shopping_list_item.discounted_total_price
-        }
-        all_items.append(item_data)
+    shopping_list = with_items(ShoppingList.query.filter_by(id=shopping_list.id)).one()
+    return create_shopping_list_output([shopping_list])[0]
 
-    data = {
-        "shopping_list_title": shopping_list.title,
-        "store_name": shopping_list.store_name,
-        "items": all_items
+
+def batch_sum(expression, where):
+    """
+    This method returns the scalar subquery adding up expression over the shopping list items matching where.
+    :param expression:
+    :param where:
+    :return: subquery
+    """
+    return select([func.coalesce(func.sum(expression), 0)]).where(where).scalar_subquery()
+
+
+def upsert_shopping_list_items(rows):
+    """
+    This method inserts the shopping list items, or adds the quantity to the existing ones.
+    Prices are snapshot from the item row on insert, read in the statement rather than from the item cache
+    which may be behind writes of other processes, and every derived price column is computed in SQL.
+    SQLite and PostgreSQL use INSERT ... ON CONFLICT DO UPDATE, other databases an UPDATE followed by
+    an INSERT of the missing rows, which is safe because the caller holds the shopping list row lock.
+    :param rows: list of dict with shopping_list_id, item_id and quantity
+    :return: void
+    """
+    lines = ShoppingListItems.__table__
+    price = select([Item.price]).where(Item.id == bindparam('item_id')).scalar_subquery()
+    discount = select([Item.discount_percentage]).where(Item.id == bindparam('item_id')).scalar_subquery()
+    quantity = bindparam('quantity', type_=db.Integer)
+    discounted_price = price - price * discount / 100
+    values = {
+        "shopping_list_id": bindparam('shopping_list_id'),
+        "item_id": bindparam('item_id'),
+        "quantity": quantity,
+        "actual_item_price": price,
+        "discount_percentage": discount,
+        "discount_per_item": price * discount / 100,
+        "discounted_item_price": discounted_price,
+        "actual_total_price": price * quantity,
+        "discounted_total_price": discounted_price * quantity
     }
-    return data
+    dialect = db.engine.dialect.name
+    if dialect in upsert_dialects:
+        stmt = upsert_dialects[dialect](lines).values(values)
+        total_quantity = lines.c.quantity + stmt.excluded.quantity
+        stmt = stmt.on_conflict_do_update(index_elements=[lines.c.shopping_list_id, lines.c.item_id], set_={
+            "quantity": total_quantity,
+            "actual_total_price": lines.c.actual_item_price * total_quantity,
+            "discounted_total_price": lines.c.discounted_item_price * total_quantity
+        })
+        db.session.execute(stmt, rows)
+        return
+
+    total_quantity = lines.c.quantity + bindparam('added_quantity', type_=db.Integer)
+    update = lines.update().where(and_(lines.c.shopping_list_id == bindparam('line_shopping_list_id'),
+                                       lines.c.item_id == bindparam('line_item_id'))).values({
+        "quantity": total_quantity,
+        "actual_total_price": lines.c.actual_item_price * total_quantity,
+        "discounted_total_price": lines.c.discounted_item_price * total_quantity
+    })
+    missing = []
+    for row in rows:
+        result = db.session.execute(update, {"line_shopping_list_id": row["shopping_list_id"],
+                                             "line_item_id": row["item_id"], "added_quantity": row["quantity"]})
+        if result.rowcount == 0:
+            missing.append(row)
+    if missing:
+        db.session.execute(lines.insert().values(values), missing)
+
+
+def get_items(item_ids):
+    """
+    This method retrieve the Items with given ids from the item cache, reading missing ones in one query.
+    :param item_ids:
+    :return: dict of item_id to CachedItem
+    """
+    return item_cache.get_items(item_ids)
 
 
 def delete_shopping_list(shopping_list_id):
     """
     This method delete the shopping list and items added to the shopping list
     :param shopping_list_id:
-    :return:
+    :return: shopping_list_id
     """
-    shopping_list_items = ShoppingListItems.query.filter_by(shopping_list_id=shopping_list_id).all()
-    shopping_list = ShoppingList.query.filter_by(id=shopping_list_id).first()
-    if shopping_list is not None:
-        if shopping_list_items is not None:
-            for item in shopping_list_items:
-                db.session.delete(item)
-        db.session.delete(shopping_list)
-        db.session.commit()
-    else:
-        return ""
-    return shopping_list_id
+    return delete_shopping_lists([shopping_list_id])[0]
+
 
+def delete_shopping_lists(shopping_list_ids):
+    """
+    This method deletes many shopping lists in a single transaction.
+    Shopping lists are removed by bulk DELETE statements, their items by ON DELETE CASCADE,
+    so no shopping list or item is loaded.
+    :param shopping_list_ids:
+    :return: list of deleted shopping_list_id in the given order, "" for shopping lists which do not exist
+    """
+    chunk_size = current_app.config['SHOPPING_LIST_BULK_CHUNK_SIZE']
+    unique_ids = list(OrderedDict.fromkeys(shopping_list_ids))
+    existing = set()
+    for start in range(0, len(unique_ids), chunk_size):
+        chunk = unique_ids[start:start + chunk_size]
+        existing.update(shopping_list_id for shopping_list_id, in
+                        db.session.query(ShoppingList.id).filter(ShoppingList.id.in_(chunk)))
+        ShoppingList.query.filter(ShoppingList.id.in_(chunk)).delete(synchronize_session=False)
+    db.session.commit()
+    return [shopping_list_id if shopping_list_id in existing else "" for shopping_list_id in shopping_list_ids]
 
-def create_shopping_list_output(shopping_lists):
+
+def with_items(query):
+    """
+    Adds eager loading of line items to a ShoppingList query,
+    so rendering the result needs the same small number of queries whatever its size.
+    Item titles come from the item cache.
+    :param query:
+    :return: query
+    """
+    return query.options(selectinload(ShoppingList.items))
+
+
+def create_shopping_list_output(shopping_lists, catalog=None):
+    """
+    This method renders shopping lists with their items.
+    Load the shopping lists through with_items to avoid a query per list and per item.
+    :param shopping_lists:
+    :param catalog: dict of item_id to an object with the item title, read from the item cache if None
+    :return: data
+    """
+    if catalog is None:
+        item_ids = [shopping_list_item.item_id for shopping_list in shopping_lists
+                    for shopping_list_item in shopping_list.items]
+        catalog = item_cache.get_items(item_ids)
     data = []
     for shopping_list in shopping_lists:
-        shopping_list_items = ShoppingListItems.query.filter_by(shopping_list_id=shopping_list.id).all()
         items = []
-        for shopping_list_item in shopping_list_items:
-            item = Item.query.filter_by(id=shopping_list_item.item_id).first()
+        for shopping_list_item in shopping_list.items:
             item_data = {
-                "item_title": item.title,
+                "item_title": catalog[shopping_list_item.item_id].title,
                 "actual_item_price": shopping_list_item.actual_item_price,
                 "discount_percentage": shopping_list_item.discount_percentage,
                 "discounted_item_price": shopping_list_item.discounted_item_price,
@@ -148,6 +338,10 @@ def create_shopping_list_output(shopping_lists):
         list_data = {
             "shopping_list_title": shopping_list.title,
             "store_name": shopping_list.store_name,
+            "item_count": shopping_list.item_count,
+            "total_quantity": shopping_list.total_quantity,
+            "actual_total": shopping_list.actual_total,
+            "discounted_total": shopping_list.discounted_total,
             "items": items
         }
         data.append(list_data)
@@ -155,64 +349,289 @@ def create_shopping_list_output(shopping_lists):
     return data
 
 
-def get_all_shopping_list():
+def create_fieldset_output(rows, fieldset):
+    """
+    This method renders shopping lists with the fields of the fieldset, reading the line item columns
+    of the fieldset in one query per SHOPPING_LIST_BULK_CHUNK_SIZE shopping lists, and nothing without items.
+    :param rows: rows of fieldsets.shopping_list_columns
+    :param fieldset:
+    :return: data
+    """
+    lines, catalog = load_fieldset_lines(rows, fieldset)
+    return create_sparse_output(rows, lines, catalog, fieldset)
+
+
+def load_fieldset_lines(rows, fieldset):
+    """
+    This method reads the line items rendered by create_fieldset_output and their items if their titles are rendered
+    :param rows: rows of fieldsets.shopping_list_columns
+    :param fieldset:
+    :return: lines, catalog
+    """
+    lines = None
+    catalog = None
+    if fieldset.item_fields is not None:
+        chunk_size = current_app.config['SHOPPING_LIST_BULK_CHUNK_SIZE']
+        shopping_list_ids = [row[0] for row in rows]
+        lines = {}
+        for start in range(0, len(shopping_list_ids), chunk_size):
+            statement = shopping_list_items_statement(fieldset, shopping_list_ids[start:start + chunk_size])
+            for line in db.session.execute(statement):
+                lines.setdefault(line.shopping_list_id, []).append(line)
+        if uses_item_titles(fieldset):
+            catalog = item_cache.get_items([line.item_id for list_lines in lines.values() for line in list_lines])
+    return lines, catalog
+
+
+def encode_cursor(shopping_list_id):
+    """
+    This method creates the opaque pagination cursor pointing after the given shopping list.
+    :param shopping_list_id:
+    :return: cursor
+    """
+    payload = json.dumps({"id": shopping_list_id}).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    This method returns the shopping list id stored in a pagination cursor.
+    Raises ValueError if the cursor was not created by encode_cursor.
+    :param cursor:
+    :return: shopping_list_id
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        shopping_list_id = json.loads(payload.decode('utf-8'))['id']
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(shopping_list_id, int):
+        raise ValueError('Invalid cursor')
+    return shopping_list_id
+
+
+def create_paginated_output(query, limit, cursor, order_by=None, revisions_only=False, fieldset=None,
+                            with_version=False):
+    """
+    This method renders one page of the ShoppingList query.
+    Pages are keyed on ShoppingList.id so every page costs the same whatever its depth.
+    Without limit and cursor all shopping lists are rendered as a plain list, sorted by order_by if given
+    and by id otherwise.
+    With a fieldset only its columns are selected and line items are read only if it has items.
+    The OutputVersion of the output identifies it for ETags: with revisions_only it is returned instead of
+    the output, without loading any items, with with_version it is returned along the output, taken from
+    the rows and item titles the output was rendered from.
+    :param query:
+    :param limit:
+    :param cursor:
+    :param order_by:
+    :param revisions_only:
+    :param fieldset: FieldSet or None for the full output
+    :param with_version:
+    :return: data, OutputVersion or (data, OutputVersion)
+    """
+    paginated = limit is not None or cursor is not None
+    if not paginated:
+        query = query.order_by(order_by if order_by is not None else ShoppingList.id)
+    else:
+        if cursor is not None:
+            query = query.filter(ShoppingList.id > decode_cursor(cursor))
+        query = query.order_by(ShoppingList.id).limit(limit + 1)
+
+    if revisions_only:
+        return get_output_version(query, limit, fieldset)
+
+    # the revision is selected last, create_sparse_output only reads the columns of the fieldset
+    if fieldset is not None:
+        shopping_lists = query.with_entities(*shopping_list_columns(fieldset), ShoppingList.revision).all()
+    else:
+        shopping_lists = with_items(query).all()
+    revisions = [(shopping_list.id, shopping_list.revision) for shopping_list in shopping_lists]
+
+    next_cursor = None
+    if paginated and len(shopping_lists) > limit:
+        shopping_lists = shopping_lists[:limit]
+        next_cursor = encode_cursor(shopping_lists[-1].id)
+    if fieldset is not None:
+        lines, catalog = load_fieldset_lines(shopping_lists, fieldset)
+        data = create_sparse_output(shopping_lists, lines, catalog, fieldset)
+    else:
+        catalog = item_cache.get_items([shopping_list_item.item_id for shopping_list in shopping_lists
+                                        for shopping_list_item in shopping_list.items])
+        data = create_shopping_list_output(shopping_lists, catalog)
+    if paginated:
+        data = {
+            "shopping_lists": data,
+            "next_cursor": next_cursor
+        }
+    if not with_version:
+        return data
+    return data, OutputVersion(revisions, item_titles(catalog))
+
+
+def get_output_version(query, limit, fieldset):
+    """
+    This method returns the OutputVersion of the output create_paginated_output renders for the query,
+    reading the revisions and, if item titles are rendered, the ids of the items of the rendered shopping lists.
+    :param query: ordered and limited ShoppingList query
+    :param limit: None if not paginated
+    :param fieldset:
+    :return: OutputVersion
+    """
+    revisions = query.with_entities(ShoppingList.id, ShoppingList.revision).all()
+    if fieldset is not None and not uses_item_titles(fieldset):
+        return OutputVersion(revisions, [])
+    if limit is None:
+        rendered = query.with_entities(ShoppingList.id).order_by(None).scalar_subquery()
+    else:
+        rendered = [shopping_list_id for shopping_list_id, revision in revisions[:limit]]
+    item_ids = [item_id for item_id, in db.session.query(ShoppingListItems.item_id).distinct()
+                .filter(ShoppingListItems.shopping_list_id.in_(rendered))]
+    return OutputVersion(revisions, item_titles(item_cache.get_items(item_ids)))
+
+
+def item_titles(catalog):
+    """
+    This method returns the item titles of the catalog by item id
+    :param catalog: dict of item_id to an object with the item title or None
+    :return: sorted list of (item_id, title)
+    """
+    return sorted((item_id, item.title) for item_id, item in (catalog or {}).items())
+
+
+@read_only
+def get_all_shopping_list(limit=None, cursor=None, revisions_only=False, fieldset=None, with_version=False):
     """
     This method returns all shopping lists and items
+    :param limit:
+    :param cursor:
+    :param revisions_only:
+    :param fieldset:
+    :param with_version:
     :return: data
     """
-    all_shopping_lists = ShoppingList.query.all()
-    return create_shopping_list_output(all_shopping_lists)
+    return create_paginated_output(ShoppingList.query, limit, cursor, revisions_only=revisions_only,
+                                   fieldset=fieldset, with_version=with_version)
 
 
-def get_shopping_list_by_title(title):
+@read_only
+def iter_all_shopping_list(batch_size, fieldset=None):
+    """
+    This method yields all shopping lists and items one shopping list at a time.
+    Rows are fetched batch_size shopping lists at a time, so memory use does not grow with the table.
+    :param batch_size:
+    :param fieldset:
+    :return: generator of data
+    """
+    if fieldset is None:
+        query = with_items(ShoppingList.query.order_by(ShoppingList.id)).yield_per(batch_size)
+        for shopping_list in query:
+            yield create_shopping_list_output([shopping_list])[0]
+        return
+    columns = shopping_list_columns(fieldset)
+    last_id = 0
+    while True:
+        rows = ShoppingList.query.with_entities(*columns).filter(ShoppingList.id > last_id) \
+            .order_by(ShoppingList.id).limit(batch_size).all()
+        if not rows:
+            return
+        for data in create_fieldset_output(rows, fieldset):
+            yield data
+        last_id = rows[-1][0]
+
+
+@read_only
+def get_shopping_list_by_title(title, limit=None, cursor=None, revisions_only=False, fieldset=None,
+                               with_version=False):
     """
     This method returns all shopping lists with given title
     :param title:
+    :param limit:
+    :param cursor:
+    :param revisions_only:
+    :param fieldset:
+    :param with_version:
     :return: data
     """
-    all_shopping_lists = ShoppingList.query.filter_by(title=title).all()
-    return create_shopping_list_output(all_shopping_lists)
+    return create_paginated_output(ShoppingList.query.filter_by(title=title), limit, cursor,
+                                   revisions_only=revisions_only, fieldset=fieldset, with_version=with_version)
 
 
-def search_shopping_list_by_title_keyword(title):
+def use_full_text_search(keyword):
+    """
+    This method checks if keyword search can use the FTS5 tables.
+    Keyword searches fall back to LIKE when SQLite lacks FTS5 or the keyword has no words.
+    :param keyword:
+    :return: boolean
     """
-    This method returns all shopping lists which contains given keyword in title
+    return match_expression(keyword) is not None and fts_enabled(db.engine)
+
+
+@read_only
+def search_shopping_list_by_title_keyword(title, limit=None, cursor=None, revisions_only=False, fieldset=None,
+                                          with_version=False):
+    """
+    This method returns all shopping lists which contains given keyword in title.
+    With full text search every word of the keyword has to start a word of the title
+    and the best matches come first when not paginated.
     :param title:
+    :param limit:
+    :param cursor:
+    :param revisions_only:
+    :param fieldset:
+    :param with_version:
     :return: data
     """
-    all_shopping_lists = db.session.query(ShoppingList).filter(ShoppingList.title.like(('%'+title+'%'))).all()
-    return create_shopping_list_output(all_shopping_lists)
+    if not use_full_text_search(title):
+        query = ShoppingList.query.filter(ShoppingList.title.like(('%'+title+'%')))
+        return create_paginated_output(query, limit, cursor, revisions_only=revisions_only, fieldset=fieldset,
+                                       with_version=with_version)
+    matches = fts_match('shopping_list', title).subquery()
+    query = ShoppingList.query.join(matches, matches.c.rowid == ShoppingList.id)
+    return create_paginated_output(query, limit, cursor, order_by=matches.c.rank, revisions_only=revisions_only,
+                                   fieldset=fieldset, with_version=with_version)
 
 
-def get_shopping_list_by_item_id(item_id):
+@read_only
+def get_shopping_list_by_item_id(item_id, limit=None, cursor=None, revisions_only=False, fieldset=None,
+                                 with_version=False):
     """
     This method returns all shopping lists which contains given item
     :param item_id:
+    :param limit:
+    :param cursor:
+    :param revisions_only:
+    :param fieldset:
+    :param with_version:
     :return: data
     """
-    shopping_list_ids = []
-    shopping_list_items = ShoppingListItems.query.filter_by(item_id=item_id).all()
-    for shopping_list_item in shopping_list_items:
-        shopping_list_ids.append(shopping_list_item.shopping_list_id)
-    all_shopping_lists = db.session.query(ShoppingList).filter(ShoppingList.id.in_(shopping_list_ids)).all()
-    return create_shopping_list_output(all_shopping_lists)
+    query = ShoppingList.query.filter(ShoppingList.items.any(item_id=item_id))
+    return create_paginated_output(query, limit, cursor, revisions_only=revisions_only, fieldset=fieldset,
+                                   with_version=with_version)
 
 
-def search_shopping_list_by_item_name_keyword(title):
+@read_only
+def search_shopping_list_by_item_name_keyword(title, limit=None, cursor=None, revisions_only=False,
+                                              fieldset=None, with_version=False):
     """
-    Thie methos return all shopping lists having item which contains given keyword in tile
+    Thie methos return all shopping lists having item which contains given keyword in tile.
+    Matching items are found in the in-process item title index instead of the item table,
+    except for keywords with the LIKE wildcards % or _, which keep matching as they did with LIKE.
+    Keywords matching more than SHOPPING_LIST_BULK_CHUNK_SIZE items are matched with LIKE in a subquery
+    as well, their item ids would be too many bound parameters.
     :param title:
+    :param limit:
+    :param cursor:
+    :param revisions_only:
+    :param fieldset:
+    :param with_version:
     :return: data
     """
-    shopping_list_ids = []
-    item_ids = []
-    item_list = db.session.query(Item).filter(Item.title.like(('%' + title + '%'))).all()
-    for item in item_list:
-        item_ids.append(item.id)
-
-    shopping_list_items = db.session.query(ShoppingListItems).filter(ShoppingListItems.item_id.in_(item_ids)).all()
-    for shopping_list_item in shopping_list_items:
-        shopping_list_ids.append(shopping_list_item.shopping_list_id)
-
-    all_shopping_lists = db.session.query(ShoppingList).filter(ShoppingList.id.in_(shopping_list_ids)).all()
-    return create_shopping_list_output(all_shopping_lists)
+    item_ids = None
+    if '%' not in title and '_' not in title:
+        item_ids = list(get_item_index().search(title))
+    if item_ids is None or len(item_ids) > current_app.config['SHOPPING_LIST_BULK_CHUNK_SIZE']:
+        item_ids = db.session.query(Item.id).filter(Item.title.like('%' + title + '%')).scalar_subquery()
+    query = ShoppingList.query.filter(ShoppingList.items.any(ShoppingListItems.item_id.in_(item_ids)))
+    return create_paginated_output(query, limit, cursor, revisions_only=revisions_only, fieldset=fieldset,
+                                   with_version=with_version)
@@ -0,0 +1,105 @@
+"""Spend reports aggregated in SQL with one GROUP BY query per report"""
+from sqlalchemy import distinct, func
+from app import db, read_only
+from app.models import Item, ShoppingList, ShoppingListItems
+from app.service.shopping_service import decode_cursor, encode_cursor
+
+
+def line_totals():
+    """
+    Returns the aggregates of shopping list items shared by the reports, 0 when there is no item
+    :return: labelled columns
+    """
+    return [
+        func.count(ShoppingListItems.item_id).label('item_count'),
+        func.coalesce(func.sum(ShoppingListItems.quantity), 0).label('total_quantity'),
+        func.coalesce(func.sum(ShoppingListItems.actual_total_price), 0.0).label('actual_total'),
+        func.coalesce(func.sum(ShoppingListItems.discounted_total_price), 0.0).label('discounted_total')
+    ]
+
+
+def created_between(query, created_from, created_to):
+    """
+    Restricts the query to shopping lists created in [created_from, created_to)
+    :param query: query selecting from shopping_list
+    :param created_from: datetime or None
+    :param created_to: datetime or None
+    :return: query
+    """
+    if created_from is not None:
+        query = query.filter(ShoppingList.created_time >= created_from)
+    if created_to is not None:
+        query = query.filter(ShoppingList.created_time < created_to)
+    return query
+
+
+@read_only
+def get_store_summary(created_from=None, created_to=None):
+    """
+    This method returns per store the number of shopping lists and their items, quantity and totals
+    :param created_from:
+    :param created_to:
+    :return: data
+    """
+    query = db.session.query(ShoppingList.store_name,
+                             func.count(distinct(ShoppingList.id)).label('shopping_list_count'),
+                             *line_totals()) \
+        .outerjoin(ShoppingListItems, ShoppingListItems.shopping_list_id == ShoppingList.id)
+    query = created_between(query, created_from, created_to)
+    return [row._asdict() for row in query.group_by(ShoppingList.store_name).order_by(ShoppingList.store_name)]
+
+
+@read_only
+def get_item_summary(created_from=None, created_to=None):
+    """
+    This method returns per item the number of shopping lists having it, its quantity and totals
+    :param created_from:
+    :param created_to:
+    :return: data
+    """
+    lines = db.session.query(ShoppingListItems.item_id,
+                             func.count(ShoppingListItems.shopping_list_id).label('shopping_list_count'),
+                             *line_totals()[1:])
+    if created_from is not None or created_to is not None:
+        lines = created_between(lines.join(ShoppingList, ShoppingList.id == ShoppingListItems.shopping_list_id),
+                                created_from, created_to)
+    # aggregating the lines before joining the items spares a lookup of the item per line
+    lines = lines.group_by(ShoppingListItems.item_id).subquery()
+    query = db.session.query(Item.id.label('item_id'), Item.title.label('item_title'), lines.c.shopping_list_count,
+                             lines.c.total_quantity, lines.c.actual_total, lines.c.discounted_total) \
+        .join(lines, lines.c.item_id == Item.id)
+    return [row._asdict() for row in query.order_by(Item.id)]
+
+
+@read_only
+def get_shopping_list_summary(created_from=None, created_to=None, limit=None, cursor=None):
+    """
+    This method returns per shopping list the number of items, quantity and totals summed from its items.
+    Paginated with limit and cursor like the search methods.
+    :param created_from:
+    :param created_to:
+    :param limit:
+    :param cursor:
+    :return: data
+    """
+    query = db.session.query(ShoppingList.id.label('shopping_list_id'),
+                             ShoppingList.title.label('shopping_list_title'), ShoppingList.store_name,
+                             *line_totals()) \
+        .outerjoin(ShoppingListItems, ShoppingListItems.shopping_list_id == ShoppingList.id)
+    query = created_between(query, created_from, created_to)
+    if cursor is not None:
+        query = query.filter(ShoppingList.id > decode_cursor(cursor))
+    # grouping by the primary key only lets the database stop after the page instead of sorting every group
+    query = query.group_by(ShoppingList.id).order_by(ShoppingList.id)
+    if limit is None and cursor is None:
+        return [row._asdict() for row in query]
+
+    rows = [row._asdict() for row in query.limit(limit + 1)]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['shopping_list_id'])
+    return {
+        "shopping_lists": rows,
+        "next_cursor": next_cursor
+    }
@@ -0,0 +1,27 @@
+"""Settings applied to every new SQLite connection"""
+import sqlite3
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_PRAGMAS = {
+    'foreign_keys': 'ON'
+}
+
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Runs the SQLITE_PRAGMAS of the current application, in order, on the new connection.
+    The default enables foreign key enforcement, off in SQLite, so ON DELETE CASCADE applies.
+    :param dbapi_connection:
+    :param connection_record:
+    :return: void
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    pragmas = current_app.config.get('SQLITE_PRAGMAS', DEFAULT_PRAGMAS) if has_app_context() else DEFAULT_PRAGMAS
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute('PRAGMA {}={}'.format(name, value))
+    cursor.close()
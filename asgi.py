@@ -0,0 +1,9 @@
+"""
+ASGI entry point serving the read-only search endpoints, e.g.
+uvicorn asgi:app
+Needs the packages of requirements/asgi.txt. Every other endpoint is served by store.py.
+"""
+import os
+from app.asgi import create_asgi_app
+
+app = create_asgi_app(os.getenv('FLASK_CONFIG') or 'default')
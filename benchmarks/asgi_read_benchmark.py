@@ -0,0 +1,146 @@
+"""
+Compares the read endpoints served by the Flask application on a pool of worker threads
+with the ASGI application of asgi.py on one event loop.
+
+python benchmarks/asgi_read_benchmark.py --workers 4 --concurrency 64 --latency-ms 20
+
+--latency-ms adds a delay to every SQL statement of both applications, standing in for the round trip
+to a database server, which is where the ASGI application gains: a Flask worker thread waits for every
+statement of its request while the event loop serves other requests. With the defaults the ASGI
+application served about 70 requests/s against 40 for the Flask application. Without latency both are
+bound by rendering on one CPU and serve about the same.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event
+from sqlalchemy.util import await_only
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db, response_cache  # noqa: E402
+from app.asgi import AsyncReadApp  # noqa: E402
+from app.models import Item, UnitMeasurement, ShoppingList  # noqa: E402
+from app.service import shopping_service  # noqa: E402
+
+PATHS = ['/api/v1/allShoppingList?limit=10', '/api/v1/shoppingListByTitle/title_3?limit=10',
+         '/api/v1/shoppingListByItemId/5?limit=10', '/api/v1/searchShoppingListByItemName/rice?limit=10']
+
+
+def seed(shopping_lists):
+    """
+    Adds shopping_lists shopping lists holding every item
+    :param shopping_lists:
+    :return: void
+    """
+    db.create_all()
+    UnitMeasurement.insert_unit_measurement()
+    Item.insert_items()
+    db.session.commit()
+    shopping_service.add_shopping_lists([('title_{}'.format(index % 10), 'store_{}'.format(index))
+                                         for index in range(shopping_lists)])
+    items = [(item, 1) for item in Item.query.all()]
+    for shopping_list in ShoppingList.query.all():
+        shopping_service.add_items_to_shopping_list(shopping_list, items)
+
+
+def run_flask(app, workers, requests):
+    """
+    Sends requests GET requests to the Flask application from workers threads
+    :param app:
+    :param workers:
+    :param requests:
+    :return: seconds
+    """
+    clients = threading.local()
+
+    def get(index):
+        if not hasattr(clients, 'client'):
+            clients.client = app.test_client()
+        response = clients.client.get(PATHS[index % len(PATHS)])
+        assert response.status_code == 200, response.data
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(get, range(requests)))
+    return time.perf_counter() - started
+
+
+async def run_asgi(asgi_app, concurrency, requests):
+    """
+    Sends requests GET requests to the ASGI application, at most concurrency at a time
+    :param asgi_app:
+    :param concurrency:
+    :param requests:
+    :return: seconds
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def get(index):
+        path, _, query_string = PATHS[index % len(PATHS)].partition('?')
+        scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query_string.encode('ascii')}
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        async with semaphore:
+            await asgi_app(scope, receive, send)
+        assert messages[0]['status'] == 200, messages
+
+    started = time.perf_counter()
+    await asyncio.gather(*(get(index) for index in range(requests)))
+    elapsed = time.perf_counter() - started
+    await asgi_app.engine.dispose()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shopping-lists', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--workers', type=int, default=4, help='Flask worker threads')
+    parser.add_argument('--concurrency', type=int, default=64, help='ASGI requests in flight')
+    parser.add_argument('--latency-ms', type=float, default=20, help='delay added to every SQL statement')
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    handle, db_path = tempfile.mkstemp(suffix='.sqlite')
+    os.close(handle)
+    try:
+        app = create_app('testing')
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + db_path
+        app.config['RESPONSE_CACHE_ENABLED'] = False
+        response_cache.init_app(app)
+        with app.app_context():
+            seed(args.shopping_lists)
+            if latency:
+                event.listen(db.engine, 'before_cursor_execute', lambda *args: time.sleep(latency))
+            flask_seconds = run_flask(app, args.workers, args.requests)
+            db.session.remove()
+
+        asgi_app = AsyncReadApp(app.config)
+        if latency:
+            event.listen(asgi_app.engine.sync_engine, 'before_cursor_execute',
+                         lambda *args: await_only(asyncio.sleep(latency)))
+        asgi_seconds = asyncio.run(run_asgi(asgi_app, args.concurrency, args.requests))
+    finally:
+        os.remove(db_path)
+
+    print('{:<6} {:>12} {:>10} {:>14}'.format('path', 'in flight', 'seconds', 'requests/s'))
+    print('{:<6} {:>12} {:>10.2f} {:>14.1f}'.format('flask', args.workers, flask_seconds,
+                                                    args.requests / flask_seconds))
+    print('{:<6} {:>12} {:>10.2f} {:>14.1f}'.format('asgi', args.concurrency, asgi_seconds,
+                                                    args.requests / asgi_seconds))
+
+
+if __name__ == '__main__':
+    main()
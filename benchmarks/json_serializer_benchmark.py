@@ -0,0 +1,78 @@
+"""
+Compares the json serializers of app.json_serializer with the json.dumps call of flask_restful.output_json
+on payloads rendered by create_shopping_list_output.
+
+python benchmarks/json_serializer_benchmark.py --shopping-lists 2000 --items-per-list 15
+
+On 2000 shopping lists of 15 items (a 6.5 MB document) json.dumps took about 125 ms and 385 ms with the
+indentation added in debug mode, which falls back to the pure Python encoder. The compact stdlib serializer
+takes as long as json.dumps with a 7% smaller body, orjson about 18 ms.
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from collections import namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.json_serializer import OrjsonSerializer, StdlibSerializer, orjson  # noqa: E402
+from app.models import ShoppingList, ShoppingListItems  # noqa: E402
+from app.service.shopping_service import create_shopping_list_output  # noqa: E402
+
+CatalogItem = namedtuple('CatalogItem', 'id title')
+
+
+def payload(shopping_lists, items_per_list):
+    """
+    Renders shopping_lists unsaved shopping lists of items_per_list items
+    :param shopping_lists:
+    :param items_per_list:
+    :return: data
+    """
+    catalog = {item_id: CatalogItem(item_id, 'Item {} 1 KG Bag'.format(item_id)) for item_id in range(1, 101)}
+    rows = []
+    for index in range(shopping_lists):
+        items = []
+        for offset in range(items_per_list):
+            price = float(index % 90 + offset * 10 + 1)
+            items.append(ShoppingListItems(item_id=(index + offset) % 100 + 1, quantity=offset % 5 + 1,
+                                           actual_item_price=price, discount_percentage=5.0,
+                                           discounted_item_price=price * 0.95,
+                                           actual_total_price=price * (offset % 5 + 1),
+                                           discounted_total_price=price * 0.95 * (offset % 5 + 1)))
+        rows.append(ShoppingList(title='Grocery {}'.format(index), store_name='Store {}'.format(index % 50),
+                                 item_count=len(items), total_quantity=sum(item.quantity for item in items),
+                                 actual_total=sum(item.actual_total_price for item in items),
+                                 discounted_total=sum(item.discounted_total_price for item in items),
+                                 items=items))
+    return create_shopping_list_output(rows, catalog)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shopping-lists', type=int, default=2000)
+    parser.add_argument('--items-per-list', type=int, default=15)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+    data = payload(args.shopping_lists, args.items_per_list)
+
+    candidates = [
+        ('json.dumps', lambda: (json.dumps(data) + "\n").encode('utf-8')),
+        ('json.dumps debug', lambda: (json.dumps(data, indent=4) + "\n").encode('utf-8')),
+        ('stdlib compact', lambda: StdlibSerializer({}).dumps(data) + b'\n'),
+    ]
+    if orjson is not None:
+        candidates.append(('orjson', lambda: OrjsonSerializer({}).dumps(data) + b'\n'))
+    else:
+        print('orjson is not installed')
+
+    print('{:<18} {:>12} {:>10}'.format('serializer', 'bytes', 'ms'))
+    for name, dumps in candidates:
+        seconds = min(timeit.repeat(dumps, number=1, repeat=args.repeat))
+        print('{:<18} {:>12} {:>10.1f}'.format(name, len(dumps()), seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
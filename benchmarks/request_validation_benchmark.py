@@ -0,0 +1,54 @@
+"""
+Measures the per request validation overhead of the write endpoints: building a reqparse.RequestParser
+and parsing the body with it, as the endpoints did, against the JsonBody compiled at import time.
+
+python benchmarks/request_validation_benchmark.py --number 20000
+
+Both parse the same request, whose JSON body is decoded once by Flask and cached, so only the
+validation is measured. The compiled validation took 3 to 10 microseconds per request against 14 to 35
+for the request parsers, 3.5 to 7.5 times less, the batch endpoints spending most of it in their
+list validators.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.api import shopping_list  # noqa: E402
+
+ENDPOINTS = [
+    ('POST /shoppingList', shopping_list.shopping_list_post_body, {'title': 'Grocery', 'store': 'Amazon'}),
+    ('POST /shoppingLists', shopping_list.shopping_lists_post_body,
+     {'shopping_lists': [{'title': 'Grocery', 'store': 'Store {}'.format(index)} for index in range(10)]}),
+    ('PUT /shoppingList', shopping_list.shopping_list_put_body, {'id': 1, 'title': 'Grocery'}),
+    ('PUT /shoppingListItem', shopping_list.shopping_list_item_put_body,
+     {'shopping_list_id': 1, 'item_id': 2, 'quantity': 3}),
+    ('PUT /shoppingListItems', shopping_list.shopping_list_items_put_body,
+     {'shopping_list_id': 1, 'items': [{'item_id': index, 'quantity': 1} for index in range(1, 11)]}),
+    ('DELETE /shoppingList', shopping_list.shopping_list_delete_body, {'id': 1}),
+    ('DELETE /shoppingLists', shopping_list.shopping_lists_delete_body, {'ids': list(range(1, 11))}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=20000, help='parses per measurement')
+    args = parser.parse_args()
+    app = create_app('testing')
+
+    print('{:<24} {:>14} {:>14} {:>8}'.format('endpoint', 'reqparse us', 'compiled us', 'speedup'))
+    for name, body, data in ENDPOINTS:
+        with app.test_request_context('/', method='PUT', json=data):
+            assert dict(body.request_parser().parse_args()) == body.parse()
+            request_parser = min(timeit.repeat(lambda: body.request_parser().parse_args(),
+                                               number=args.number, repeat=3)) / args.number
+            compiled = min(timeit.repeat(body.parse, number=args.number, repeat=3)) / args.number
+        print('{:<24} {:>14.2f} {:>14.2f} {:>7.1f}x'.format(name, request_parser * 1e6, compiled * 1e6,
+                                                            request_parser / compiled))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,34 @@
 import os
+from sqlalchemy.pool import QueuePool
 basedir = os.path.abspath(os.path.dirname(__file__))
 
 
 class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_RECORD_QUERIES = True
+    SLOW_QUERY_THRESHOLD = 0.5
+    DB_QUERY_HEADERS = True
     ERROR_404_HELP = False
+    SHOPPING_LIST_PAGE_SIZE = 100
+    SHOPPING_LIST_MAX_PAGE_SIZE = 1000
+    SHOPPING_LIST_STREAM_BATCH_SIZE = 500
+    SHOPPING_LIST_ITEMS_BATCH_SIZE = 1000
+    SHOPPING_LIST_BULK_SIZE = 10000
+    SHOPPING_LIST_BULK_CHUNK_SIZE = 500
+    SHOPPING_LIST_REPRICE_BATCH_SIZE = 5000
+    ITEM_CACHE_SIZE = 10000
+    ITEM_CACHE_TTL = 60
+    RESPONSE_CACHE_ENABLED = True
+    RESPONSE_CACHE_BACKEND = 'memory'
+    RESPONSE_CACHE_MAX_ENTRIES = 1024
+    RESPONSE_CACHE_MAX_ENTRY_BYTES = 1024 * 1024
+    RESPONSE_CACHE_TTL = 300
+    JSON_SERIALIZER = 'auto'
+    # name of the SQLALCHEMY_BINDS engine serving the read_only service calls, None reads the primary
+    READ_REPLICA_BIND = None
+    SQLITE_PRAGMAS = {
+        'foreign_keys': 'ON'
+    }
 
     @staticmethod
     def init_app(app):
@@ -16,6 +39,9 @@ class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DEV_DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, 'data-dev.sqlite')
+    if os.environ.get('DEV_REPLICA_DATABASE_URL'):
+        SQLALCHEMY_BINDS = {'replica': os.environ['DEV_REPLICA_DATABASE_URL']}
+        READ_REPLICA_BIND = 'replica'
 
 
 class TestingConfig(Config):
@@ -23,10 +49,49 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or \
         'sqlite://'
     WTF_CSRF_ENABLED = False
+    JSON_SERIALIZER = os.environ.get('TEST_JSON_SERIALIZER') or 'auto'
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.environ.get('BENCH_DATABASE_URL') or \
+        'sqlite:///' + os.path.join(basedir, 'data-bench.sqlite')
+    RESPONSE_CACHE_ENABLED = False
+
+
+class ProductionConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
+        'sqlite:///' + os.path.join(basedir, 'data.sqlite')
+    if os.environ.get('REPLICA_DATABASE_URL'):
+        SQLALCHEMY_BINDS = {'replica': os.environ['REPLICA_DATABASE_URL']}
+        READ_REPLICA_BIND = 'replica'
+    SQLALCHEMY_RECORD_QUERIES = False
+    DB_QUERY_HEADERS = False
+    # busy_timeout comes first so switching to WAL waits for other connections instead of failing
+    SQLITE_PRAGMAS = {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'foreign_keys': 'ON',
+        'cache_size': -64000,
+        'mmap_size': 268435456
+    }
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': QueuePool,
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_timeout': 30,
+        'pool_recycle': 1800,
+        'pool_pre_ping': True,
+        'query_cache_size': 1200,
+        'connect_args': {'check_same_thread': False, 'cached_statements': 512}
+        if SQLALCHEMY_DATABASE_URI.startswith('sqlite') else {}
+    }
 
 
 config = {
     'development': DevelopmentConfig,
     'testing': TestingConfig,
+    'benchmark': BenchmarkConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
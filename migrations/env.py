@@ -19,6 +19,15 @@ fileConfig(config.config_file_name)
 config.set_main_option('sqlalchemy.url', current_app.config.get('SQLALCHEMY_DATABASE_URI'))
 target_metadata = current_app.extensions['migrate'].db.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Keep autogenerate away from the FTS5 tables, they are created by hand in migrations,
+    and from sqlite_sequence, the table SQLite keeps the AUTOINCREMENT counters in.
+    """
+    return not (type_ == 'table' and (name.startswith('shopping_list_fts') or name == 'sqlite_sequence'))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -59,7 +68,8 @@ def run_migrations_online():
     connection = engine.connect()
     context.configure(
                 connection=connection,
-                target_metadata=target_metadata
+                target_metadata=target_metadata,
+                include_object=include_object
                 )
 
     try:
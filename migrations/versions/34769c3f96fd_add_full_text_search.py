@@ -0,0 +1,53 @@
+"""add full text search
+
+Revision ID: 34769c3f96fd
+Revises: 43b79ebb44fa
+Create Date: 2026-10-18 18:41:52.113502
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '34769c3f96fd'
+down_revision = '43b79ebb44fa'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+fts_tables = {
+    'shopping_list': 'shopping_list_fts'
+}
+
+
+def fts5_available():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return False
+    return bool(bind.execute(sa.text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")).scalar())
+
+
+def upgrade():
+    # search falls back to LIKE when FTS5 is not available
+    if not fts5_available():
+        return
+    for table, fts in fts_tables.items():
+        op.execute("CREATE VIRTUAL TABLE {fts} USING fts5(title, content='{table}', content_rowid='id')".format(
+            fts=fts, table=table))
+        op.execute("CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+                   "INSERT INTO {fts}(rowid, title) VALUES (new.id, new.title); END".format(fts=fts, table=table))
+        op.execute("CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+                   "INSERT INTO {fts}({fts}, rowid, title) VALUES ('delete', old.id, old.title); END".format(
+                       fts=fts, table=table))
+        op.execute("CREATE TRIGGER {fts}_au AFTER UPDATE OF title ON {table} BEGIN "
+                   "INSERT INTO {fts}({fts}, rowid, title) VALUES ('delete', old.id, old.title); "
+                   "INSERT INTO {fts}(rowid, title) VALUES (new.id, new.title); END".format(fts=fts, table=table))
+        op.execute("INSERT INTO {fts}({fts}) VALUES ('rebuild')".format(fts=fts))
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for fts in fts_tables.values():
+        for trigger in ('ai', 'ad', 'au'):
+            op.execute('DROP TRIGGER IF EXISTS {}_{}'.format(fts, trigger))
+        op.execute('DROP TABLE IF EXISTS {}'.format(fts))
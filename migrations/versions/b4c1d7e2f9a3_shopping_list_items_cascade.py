@@ -0,0 +1,56 @@
+"""shopping list items cascade
+
+Revision ID: b4c1d7e2f9a3
+Revises: 9e695fbc9cdc
+Create Date: 2026-10-18 19:02:13.482913
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'b4c1d7e2f9a3'
+down_revision = '9e695fbc9cdc'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def shopping_list_items_table(ondelete):
+    return sa.Table(
+        'shopping_list_items', sa.MetaData(),
+        sa.Column('shopping_list_id', sa.Integer(), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=True),
+        sa.Column('actual_item_price', sa.DECIMAL(), nullable=True),
+        sa.Column('discount_percentage', sa.DECIMAL(), nullable=True),
+        sa.Column('discount_per_item', sa.DECIMAL(), nullable=True),
+        sa.Column('discounted_item_price', sa.DECIMAL(), nullable=True),
+        sa.Column('actual_total_price', sa.DECIMAL(), nullable=True),
+        sa.Column('discounted_total_price', sa.DECIMAL(), nullable=True),
+        sa.ForeignKeyConstraint(['item_id'], ['item.id'], ),
+        sa.ForeignKeyConstraint(['shopping_list_id'], ['shopping_list.id'], ondelete=ondelete),
+        sa.PrimaryKeyConstraint('shopping_list_id', 'item_id'),
+        sa.Index('ix_shopping_list_items_item_id', 'item_id')
+    )
+
+
+def set_shopping_list_ondelete(ondelete):
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        # SQLite can not alter a constraint, the table is copied into a new one with the changed constraint
+        with op.batch_alter_table('shopping_list_items', copy_from=shopping_list_items_table(ondelete),
+                                  recreate='always'):
+            pass
+        return
+    name = next(foreign_key['name'] for foreign_key in sa.inspect(bind).get_foreign_keys('shopping_list_items')
+                if foreign_key['referred_table'] == 'shopping_list')
+    op.drop_constraint(name, 'shopping_list_items', type_='foreignkey')
+    op.create_foreign_key(name, 'shopping_list_items', 'shopping_list', ['shopping_list_id'], ['id'],
+                          ondelete=ondelete)
+
+
+def upgrade():
+    set_shopping_list_ondelete('CASCADE')
+
+
+def downgrade():
+    set_shopping_list_ondelete(None)
@@ -0,0 +1,56 @@
+"""shopping list autoincrement
+
+Revision ID: de339e1a0e8c
+Revises: cfda57bf00c4
+Create Date: 2026-10-18 21:14:37.205118
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'de339e1a0e8c'
+down_revision = 'cfda57bf00c4'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+fts_triggers = [
+    "CREATE TRIGGER shopping_list_fts_ai AFTER INSERT ON shopping_list BEGIN "
+    "INSERT INTO shopping_list_fts(rowid, title) VALUES (new.id, new.title); END",
+    "CREATE TRIGGER shopping_list_fts_ad AFTER DELETE ON shopping_list BEGIN "
+    "INSERT INTO shopping_list_fts(shopping_list_fts, rowid, title) VALUES ('delete', old.id, old.title); END",
+    "CREATE TRIGGER shopping_list_fts_au AFTER UPDATE OF title ON shopping_list BEGIN "
+    "INSERT INTO shopping_list_fts(shopping_list_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+    "INSERT INTO shopping_list_fts(rowid, title) VALUES (new.id, new.title); END"
+]
+
+
+def set_shopping_list_autoincrement(autoincrement):
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        # the sequences of other databases do not hand out the ids of deleted rows again
+        return
+    # SQLite reuses the greatest id after it is deleted unless the table is declared AUTOINCREMENT, the table
+    # is copied into a new one. Dropping the old table would delete the shopping list items through
+    # ON DELETE CASCADE, foreign keys are turned off, which only works outside of a transaction.
+    dbapi_connection = bind.connection.dbapi_connection
+    dbapi_connection.commit()
+    bind.exec_driver_sql('PRAGMA foreign_keys=OFF')
+    fts = bind.exec_driver_sql("SELECT count(*) FROM sqlite_master WHERE name = 'shopping_list_fts'").scalar()
+    with op.batch_alter_table('shopping_list', recreate='always',
+                              table_kwargs={'sqlite_autoincrement': autoincrement}):
+        pass
+    # the triggers were dropped with the old table
+    if fts:
+        for trigger in fts_triggers:
+            op.execute(trigger)
+    dbapi_connection.commit()
+    bind.exec_driver_sql('PRAGMA foreign_keys=ON')
+
+
+def upgrade():
+    set_shopping_list_autoincrement(True)
+
+
+def downgrade():
+    set_shopping_list_autoincrement(False)
@@ -1,6 +1,8 @@
 import sys
 import click
+import json
 import os
+import subprocess
 from flask_migrate import Migrate, upgrade
 from app import create_app, db
 from app.models import Item, UnitMeasurement, ShoppingList, ShoppingListItems
@@ -47,6 +49,79 @@ def test(coverage):
         COV.erase()
 
 
+@app.cli.command()
+@click.option('--item', 'item_ids', type=int, multiple=True,
+              help='Reprice only the shopping list items of this item, can be repeated.')
+@click.option('--batch-size', type=int, default=None,
+              help='Shopping list items repriced per transaction.')
+def reprice(item_ids, batch_size):
+    """Refresh shopping list item prices from the items."""
+    from app.service.reprice_service import reprice_shopping_list_items
+    repriced = reprice_shopping_list_items(list(item_ids) or None, batch_size)
+    print('Repriced %d shopping list items' % repriced)
+
+
+@app.cli.command()
+@click.option('--lists', default=100000, help='Shopping lists to generate.')
+@click.option('--items-per-list', default=10, help='Items in every shopping list.')
+@click.option('--items', default=None, type=int, help='Items to generate, four times --items-per-list by default.')
+@click.option('--seed', 'random_seed', default=0, help='Random seed, the same seed generates the same data.')
+@click.option('--batch-size', default=10000, help='Rows inserted per executemany.')
+@click.confirmation_option(prompt='This replaces all data in the database. Continue?')
+def seed(lists, items_per_list, items, random_seed, batch_size):
+    """Replace the database content with a generated dataset."""
+    import time
+    from app.seed import seed_dataset
+    started = time.perf_counter()
+    counts = seed_dataset(lists, items_per_list, items, batch_size, random_seed)
+    print('Inserted %s in %.1f seconds' % (', '.join('%d %s rows' % (count, table) for table, count in counts.items()),
+                                           time.perf_counter() - started))
+
+
+@app.cli.command()
+@click.option('--lists', default=1000, help='Shopping lists to seed.')
+@click.option('--items-per-list', default=15, help='Items in every seeded shopping list.')
+@click.option('--items', default=None, type=int, help='Items to seed, four times --items-per-list by default.')
+@click.option('--requests', default=100, help='Requests sent to every endpoint.')
+@click.option('--concurrency', default=1, help='Requests in flight.')
+@click.option('--server/--no-server', default=False,
+              help='Send requests over HTTP to a threaded WSGI server instead of the test client.')
+@click.option('--reseed/--no-reseed', default=True, help='Seed the benchmark database again.')
+@click.option('--output', default='bench-results.json', help='File the json results are written to.')
+def bench(lists, items_per_list, items, requests, concurrency, server, reseed, output):
+    """Benchmark every endpoint on a seeded benchmark database."""
+    from app.bench import run_bench
+    from app.seed import seed_dataset
+    items = max(items or items_per_list * 4, items_per_list)
+    bench_app = create_app('benchmark')
+    if reseed:
+        with bench_app.app_context():
+            seed_dataset(lists, items_per_list, items)
+    endpoints = run_bench(bench_app, lists, items, requests, concurrency, server)
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    results = {
+        "commit": commit,
+        "database": bench_app.config['SQLALCHEMY_DATABASE_URI'],
+        "dataset": {"shopping_lists": lists, "items_per_list": items_per_list, "items": items},
+        "requests": requests,
+        "concurrency": concurrency,
+        "client": 'server' if server else 'test client',
+        "endpoints": endpoints
+    }
+    with open(output, 'w') as results_file:
+        json.dump(results, results_file, indent=2)
+    print('%-36s %10s %10s %10s %10s %10s %7s' % ('endpoint', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms',
+                                                  'queries', 'errors'))
+    for name, stats in endpoints.items():
+        print('%-36s %10.1f %10.3f %10.3f %10.3f %10s %7d' % (
+            name, stats['requests_per_second'], stats['p50_ms'], stats['p95_ms'], stats['p99_ms'],
+            stats['queries_per_request'], stats['errors']))
+    print('Results written to %s' % output)
+
+
 @app.cli.command()
 def deploy():
     """Run deployment tasks."""
@@ -0,0 +1,33 @@
+def find_objects(data, key):
+    """
+    Helper function to find the objects having the key anywhere in parsed json
+    :param data:
+    :param key:
+    :return: list of objects
+    """
+    if isinstance(data, list):
+        return [found for value in data for found in find_objects(value, key)]
+    if isinstance(data, dict):
+        objects = [data] if key in data else []
+        return objects + [found for value in data.values() for found in find_objects(value, key)]
+    return []
+
+
+def shopping_lists(res):
+    """
+    Helper function to get the (shopping_list_title, store_name) of the shopping lists in a json response,
+    none for a response which is not json
+    :param res:
+    :return: list of (title, store_name)
+    """
+    return [(shopping_list['shopping_list_title'], shopping_list.get('store_name'))
+            for shopping_list in find_objects(res.get_json(silent=True), 'shopping_list_title')]
+
+
+def item_titles(res):
+    """
+    Helper function to get the item titles in a json response
+    :param res:
+    :return: list of item_title
+    """
+    return [item['item_title'] for item in find_objects(res.get_json(silent=True), 'item_title')]
@@ -0,0 +1,125 @@
+import asyncio
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from app import create_app, db
+from app.models import Item, UnitMeasurement, ShoppingList
+
+if importlib.util.find_spec('aiosqlite') is not None:
+    from app.asgi import AsyncReadApp
+
+
+@unittest.skipIf(importlib.util.find_spec('aiosqlite') is None, 'aiosqlite is not installed')
+class AsgiTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Unittest setup method to initialize app in testing mode on a database file
+        shared with the ASGI application, and create test data.
+        :return:
+        """
+        handle, self.db_path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(handle)
+        self.app = create_app('testing')
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + self.db_path
+        self.client = self.app.test_client
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        UnitMeasurement.insert_unit_measurement()
+        Item.insert_items()
+        db.session.commit()
+        for title, store_name, item_ids in (('Grocery', 'Amazon', [1, 2]), ('Grocery', 'Walmart', [2, 3]),
+                                            ('Custom', 'Amazon', [])):
+            self.client().post(
+                '/api/v1/shoppingList',
+                content_type='application/json',
+                data=json.dumps({'title': title, 'store': store_name}))
+            shopping_list = ShoppingList.query.filter_by(title=title, store_name=store_name).one()
+            for item_id in item_ids:
+                self.client().put(
+                    '/api/v1/shoppingListItem',
+                    content_type='application/json',
+                    data=json.dumps({'shopping_list_id': shopping_list.id, 'item_id': item_id, 'quantity': 2}))
+        self.loop = asyncio.new_event_loop()
+        self.asgi_app = AsyncReadApp(self.app.config)
+
+    def tearDown(self):
+        """
+        Unittest tear down method to remove data
+        :return:
+        """
+        self.loop.run_until_complete(self.asgi_app.engine.dispose())
+        self.loop.close()
+        db.session.remove()
+        db.drop_all()
+        db.get_engine().dispose()
+        self.app_context.pop()
+        os.remove(self.db_path)
+
+    def asgi_get(self, path, query_string='', method='GET'):
+        """
+        Helper method sending a GET request, or one of the given method, to the ASGI application
+        :param path:
+        :param query_string:
+        :param method:
+        :return: status, data
+        """
+        scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query_string.encode('ascii')}
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        self.loop.run_until_complete(self.asgi_app(scope, receive, send))
+        return messages[0]['status'], json.loads(messages[1]['body'])
+
+    def test_same_json_as_flask(self):
+        """
+        Unittest : The ASGI application answers the search endpoints with the json of the Flask application
+        :return:
+        """
+        for path in ('/api/v1/allShoppingList', '/api/v1/shoppingListByTitle/Grocery',
+                     '/api/v1/searchShoppingListsByTitle/Groc', '/api/v1/shoppingListByItemId/2',
+                     '/api/v1/searchShoppingListByItemName/rice'):
+            for query_string in ('', 'limit=1', 'fields=store_name,item_count', 'include=',
+                                 'fields=shopping_list_title,items.item_title&limit=1', 'include=items'):
+                res = self.client().get(path + '?' + query_string)
+                status, data = self.asgi_get(path, query_string)
+                self.assertEqual(200, status)
+                self.assertEqual(json.loads(res.data), data)
+
+    def test_pagination(self):
+        """
+        Unittest : Pages of the ASGI application follow next_cursor
+        :return:
+        """
+        status, data = self.asgi_get('/api/v1/allShoppingList', 'limit=2')
+        self.assertEqual(['Amazon', 'Walmart'], [row['store_name'] for row in data['shopping_lists']])
+        status, data = self.asgi_get('/api/v1/allShoppingList', 'limit=2&cursor=' + data['next_cursor'])
+        self.assertEqual(['Custom'], [row['shopping_list_title'] for row in data['shopping_lists']])
+        self.assertIsNone(data['next_cursor'])
+
+    def test_errors(self):
+        """
+        Unittest : Invalid query parameters, unknown paths and methods other than GET
+        :return:
+        """
+        status, data = self.asgi_get('/api/v1/allShoppingList', 'limit=0')
+        self.assertEqual(400, status)
+        self.assertEqual({'message': {'limit': 'limit must be a positive integer'}}, data)
+        status, data = self.asgi_get('/api/v1/allShoppingList', 'cursor=abc')
+        self.assertEqual(400, status)
+        self.assertEqual({'message': {'cursor': 'Invalid cursor'}}, data)
+        status, data = self.asgi_get('/api/v1/allShoppingList', 'include=store')
+        self.assertEqual(400, status)
+        self.assertEqual({'message': {'include': 'include must be a comma separated list of items'}}, data)
+        status, data = self.asgi_get('/api/v1/shoppingList')
+        self.assertEqual(404, status)
+        for method in ('POST', 'PUT', 'DELETE'):
+            status, data = self.asgi_get('/api/v1/allShoppingList', method=method)
+            self.assertEqual(405, status)
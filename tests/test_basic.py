@@ -1,6 +1,10 @@
+import os
+import tempfile
 import unittest
 from flask import current_app
+from sqlalchemy import text
 from app import create_app, db
+from config import ProductionConfig
 
 
 class BasicsTestCase(unittest.TestCase):
@@ -35,4 +39,36 @@ class BasicsTestCase(unittest.TestCase):
         Unittest to test of the application is running in testing mode
         :return:
         """
-        self.assertTrue(current_app.config['TESTING'])
\ No newline at end of file
+        self.assertTrue(current_app.config['TESTING'])
+
+    def test_sqlite_pragmas(self):
+        """
+        Unittest to test if the SQLITE_PRAGMAS of the application are set on every connection
+        :return:
+        """
+        handle, db_path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(handle)
+        app = create_app('testing')
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + db_path
+        app.config['SQLITE_PRAGMAS'] = ProductionConfig.SQLITE_PRAGMAS
+        try:
+            with app.app_context():
+                with db.engine.connect() as connection:
+                    self.assertEqual('wal', connection.execute(text('PRAGMA journal_mode')).scalar())
+                    self.assertEqual(1, connection.execute(text('PRAGMA synchronous')).scalar())
+                    self.assertEqual(1, connection.execute(text('PRAGMA foreign_keys')).scalar())
+                    self.assertEqual(5000, connection.execute(text('PRAGMA busy_timeout')).scalar())
+                db.engine.dispose()
+        finally:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+
+    def test_production_config(self):
+        """
+        Unittest to test if the production configuration turns query recording off and tunes the pool
+        :return:
+        """
+        self.assertFalse(ProductionConfig.SQLALCHEMY_RECORD_QUERIES)
+        self.assertTrue(ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS['pool_pre_ping'])
+        self.assertEqual('WAL', ProductionConfig.SQLITE_PRAGMAS['journal_mode'])
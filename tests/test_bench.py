@@ -0,0 +1,89 @@
+import unittest
+from app import create_app, db
+from app.bench import percentile, run_bench
+from app.models import DataVersion, ShoppingList, ShoppingListItems
+from app.seed import seed_dataset
+from app.service import shopping_service
+
+
+class BenchTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Unittest setup method to initialize app in testing mode
+        and seed a small dataset.
+        :return:
+        """
+        self.app = create_app('testing')
+        self.app.config['RESPONSE_CACHE_ENABLED'] = False
+        with self.app.app_context():
+            self.counts = seed_dataset(50, 5, 20)
+
+    def tearDown(self):
+        """
+        Unittest tear down method to remove data
+        :return:
+        """
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_seed_dataset(self):
+        """
+        Unittest : Seeded shopping lists have consistent totals
+        :return:
+        """
+        self.assertEqual({'item': 20, 'shopping_list': 50, 'shopping_list_items': 250}, self.counts)
+        with self.app.app_context():
+            shopping_list = ShoppingList.query.get(7)
+            lines = ShoppingListItems.query.filter_by(shopping_list_id=7).all()
+            self.assertEqual(5, shopping_list.item_count)
+            self.assertEqual(sum(line.quantity for line in lines), shopping_list.total_quantity)
+            self.assertAlmostEqual(sum(line.discounted_total_price for line in lines), shopping_list.discounted_total)
+
+    def test_seed_dataset_deterministic(self):
+        """
+        Unittest : The same seed generates the same data, with the indexes and foreign key checks restored
+        and the data version moved past the one before
+        :return:
+        """
+        def dump():
+            return (db.session.query(ShoppingList.id, ShoppingList.created_time, ShoppingList.actual_total).all(),
+                    db.session.query(ShoppingListItems.shopping_list_id, ShoppingListItems.item_id,
+                                     ShoppingListItems.quantity).order_by(ShoppingListItems.shopping_list_id,
+                                                                          ShoppingListItems.item_id).all())
+
+        with self.app.app_context():
+            seeded = dump()
+            version = DataVersion.query.get(1).version
+            seed_dataset(50, 5, 20, batch_size=7)
+            self.assertEqual(seeded, dump())
+            self.assertEqual(version + 1, DataVersion.query.get(1).version)
+            seed_dataset(50, 5, 20, seed=1)
+            self.assertNotEqual(seeded, dump())
+            self.assertEqual(1, db.session.execute('PRAGMA foreign_keys').scalar())
+            indexes = {row[0] for row in db.session.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            self.assertIn('ix_shopping_list_title_store_name', indexes)
+            self.assertIn('ix_shopping_list_items_item_id', indexes)
+            data = shopping_service.search_shopping_list_by_title_keyword('Rice')
+            self.assertEqual(4, len(data))
+
+    def test_run_bench(self):
+        """
+        Unittest : Every endpoint is benchmarked without errors
+        :return:
+        """
+        results = run_bench(self.app, 50, 20, 3)
+        self.assertEqual(15, len(results))
+        for name, stats in results.items():
+            self.assertEqual(0, stats['errors'], name)
+            self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+            self.assertIsNotNone(stats['queries_per_request'])
+
+    def test_percentile(self):
+        """
+        Unittest : Nearest rank percentiles
+        :return:
+        """
+        values = list(range(1, 101))
+        self.assertEqual([50, 95, 99, 100], [percentile(values, percent) for percent in (50, 95, 99, 100)])
+        self.assertEqual(7, percentile([7], 99))
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import threading
+import unittest
+from app import create_app, db
+from app.models import Item, UnitMeasurement, ShoppingListItems
+from app.service import shopping_service
+
+
+class ConcurrentAddsTestCase(unittest.TestCase):
+    threads = 4
+    adds_per_thread = 25
+
+    def setUp(self):
+        """
+        Unittest setup method to initialize app in testing mode on a database file
+        shared by the connections of several threads, and create test data.
+        :return:
+        """
+        handle, self.db_path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(handle)
+        self.app = create_app('testing')
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + self.db_path
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        UnitMeasurement.insert_unit_measurement()
+        Item.insert_items()
+        db.session.commit()
+        shopping_service.add_shopping_list('test_title', 'test_store')
+
+    def tearDown(self):
+        """
+        Unittest tear down method to remove data
+        :return:
+        """
+        db.session.remove()
+        db.drop_all()
+        db.get_engine().dispose()
+        self.app_context.pop()
+        os.remove(self.db_path)
+
+    def add_item(self, errors):
+        """
+        Helper method adding item 1 to the shopping list adds_per_thread times
+        :param errors:
+        :return:
+        """
+        with self.app.app_context():
+            try:
+                for _ in range(self.adds_per_thread):
+                    shopping_list = shopping_service.get_shopping_list(1)
+                    shopping_service.add_item_to_shopping_list(shopping_list, shopping_service.get_item(1), 1)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    def test_concurrent_adds_of_same_item(self):
+        """
+        Unittest : Adding the same item from several threads loses no quantity
+        :return:
+        """
+        errors = []
+        workers = [threading.Thread(target=self.add_item, args=(errors,)) for _ in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual([], errors)
+        expected = self.threads * self.adds_per_thread
+        self.assertEqual(expected, ShoppingListItems.query.filter_by(shopping_list_id=1, item_id=1).one().quantity)
+        res = shopping_service.get_all_shopping_list()[0]
+        self.assertEqual(1, res['item_count'])
+        self.assertEqual(expected, res['total_quantity'])
+        self.assertEqual(res['items'][0]['actual_total_price'], res['actual_total'])
+        self.assertEqual(res['items'][0]['discounted_total_price'], res['discounted_total'])
@@ -0,0 +1,119 @@
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.models import Item, UnitMeasurement
+from app.service import shopping_service
+from app.service.item_cache import CachedItem, ItemCache, get_item
+
+
+class ItemCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Unittest setup method to initialize app in testing mode
+        and create test data.
+        :return:
+        """
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        UnitMeasurement.insert_unit_measurement()
+        Item.insert_items()
+        db.session.commit()
+
+    def tearDown(self):
+        """
+        Unittest tear down method to remove data
+        :return:
+        """
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_least_recently_used_item_is_evicted(self):
+        """
+        Unittest : Cache keeps max_size most recently used items and counts hits and misses
+        :return:
+        """
+        loaded = []
+
+        def load(item_ids):
+            loaded.extend(item_ids)
+            return [CachedItem(item_id, 'title', 100, 1, 1) for item_id in item_ids]
+
+        cache = ItemCache(2)
+        cache.get_many([1, 2], load)
+        cache.get_many([1], load)
+        cache.get_many([3], load)
+        cache.get_many([1, 2], load)
+        self.assertEqual([1, 2, 3, 2], sorted(loaded[:2]) + loaded[2:])
+        self.assertEqual({"hits": 2, "misses": 4, "size": 2, "max_size": 2}, cache.stats())
+
+    def test_get_item_reads_database_once(self):
+        """
+        Unittest : Get item twice - second time it is served from the cache
+        :return:
+        """
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            self.assertEqual('Water Bottle', get_item(1).title)
+            self.assertEqual('Water Bottle', get_item(1).title)
+            self.assertIsNone(get_item(100))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        self.assertEqual(2, len(statements))
+
+    def test_item_writes_invalidate_cache(self):
+        """
+        Unittest : Committed item updates are not served stale from the cache
+        :return:
+        """
+        self.assertEqual(100, get_item(1).price)
+        item = Item.query.filter_by(id=1).first()
+        item.price = 150
+        db.session.commit()
+        self.assertEqual(150, get_item(1).price)
+
+    def test_items_expire_after_ttl(self):
+        """
+        Unittest : Items are loaded again once older than the ttl
+        :return:
+        """
+        loaded = []
+
+        def load(item_ids):
+            loaded.extend(item_ids)
+            return [CachedItem(item_id, 'title', 100, 1, 1) for item_id in item_ids]
+
+        cache = ItemCache(2, ttl=0)
+        cache.get_many([1], load)
+        cache.get_many([1], load)
+        self.assertEqual([1, 1], loaded)
+        cache = ItemCache(2, ttl=60)
+        cache.get_many([1], load)
+        cache.get_many([1], load)
+        self.assertEqual([1, 1, 1], loaded)
+
+    def test_added_items_use_current_price(self):
+        """
+        Unittest : Line items snapshot the price of the item row, not the cached one,
+        when the item was changed by another process
+        :return:
+        """
+        self.assertEqual(100, get_item(1).price)
+        with db.engine.begin() as connection:
+            connection.execute(Item.__table__.update().where(Item.id == 1).values(price=150, discount_percentage=10))
+        self.assertEqual(100, get_item(1).price)
+
+        shopping_list_id = shopping_service.add_shopping_list('Grocery', 'Amazon')
+        data = shopping_service.add_item_to_shopping_list(shopping_service.get_shopping_list(shopping_list_id),
+                                                          get_item(1), 2)
+        self.assertEqual(150, data['items'][0]['actual_item_price'])
+        self.assertEqual(135, data['items'][0]['discounted_item_price'])
+        self.assertEqual(300, data['actual_total'])
+        self.assertEqual(270, data['discounted_total'])
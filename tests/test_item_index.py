@@ -0,0 +1,124 @@
+import unittest
+from app import create_app, db
+from app.models import Item, UnitMeasurement
+from app.service import shopping_service
+from app.service.item_index import ItemTitleIndex, bump_item_version, get_item_index, read_item_version
+
+
+class ItemTitleIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Unittest setup method to initialize app in testing mode
+        and create test data.
+        :return:
+        """
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        UnitMeasurement.insert_unit_measurement()
+        Item.insert_items()
+        db.session.commit()
+
+    def tearDown(self):
+        """
+        Unittest tear down method to remove data
+        :return:
+        """
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_search(self):
+        """
+        Unittest : Search substrings of indexed titles ignoring case
+        :return:
+        """
+        index = ItemTitleIndex()
+        index.build([(1, 'Water Bottle'), (2, 'Rice 1 KG Bag'), (3, 'Rice 2 KG Bag')])
+        self.assertEqual({1}, index.search('ter bot'))
+        self.assertEqual({2, 3}, index.search('rice'))
+        self.assertEqual({2, 3}, index.search('G'))
+        self.assertEqual(set(), index.search('rice 3'))
+
+        index.add(3, 'Rice 3 KG Bag')
+        self.assertEqual({3}, index.search('rice 3'))
+        index.remove(2)
+        self.assertEqual({3}, index.search('rice'))
+
+    def test_index_follows_item_writes(self):
+        """
+        Unittest : Committed item inserts, updates and deletes are applied to the index
+        :return:
+        """
+        index = get_item_index()
+        self.assertEqual({1}, index.search('water'))
+
+        item = Item(title='Sparkling Water', price=100, discount_percentage=10, unit_measurement_id=1)
+        db.session.add(item)
+        db.session.commit()
+        self.assertEqual({1, item.id}, index.search('water'))
+        # the index of the writing process is not rebuilt for its own writes
+        self.assertEqual(read_item_version(), index.version)
+
+        item.title = 'Lemonade'
+        db.session.commit()
+        self.assertEqual({1}, index.search('water'))
+
+        db.session.delete(item)
+        db.session.commit()
+        self.assertEqual(set(), index.search('lemon'))
+
+        db.session.add(Item(title='Still Water', price=100, discount_percentage=10, unit_measurement_id=1))
+        db.session.flush()
+        db.session.rollback()
+        self.assertEqual({1}, index.search('water'))
+
+    def test_index_follows_other_processes(self):
+        """
+        Unittest : Item writes made without the item events of this process, e.g. by another worker,
+        are picked up once their transaction bumps the item version, also when the item count and greatest id
+        stay the same
+        :return:
+        """
+        item = {'title': 'Sparkling Water', 'price': 100, 'discount_percentage': 10, 'unit_measurement_id': 1}
+        self.assertEqual({1}, get_item_index().search('water'))
+        with db.engine.begin() as connection:
+            connection.execute(Item.__table__.insert(), item)
+            bump_item_version(connection)
+        self.assertEqual({1, 13}, get_item_index().search('water'))
+
+        with db.engine.begin() as connection:
+            connection.execute(Item.__table__.delete().where(Item.id == 13))
+            connection.execute(Item.__table__.insert(), dict(item, id=13, title='Lemonade'))
+            bump_item_version(connection)
+        self.assertEqual({1}, get_item_index().search('water'))
+        self.assertEqual({13}, get_item_index().search('lemon'))
+
+    def test_search_like_wildcards(self):
+        """
+        Unittest : Item name keywords with LIKE wildcards keep matching like LIKE
+        :return:
+        """
+        shopping_list_id = shopping_service.add_shopping_list('Grocery', 'Amazon')
+        shopping_service.add_item_to_shopping_list(shopping_service.get_shopping_list(shopping_list_id),
+                                                   shopping_service.get_item(1), 1)
+        self.assertEqual(['Grocery'], [data['shopping_list_title'] for data in
+                                       shopping_service.search_shopping_list_by_item_name_keyword('%')])
+        self.assertEqual(1, len(shopping_service.search_shopping_list_by_item_name_keyword('W_ter')))
+        self.assertEqual([], shopping_service.search_shopping_list_by_item_name_keyword('W_terx'))
+
+    def test_search_many_items(self):
+        """
+        Unittest : Item name keywords matching more items than SHOPPING_LIST_BULK_CHUNK_SIZE are matched in SQL
+        :return:
+        """
+        shopping_list_id = shopping_service.add_shopping_list('Grocery', 'Amazon')
+        shopping_service.add_item_to_shopping_list(shopping_service.get_shopping_list(shopping_list_id),
+                                                   shopping_service.get_item(1), 1)
+        self.app.config['SHOPPING_LIST_BULK_CHUNK_SIZE'] = 1
+        self.assertEqual(['Grocery'], [data['shopping_list_title'] for data in
+                                       shopping_service.search_shopping_list_by_item_name_keyword('e')])
+        self.assertEqual(['Grocery'], [data['shopping_list_title'] for data in
+                                       shopping_service.search_shopping_list_by_item_name_keyword('water')])
+        self.assertEqual([], shopping_service.search_shopping_list_by_item_name_keyword('rice'))
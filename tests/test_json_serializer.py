@@ -0,0 +1,111 @@
+import importlib.util
+import json
+import unittest
+from app import create_app, db, json_serializer, response_cache
+from app.json_serializer import StdlibSerializer, create_serializer
+from app.models import Item, UnitMeasurement
+
+
+class JsonSerializerTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Unittest setup method to initialize app in testing mode
+        and create test data.
+        :return:
+        """
+        self.app = create_app("testing")
+        self.app.config['RESPONSE_CACHE_ENABLED'] = False
+        response_cache.init_app(self.app)
+        self.client = self.app.test_client
+
+        with self.app.app_context():
+            db.create_all()
+            UnitMeasurement.insert_unit_measurement()
+            Item.insert_items()
+            db.session.commit()
+        for title, store_name in (('Grocery', 'Amazon'), ('Épicerie', 'Walmart')):
+            res = self.client().post('/api/v1/shoppingList', content_type='application/json',
+                                     data=json.dumps({'title': title, 'store': store_name}))
+            self.client().put('/api/v1/shoppingListItems', content_type='application/json',
+                              data=json.dumps({'shopping_list_id': json.loads(res.data)['shopping_list_id'],
+                                               'items': [{'item_id': 1, 'quantity': 2},
+                                                         {'item_id': 5, 'quantity': 1}]}))
+
+    def tearDown(self):
+        """
+        Unittest tear down method to remove data
+        :return:
+        """
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def use_serializer(self, name, **settings):
+        """
+        Helper method to switch the json serializer of the app
+        :param name:
+        :param settings: RESTFUL_JSON settings
+        :return:
+        """
+        self.app.config['JSON_SERIALIZER'] = name
+        self.app.config['RESTFUL_JSON'] = settings
+        json_serializer.init_app(self.app)
+
+    def test_stdlib_serializer(self):
+        """
+        Unittest: The stdlib serializer is compact by default and honors RESTFUL_JSON
+        :return:
+        """
+        data = {"title": 'Épicerie', "items": [1, 2.5]}
+        self.assertEqual('{"title":"Épicerie","items":[1,2.5]}'.encode('utf-8'), StdlibSerializer({}).dumps(data))
+        self.assertEqual(b'{"items": [1, 2.5], "title": "\\u00c9picerie"}',
+                         StdlibSerializer({'separators': (', ', ': '), 'ensure_ascii': True,
+                                           'sort_keys': True}).dumps(data))
+        self.assertIsInstance(create_serializer({'JSON_SERIALIZER': 'json'}), StdlibSerializer)
+
+    def test_debug_mode_is_not_indented(self):
+        """
+        Unittest: Responses are not indented in debug mode
+        :return:
+        """
+        self.use_serializer('json')
+        self.app.debug = True
+        res = self.client().get('/api/v1/allShoppingList')
+        self.assertEqual(200, res.status_code)
+        self.assertEqual('application/json', res.mimetype)
+        self.assertEqual(1, res.data.count(b'\n'))
+        self.assertEqual('Épicerie', json.loads(res.data)[1]['shopping_list_title'])
+
+    @unittest.skipIf(importlib.util.find_spec('orjson') is None, 'orjson is not installed')
+    def test_orjson_serializer(self):
+        """
+        Unittest: orjson renders the same documents as the stdlib serializer on every kind of response
+        :return:
+        """
+        urls = ['/api/v1/allShoppingList', '/api/v1/allShoppingList?limit=1',
+                '/api/v1/allShoppingList?stream=true', '/api/v1/allShoppingList?limit=0',
+                '/api/v1/shoppingListByItemId/5']
+        expected = [(res.status_code, json.loads(res.data)) for res in map(self.client().get, urls)]
+        self.use_serializer('orjson')
+        self.assertEqual(expected, [(res.status_code, json.loads(res.data)) for res in map(self.client().get, urls)])
+        self.assertIn(b'"shopping_list_title":"Grocery","store_name":"Amazon"',
+                      self.client().get('/api/v1/allShoppingList').data)
+
+        res = self.client().put('/api/v1/shoppingList', content_type='application/json',
+                                data=json.dumps({'id': 10, 'title': 'Missing'}))
+        self.assertEqual(409, res.status_code)
+        self.assertEqual('application/json', res.mimetype)
+        self.assertEqual({'message': 'Shopping List does not exist'}, json.loads(res.data))
+
+    def test_stream_is_valid_json(self):
+        """
+        Unittest: The streamed array is a valid json document
+        :return:
+        """
+        self.use_serializer('json')
+        res = self.client().get('/api/v1/allShoppingList?stream=true')
+        self.assertEqual(['Grocery', 'Épicerie'], [row['shopping_list_title'] for row in json.loads(res.data)])
+
+
+if __name__ == '__main__':
+    unittest.main()
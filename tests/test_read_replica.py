@@ -0,0 +1,153 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from app import create_app, db, read_only, response_cache
+from app.models import Item, UnitMeasurement, ShoppingList
+from app.service import shopping_service
+
+
+class ReadReplicaTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Unittest setup method to initialize app in testing mode with a primary and a replica SQLite file,
+        create test data on the primary and replicate it.
+        :return:
+        """
+        self.directory = tempfile.mkdtemp()
+        self.primary = os.path.join(self.directory, 'primary.sqlite')
+        self.replica = os.path.join(self.directory, 'replica.sqlite')
+        self.app = create_app("testing")
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + self.primary
+        self.app.config['SQLALCHEMY_BINDS'] = {'replica': 'sqlite:///' + self.replica}
+        self.app.config['READ_REPLICA_BIND'] = 'replica'
+        self.app.config['RESPONSE_CACHE_ENABLED'] = False
+        response_cache.init_app(self.app)
+        self.client = self.app.test_client
+
+        with self.app.app_context():
+            db.create_all()
+            UnitMeasurement.insert_unit_measurement()
+            Item.insert_items()
+            db.session.commit()
+        self.add_shopping_list('Grocery', 'Amazon')
+        self.replicate()
+
+    def tearDown(self):
+        """
+        Unittest tear down method to remove data
+        :return:
+        """
+        with self.app.app_context():
+            db.session.remove()
+            db.get_engine(self.app).dispose()
+            db.get_engine(self.app, bind='replica').dispose()
+        shutil.rmtree(self.directory)
+
+    def replicate(self):
+        """
+        Helper method to bring the replica up to date with the primary by copying the database file
+        :return:
+        """
+        with self.app.app_context():
+            db.get_engine(self.app).dispose()
+            db.get_engine(self.app, bind='replica').dispose()
+        shutil.copyfile(self.primary, self.replica)
+
+    def add_shopping_list(self, title, store_name):
+        """
+        Helper method to create a shopping list
+        :return: shopping_list_id
+        """
+        res = self.client().post('/api/v1/shoppingList', content_type='application/json',
+                                 data=json.dumps({'title': title, 'store': store_name}))
+        return json.loads(res.data)['shopping_list_id']
+
+    def get_titles(self):
+        """
+        Helper method to get the titles of all shopping lists
+        :return: titles
+        """
+        return [data['shopping_list_title'] for data in
+                json.loads(self.client().get('/api/v1/allShoppingList').data)]
+
+    def test_reads_go_to_replica(self):
+        """
+        Unittest: Read endpoints serve the replica, which sees writes once replicated
+        :return:
+        """
+        self.add_shopping_list('Custom', 'Walmart')
+        self.assertEqual(['Grocery'], self.get_titles())
+        res = self.client().get('/api/v1/summary/stores')
+        self.assertEqual(['Amazon'], [row['store_name'] for row in json.loads(res.data)])
+
+        self.replicate()
+        self.assertEqual(['Grocery', 'Custom'], self.get_titles())
+
+    def test_writes_go_to_primary(self):
+        """
+        Unittest: Writes, and the lookups they depend on, use the primary
+        :return:
+        """
+        shopping_list_id = self.add_shopping_list('Custom', 'Walmart')
+        res = self.client().put('/api/v1/shoppingListItems', content_type='application/json',
+                                data=json.dumps({'shopping_list_id': shopping_list_id,
+                                                 'items': [{'item_id': 1, 'quantity': 2}]}))
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(2, json.loads(res.data)['total_quantity'])
+        with self.app.app_context():
+            self.assertEqual(2, ShoppingList.query.get(shopping_list_id).total_quantity)
+            self.assertEqual(1, db.get_engine(self.app, bind='replica').execute(
+                'SELECT count(*) FROM shopping_list').scalar())
+
+    def test_read_your_writes(self):
+        """
+        Unittest: Reads after a write in the same session use the primary, the next session the replica again
+        :return:
+        """
+        with self.app.app_context():
+            self.assertEqual(1, len(shopping_service.get_all_shopping_list()))
+            shopping_service.add_shopping_list('Custom', 'Walmart')
+            self.assertEqual(2, len(shopping_service.get_all_shopping_list()))
+            db.session.remove()
+
+            self.assertEqual(1, len(shopping_service.get_all_shopping_list()))
+            db.session.remove()
+
+            # a flush pins the session as well, even if not committed yet
+            db.session.add(ShoppingList(title='Party', store_name='Costco'))
+            self.assertEqual(3, len(shopping_service.get_all_shopping_list()))
+            db.session.rollback()
+            db.session.remove()
+
+    def test_read_only(self):
+        """
+        Unittest: read_only marks nested calls and generators, and reads the primary without READ_REPLICA_BIND
+        :return:
+        """
+        self.add_shopping_list('Custom', 'Walmart')
+
+        @read_only
+        def count_shopping_lists():
+            return ShoppingList.query.count()
+
+        @read_only
+        def iter_counts():
+            yield count_shopping_lists()
+            yield ShoppingList.query.count()
+
+        with self.app.app_context():
+            self.assertEqual(2, ShoppingList.query.count())
+            self.assertEqual(1, count_shopping_lists())
+            self.assertEqual([1, 1], list(iter_counts()))
+            self.assertFalse(db.session().info['read_only'])
+            db.session.remove()
+
+            self.app.config['READ_REPLICA_BIND'] = None
+            self.assertEqual(2, count_shopping_lists())
+            db.session.remove()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from app import create_app, db
+from app.models import Item, UnitMeasurement, ShoppingList, ShoppingListItems
+from app.service import shopping_service
+from app.service.reprice_service import reprice_shopping_list_items
+
+
+class RepriceServiceTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Unittest setup method to initialize app in testing mode
+        and create test data.
+        :return:
+        """
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        UnitMeasurement.insert_unit_measurement()
+        Item.insert_items()
+        db.session.commit()
+        for store_name in ('first_store', 'second_store', 'third_store'):
+            shopping_service.add_shopping_list('test_title', store_name)
+        for shopping_list in ShoppingList.query.all():
+            shopping_service.add_items_to_shopping_list(
+                shopping_list, [(shopping_service.get_item(1), 2), (shopping_service.get_item(2), 3)])
+
+    def tearDown(self):
+        """
+        Unittest tear down method to remove data
+        :return:
+        """
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_reprice_shopping_list_items(self):
+        """
+        Unittest : Changed item prices and discounts are applied to shopping list items and totals
+        :return:
+        """
+        revisions = [shopping_list.revision for shopping_list in ShoppingList.query.order_by(ShoppingList.id)]
+        Item.query.get(1).price = 150
+        Item.query.get(2).discount_percentage = 50
+        db.session.commit()
+
+        self.assertEqual(6, reprice_shopping_list_items(batch_size=4))
+        self.assertEqual(0, reprice_shopping_list_items())
+
+        line = ShoppingListItems.query.filter_by(shopping_list_id=2, item_id=1).one()
+        self.assertEqual([150, 1.5, 148.5, 300, 297], [line.actual_item_price, line.discount_per_item,
+                                                       line.discounted_item_price, line.actual_total_price,
+                                                       line.discounted_total_price])
+        line = ShoppingListItems.query.filter_by(shopping_list_id=2, item_id=2).one()
+        self.assertEqual([50, 100, 300], [line.discount_percentage, line.discounted_item_price,
+                                          line.discounted_total_price])
+        for shopping_list in ShoppingList.query.order_by(ShoppingList.id):
+            self.assertEqual(900, shopping_list.actual_total)
+            self.assertEqual(597, shopping_list.discounted_total)
+            self.assertGreater(shopping_list.revision, revisions[shopping_list.id - 1])
+
+    def test_reprice_given_items(self):
+        """
+        Unittest : Only the shopping list items of the given items are repriced
+        :return:
+        """
+        Item.query.get(1).price = 150
+        Item.query.get(2).price = 250
+        db.session.commit()
+
+        self.assertEqual(3, reprice_shopping_list_items([2]))
+        self.assertEqual(100, ShoppingListItems.query.filter_by(shopping_list_id=1, item_id=1).one().actual_item_price)
+        self.assertEqual(250, ShoppingListItems.query.filter_by(shopping_list_id=1, item_id=2).one().actual_item_price)
+        self.assertEqual(950, ShoppingList.query.get(1).actual_total)
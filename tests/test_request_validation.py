@@ -0,0 +1,99 @@
+import unittest
+from werkzeug.exceptions import HTTPException
+from app import create_app
+from app.api import shopping_list
+from app.api.validation import Field, JsonBody
+
+BODIES = [
+    shopping_list.shopping_list_post_body,
+    shopping_list.shopping_lists_post_body,
+    shopping_list.shopping_list_put_body,
+    shopping_list.shopping_list_item_put_body,
+    shopping_list.shopping_list_items_put_body,
+    shopping_list.shopping_list_delete_body,
+    shopping_list.shopping_lists_delete_body
+]
+
+VALID = {
+    'id': 1, 'shopping_list_id': 2, 'item_id': 3, 'quantity': 4, 'title': 'Grocery', 'store': 'Amazon',
+    'shopping_lists': [{'title': 'Grocery', 'store': 'Amazon'}], 'items': [{'item_id': 1, 'quantity': 2}],
+    'ids': [1, 2]
+}
+
+INVALID = [None, '', '7', 'abc', 1.9, True, 0, [], {}, [1, '2'], ['a'], [{'title': 'Grocery'}],
+           [{'item_id': 'x', 'quantity': 1}], [{'item_id': [1], 'quantity': 1}], [None], ['Grocery'] * 10001]
+
+
+def outcome(parse):
+    """
+    Helper method to run a parser
+    :param parse:
+    :return: parsed values or the status and data of the error
+    """
+    try:
+        return dict(parse())
+    except HTTPException as e:
+        return e.code, getattr(e, 'data', None), e.description
+
+
+class RequestValidationTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Unittest setup method to initialize app in testing mode
+        :return:
+        """
+        self.app = create_app('testing')
+
+    def assert_same_as_request_parser(self, body, **request_args):
+        """
+        Helper method comparing the compiled validation with the equivalent request parser
+        :param body: JsonBody
+        :param request_args: request of the test request context
+        :return:
+        """
+        with self.app.test_request_context('/', method='PUT', **request_args):
+            expected = outcome(body.request_parser().parse_args)
+            self.assertEqual(expected, outcome(body.parse), request_args)
+
+    def test_same_results_as_request_parser(self):
+        """
+        Unittest: Every write endpoint parses and rejects bodies exactly like its reqparse parser did
+        :return:
+        """
+        for body in BODIES:
+            names = [field.name for field in body.definitions]
+            valid = {name: VALID[name] for name in names}
+            self.assert_same_as_request_parser(body, json=valid)
+            self.assert_same_as_request_parser(body, json={})
+            self.assert_same_as_request_parser(body, json=[valid])
+            self.assert_same_as_request_parser(body, json='Grocery')
+            self.assert_same_as_request_parser(body, data='{"id": ', content_type='application/json')
+            self.assert_same_as_request_parser(body, data='id=1')
+            for name in names:
+                self.assert_same_as_request_parser(body, json={key: value for key, value in valid.items()
+                                                               if key != name})
+                for value in INVALID:
+                    self.assert_same_as_request_parser(body, json=dict(valid, **{name: value}))
+
+    def test_first_invalid_field_is_reported(self):
+        """
+        Unittest: Fields are validated in order and the first error aborts
+        :return:
+        """
+        body = JsonBody(Field('id', int, required=True), Field('quantity', int, required=True))
+        with self.app.test_request_context('/', method='PUT', json={'id': 'x'}):
+            self.assertEqual((400, {'message': {'id': "invalid literal for int() with base 10: 'x'"}}),
+                             outcome(body.parse)[:2])
+        with self.app.test_request_context('/', method='PUT', json={'id': '5', 'title': 'ignored'}):
+            self.assertEqual((400, {'message': {'quantity': 'Missing required parameter in the JSON body'}}),
+                             outcome(body.parse)[:2])
+        with self.app.test_request_context('/', method='PUT', json={'id': '5', 'quantity': 2.5}):
+            self.assertEqual({'id': 5, 'quantity': 2}, body.parse())
+        # reqparse failed with an AttributeError on a string body containing a parameter name
+        with self.app.test_request_context('/', method='PUT', json='id'):
+            self.assertEqual((400, {'message': {'id': 'Missing required parameter in the JSON body'}}),
+                             outcome(body.parse)[:2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import json
+from unittest import mock
+from sqlalchemy import event
+from app import create_app, db
+from app.models import DataVersion, Item, ShoppingList, UnitMeasurement
+from app.response_cache import MemoryBackend, bump_data_version, read_data_version
+from tests import item_titles, shopping_lists
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Unittest setup method to initialize app in testing mode
+        and create test data.
+        :return:
+        """
+        self.app = create_app("testing")
+        self.client = self.app.test_client
+
+        with self.app.app_context():
+            db.create_all()
+            UnitMeasurement.insert_unit_measurement()
+            Item.insert_items()
+            db.session.commit()
+
+    def tearDown(self):
+        """
+        Unittest tear down method to remove data
+        :return:
+        """
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def count_queries(self, url):
+        """
+        Helper method to count the statements executed while getting url
+        :param url:
+        :return: response, count
+        """
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with self.app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            res = self.client().get(url)
+        finally:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+        return res, len(statements)
+
+    def test_memory_backend(self):
+        """
+        Unittest: Memory backend evicts least recently used and expired entries
+        :return:
+        """
+        backend = MemoryBackend(2)
+        backend.set('a', 1, None)
+        backend.set('b', 2, None)
+        backend.get('a')
+        backend.set('c', 3, None)
+        self.assertEqual(1, backend.get('a'))
+        self.assertIsNone(backend.get('b'))
+
+        with mock.patch('app.response_cache.time.monotonic', return_value=0):
+            backend.set('f', 6, 10)
+        with mock.patch('app.response_cache.time.monotonic', return_value=10):
+            self.assertIsNone(backend.get('f'))
+
+    def test_cached_response_until_write(self):
+        """
+        Unittest: Repeated reads are served from the cache, writes make them stale
+        :return:
+        """
+        self.client().post(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({'title': 'Grocery', 'store': 'Amazon'}))
+
+        res, queries = self.count_queries('/api/v1/shoppingListByTitle/Grocery')
+        self.assertTrue(queries > 0)
+        res, queries = self.count_queries('/api/v1/shoppingListByTitle/Grocery')
+        self.assertEqual(1, queries)
+        self.assertIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
+
+        self.client().put(
+            '/api/v1/shoppingListItem',
+            content_type='application/json',
+            data=json.dumps({"shopping_list_id": 1, "item_id": 1, "quantity": 1}))
+
+        res, queries = self.count_queries('/api/v1/shoppingListByTitle/Grocery')
+        self.assertTrue(queries > 0)
+        self.assertIn('Water Bottle', item_titles(res))
+
+    def test_cache_key_includes_query_parameters(self):
+        """
+        Unittest: Responses for different query parameters are cached apart
+        :return:
+        """
+        self.client().post(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({'title': 'Grocery', 'store': 'Amazon'}))
+
+        self.assertIsInstance(json.loads(self.client().get('/api/v1/allShoppingList').data), list)
+        self.assertIsInstance(json.loads(self.client().get('/api/v1/allShoppingList?limit=1').data), dict)
+
+    def test_writes_of_other_processes_make_responses_stale(self):
+        """
+        Unittest: The data version is kept in the database, bumped with every write transaction
+        and by writes on connections of their own, e.g. of another worker or a CLI command
+        :return:
+        """
+        self.client().post(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({'title': 'Grocery', 'store': 'Amazon'}))
+        with self.app.app_context():
+            version = read_data_version()
+            self.assertEqual(version, DataVersion.query.get(1).version)
+            self.assertTrue(version > 0)
+            # commits without writes keep the version
+            db.session.commit()
+            self.assertEqual(version, read_data_version())
+
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery')
+        etag = res.headers['ETag']
+        with self.app.app_context():
+            with db.engine.begin() as connection:
+                connection.execute(ShoppingList.__table__.update().values(title='Grocery', store_name='Walmart',
+                                                                          revision=ShoppingList.revision + 1))
+                bump_data_version(connection)
+
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery', headers={'If-None-Match': etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('Walmart', [store_name for _, store_name in shopping_lists(res)])
@@ -1,7 +1,9 @@
 import unittest
 import json
+from sqlalchemy import event
 from app import create_app, db
 from app.models import Item, UnitMeasurement
+from tests import item_titles, shopping_lists
 
 
 class ShoppingListAPITestCase(unittest.TestCase):
@@ -87,8 +89,8 @@ class ShoppingListAPITestCase(unittest.TestCase):
         """
         res = self.client().get('/api/v1/allShoppingList')
         self.assertEqual(res.status_code, 200)
-        self.assertNotIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertNotIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_get_all_shopping_list_1(self):
         """
@@ -100,8 +102,8 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/allShoppingList')
         self.assertEqual(res.status_code, 200)
-        self.assertIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_get_all_shopping_list_2(self):
         """
@@ -114,8 +116,8 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/allShoppingList')
         self.assertEqual(res.status_code, 200)
-        self.assertIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertIn('Water Bottle', item_titles(res))
 
     def test_get_shopping_list_with_title(self):
         """
@@ -125,8 +127,8 @@ class ShoppingListAPITestCase(unittest.TestCase):
         """
         res = self.client().get('/api/v1/shoppingListByTitle/Grocery')
         self.assertEqual(res.status_code, 200)
-        self.assertNotIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertNotIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_get_shopping_list_with_title_1(self):
         """
@@ -138,9 +140,9 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/shoppingListByTitle/Grocery')
         self.assertEqual(res.status_code, 200)
-        self.assertIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_get_shopping_list_with_title_2(self):
         """
@@ -153,9 +155,9 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/shoppingListByTitle/Grocery')
         self.assertEqual(res.status_code, 200)
-        self.assertIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertIn('Water Bottle', item_titles(res))
 
     def test_search_shopping_list_by_title_keyword(self):
         """
@@ -165,10 +167,10 @@ class ShoppingListAPITestCase(unittest.TestCase):
         """
         res = self.client().get('/api/v1/searchShoppingListsByTitle/Grocery')
         self.assertEqual(res.status_code, 200)
-        self.assertNotIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Custom", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertNotIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Custom', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_search_shopping_list_by_title_keyword_1(self):
         """
@@ -180,10 +182,10 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/searchShoppingListsByTitle/Grocery')
         self.assertEqual(res.status_code, 200)
-        self.assertIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Custom", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Custom', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_search_shopping_list_by_title_keyword_2(self):
         """
@@ -196,10 +198,10 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/searchShoppingListsByTitle/Grocery')
         self.assertEqual(res.status_code, 200)
-        self.assertIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Custom", "store_name": "Amazon"', str(res.data))
-        self.assertIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Custom', 'Amazon'), shopping_lists(res))
+        self.assertIn('Water Bottle', item_titles(res))
 
     def test_search_shopping_list_by_title_keyword_3_error(self):
         """
@@ -212,10 +214,10 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/searchShoppingListsByTitle')
         self.assertEqual(res.status_code, 404)
-        self.assertNotIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Custom", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertNotIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Custom', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_get_shopping_list_by_item_id(self):
         """
@@ -225,8 +227,8 @@ class ShoppingListAPITestCase(unittest.TestCase):
         """
         res = self.client().get('/api/v1/shoppingListByItemId/1')
         self.assertEqual(res.status_code, 200)
-        self.assertNotIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertNotIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_get_shopping_list_by_item_id_1(self):
         """
@@ -238,10 +240,10 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/shoppingListByItemId/1')
         self.assertEqual(res.status_code, 200)
-        self.assertNotIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Custom", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertNotIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Custom', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_get_shopping_list_by_item_id_2(self):
         """
@@ -254,10 +256,10 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/shoppingListByItemId/1')
         self.assertEqual(res.status_code, 200)
-        self.assertIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Custom", "store_name": "Amazon"', str(res.data))
-        self.assertIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Custom', 'Amazon'), shopping_lists(res))
+        self.assertIn('Water Bottle', item_titles(res))
 
     def test_get_shopping_list_by_item_id_3_error(self):
         """
@@ -270,10 +272,10 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/shoppingListByItemId')
         self.assertEqual(res.status_code, 404)
-        self.assertNotIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Custom", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertNotIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Custom', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_get_shopping_list_by_item_id_4_error(self):
         """
@@ -286,10 +288,10 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/shoppingListByItemId/not_integer')
         self.assertEqual(res.status_code, 404)
-        self.assertNotIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Custom", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertNotIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Custom', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_search_shopping_list_by_item_name_keyword(self):
         """
@@ -299,8 +301,8 @@ class ShoppingListAPITestCase(unittest.TestCase):
         """
         res = self.client().get('/api/v1/searchShoppingListByItemName/Water')
         self.assertEqual(res.status_code, 200)
-        self.assertNotIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertNotIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_search_shopping_list_by_item_name_keyword_1(self):
         """
@@ -312,10 +314,10 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/searchShoppingListByItemName/Water')
         self.assertEqual(res.status_code, 200)
-        self.assertNotIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Custom", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertNotIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Custom', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
 
     def test_search_shopping_list_by_item_name_keyword_2(self):
         """
@@ -328,10 +330,10 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/searchShoppingListByItemName/Water')
         self.assertEqual(res.status_code, 200)
-        self.assertIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Custom", "store_name": "Amazon"', str(res.data))
-        self.assertIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Custom', 'Amazon'), shopping_lists(res))
+        self.assertIn('Water Bottle', item_titles(res))
 
     def test_search_shopping_list_by_item_name_keyword_3_error(self):
         """
@@ -344,7 +346,315 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         res = self.client().get('/api/v1/searchShoppingListByItemName')
         self.assertEqual(res.status_code, 404)
-        self.assertNotIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Grocery New", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"shopping_list_title": "Custom", "store_name": "Amazon"', str(res.data))
-        self.assertNotIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertNotIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Grocery New', 'Amazon'), shopping_lists(res))
+        self.assertNotIn(('Custom', 'Amazon'), shopping_lists(res))
+        self.assertNotIn('Water Bottle', item_titles(res))
+
+    def test_get_all_shopping_list_paginated(self):
+        """
+        Unittest: Get all shopping lists one page at a time
+        Following next_cursor returns every shopping list once
+        :return:
+        """
+        self.create_shopping_list()
+        self.add_item_in_shopping_list()
+
+        res = self.client().get('/api/v1/allShoppingList?limit=2')
+        self.assertEqual(res.status_code, 200)
+        data = json.loads(res.data)
+        self.assertEqual(['Grocery', 'Grocery New'],
+                         [shopping_list['shopping_list_title'] for shopping_list in data['shopping_lists']])
+        self.assertIsNotNone(data['next_cursor'])
+
+        res = self.client().get('/api/v1/allShoppingList?limit=2&cursor=' + data['next_cursor'])
+        self.assertEqual(res.status_code, 200)
+        data = json.loads(res.data)
+        self.assertEqual(['Custom'], [shopping_list['shopping_list_title'] for shopping_list in data['shopping_lists']])
+        self.assertIn('Rice 1 KG Bag', item_titles(res))
+        self.assertIsNone(data['next_cursor'])
+
+    def test_search_shopping_list_by_item_name_keyword_paginated(self):
+        """
+        Unittest: Search all shopping list having given item containing keyword in title
+        Paginated with limit
+        :return:
+        """
+        self.create_shopping_list()
+        self.add_item_in_shopping_list()
+
+        res = self.client().get('/api/v1/searchShoppingListByItemName/Water?limit=1')
+        self.assertEqual(res.status_code, 200)
+        data = json.loads(res.data)
+        self.assertEqual(['Grocery'], [shopping_list['shopping_list_title'] for shopping_list in data['shopping_lists']])
+
+        res = self.client().get('/api/v1/searchShoppingListByItemName/Water?limit=1&cursor=' + data['next_cursor'])
+        data = json.loads(res.data)
+        self.assertEqual(['Grocery New'],
+                         [shopping_list['shopping_list_title'] for shopping_list in data['shopping_lists']])
+        self.assertIsNone(data['next_cursor'])
+
+    def test_get_all_shopping_list_paginated_error(self):
+        """
+        Unittest: Get all shopping lists one page at a time
+        Invalid limit and cursor
+        :return:
+        """
+        res = self.client().get('/api/v1/allShoppingList?limit=0')
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('limit must be a positive integer', str(res.data))
+
+        res = self.client().get('/api/v1/allShoppingList?cursor=not_a_cursor')
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('Invalid cursor', str(res.data))
+
+    def test_get_all_shopping_list_stream(self):
+        """
+        Unittest: Get all shopping lists as a streamed response
+        Streamed json is the same as the regular response
+        :return:
+        """
+        res = self.client().get('/api/v1/allShoppingList?stream=true')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([], json.loads(res.data))
+
+        self.create_shopping_list()
+        self.add_item_in_shopping_list()
+
+        res = self.client().get('/api/v1/allShoppingList?stream=true')
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.is_streamed)
+        self.assertEqual(json.loads(self.client().get('/api/v1/allShoppingList').data), json.loads(res.data))
+
+    def test_get_all_shopping_list_stream_error(self):
+        """
+        Unittest: Get all shopping lists as a streamed response
+        Stream combined with pagination
+        :return:
+        """
+        res = self.client().get('/api/v1/allShoppingList?stream=true&limit=1')
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('stream can not be combined with limit or cursor', str(res.data))
+
+    def test_get_shopping_list_with_title_not_modified(self):
+        """
+        Unittest: Get shopping list with title
+        If-None-Match with the current ETag gets 304 until the shopping list changes
+        :return:
+        """
+        self.create_shopping_list()
+
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery')
+        etag = res.headers['ETag']
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery', headers={'If-None-Match': etag})
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(b'', res.data)
+
+        # without the response cache the revisions decide
+        self.app.extensions['response_cache'] = None
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery', headers={'If-None-Match': etag})
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(etag, res.headers['ETag'])
+
+        self.add_item_in_shopping_list()
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery', headers={'If-None-Match': etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(etag, res.headers['ETag'])
+        self.assertIn('Water Bottle', item_titles(res))
+
+    def test_get_shopping_list_with_title_etag_changes_with_item_titles(self):
+        """
+        Unittest: Get shopping list with title
+        Renaming an item of the shopping list changes the ETag, the rendered one matches If-None-Match
+        :return:
+        """
+        self.create_shopping_list()
+        self.add_item_in_shopping_list()
+        self.app.extensions['response_cache'] = None
+        etag = self.client().get('/api/v1/shoppingListByTitle/Grocery').headers['ETag']
+
+        with self.app.app_context():
+            Item.query.get(1).title = 'Still Water'
+            db.session.commit()
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery', headers={'If-None-Match': etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('Still Water', item_titles(res))
+        self.assertNotEqual(etag, res.headers['ETag'])
+
+        etag = res.headers['ETag']
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery', headers={'If-None-Match': etag})
+        self.assertEqual(res.status_code, 304)
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery?fields=shopping_list_title,items')
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery?fields=shopping_list_title,items',
+                                headers={'If-None-Match': res.headers['ETag']})
+        self.assertEqual(res.status_code, 304)
+
+    def test_get_all_shopping_list_etag_changes_with_lists(self):
+        """
+        Unittest: Get all shopping lists
+        ETag changes when a shopping list is updated or deleted
+        :return:
+        """
+        self.create_shopping_list()
+        etag = self.client().get('/api/v1/allShoppingList').headers['ETag']
+
+        self.client().put(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({"id": 3, "title": "Custom New", "store": ""}))
+        updated_etag = self.client().get('/api/v1/allShoppingList').headers['ETag']
+        self.assertNotEqual(etag, updated_etag)
+
+        self.client().delete(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({"id": 3}))
+        self.assertNotIn(self.client().get('/api/v1/allShoppingList').headers['ETag'], (etag, updated_etag))
+        self.assertNotEqual(updated_etag, self.client().get('/api/v1/allShoppingList?limit=2').headers['ETag'])
+
+    def test_get_all_shopping_list_etag_after_recreate(self):
+        """
+        Unittest: Get all shopping lists
+        A shopping list created after deleting the last one gets a new id, the ETag of the deleted one does not match
+        :return:
+        """
+        self.create_shopping_list()
+        self.app.extensions['response_cache'] = None
+        etag = self.client().get('/api/v1/allShoppingList').headers['ETag']
+
+        self.client().delete(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({"id": 3}))
+        res = self.client().post(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({'title': 'Party', 'store': 'Costco'}))
+        self.assertEqual(4, json.loads(res.data)['shopping_list_id'])
+
+        res = self.client().get('/api/v1/allShoppingList', headers={'If-None-Match': etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertIn(('Party', 'Costco'), shopping_lists(res))
+
+    def test_get_all_shopping_list_query_headers(self):
+        """
+        Unittest: Get all shopping lists
+        X-DB-Queries does not grow with the number of shopping lists and items,
+        cached responses only read the data version
+        :return:
+        """
+        self.create_shopping_list()
+        res = self.client().get('/api/v1/allShoppingList')
+        queries = res.headers['X-DB-Queries']
+        self.assertGreaterEqual(float(res.headers['X-DB-Time']), 0)
+
+        self.add_item_in_shopping_list()
+        res = self.client().get('/api/v1/allShoppingList')
+        self.assertEqual(queries, res.headers['X-DB-Queries'])
+        res = self.client().get('/api/v1/allShoppingList')
+        self.assertEqual('1', res.headers['X-DB-Queries'])
+
+    def test_slow_query_is_logged(self):
+        """
+        Unittest: Statements slower than SLOW_QUERY_THRESHOLD are logged with their parameters
+        :return:
+        """
+        self.app.config['SLOW_QUERY_THRESHOLD'] = 0
+        with self.assertLogs(self.app.logger, level='WARNING') as logs:
+            self.client().get('/api/v1/shoppingListByTitle/Grocery')
+        self.assertIn("GET /api/v1/shoppingListByTitle/Grocery", logs.output[0])
+        self.assertTrue(any("'Grocery'" in line for line in logs.output))
+
+    def get_statements(self, url):
+        """
+        Helper method to get url, recording the executed statements
+        :param url:
+        :return: response, statements
+        """
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with self.app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            res = self.client().get(url)
+        finally:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+        return res, statements
+
+    def test_get_all_shopping_list_fields(self):
+        """
+        Unittest: Get all shopping lists with the selected fields only
+        Without items neither shopping list items nor items are read and only the selected columns are
+        :return:
+        """
+        self.create_shopping_list()
+        self.add_item_in_shopping_list()
+
+        res, statements = self.get_statements('/api/v1/allShoppingList?fields=shopping_list_title,store_name')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([{'shopping_list_title': 'Grocery', 'store_name': 'Amazon'},
+                          {'shopping_list_title': 'Grocery New', 'store_name': 'Amazon'},
+                          {'shopping_list_title': 'Custom', 'store_name': 'Amazon'}], json.loads(res.data))
+        self.assertFalse([statement for statement in statements if 'item' in statement])
+        self.assertFalse([statement for statement in statements if 'actual_total' in statement])
+
+        res = self.client().get('/api/v1/allShoppingList?fields=item_count&limit=2')
+        data = json.loads(res.data)
+        self.assertEqual([{'item_count': 2}, {'item_count': 1}], data['shopping_lists'])
+        res = self.client().get('/api/v1/allShoppingList?fields=item_count&limit=2&cursor=' + data['next_cursor'])
+        self.assertEqual({'shopping_lists': [{'item_count': 1}], 'next_cursor': None}, json.loads(res.data))
+
+        res = self.client().get('/api/v1/searchShoppingListsByTitle/Groc?include=')
+        self.assertEqual(['Grocery', 'Grocery New'], [row['shopping_list_title'] for row in json.loads(res.data)])
+        self.assertNotIn('items', json.loads(res.data)[0])
+
+    def test_get_shopping_list_item_fields(self):
+        """
+        Unittest: Get shopping lists with the selected item fields, include=items gives the full output
+        :return:
+        """
+        self.create_shopping_list()
+        self.add_item_in_shopping_list()
+
+        res = self.client().get('/api/v1/shoppingListByItemId/4?fields=shopping_list_title,items.item_title,'
+                                'items.quantity')
+        self.assertEqual([{'shopping_list_title': 'Grocery', 'items': [{'item_title': 'Water Bottle', 'quantity': 1},
+                                                                        {'item_title': 'Rice 2 KG Bag',
+                                                                         'quantity': 1}]}], json.loads(res.data))
+
+        res, statements = self.get_statements('/api/v1/searchShoppingListByItemName/Rice?fields=items.quantity')
+        self.assertEqual([{'items': [{'quantity': 1}, {'quantity': 1}]}, {'items': [{'quantity': 1}]}],
+                         json.loads(res.data))
+        self.assertFalse([statement for statement in statements if 'actual_item_price' in statement])
+
+        for path in ('/api/v1/allShoppingList', '/api/v1/shoppingListByTitle/Grocery',
+                     '/api/v1/allShoppingList?limit=2'):
+            separator = '&' if '?' in path else '?'
+            full = json.loads(self.client().get(path).data)
+            self.assertEqual(full, json.loads(self.client().get(path + separator + 'include=items').data))
+            self.assertEqual(full, json.loads(self.client().get(
+                path + separator + 'fields=shopping_list_title,store_name,item_count,total_quantity,actual_total,'
+                                   'discounted_total,items').data))
+
+        res = self.client().get('/api/v1/allShoppingList?stream=true&fields=store_name&include=items')
+        self.assertEqual(json.loads(self.client().get('/api/v1/allShoppingList?fields=store_name,items').data),
+                         json.loads(res.data))
+
+    def test_get_all_shopping_list_fields_error(self):
+        """
+        Unittest: Get all shopping lists with unknown fields or includes
+        :return:
+        """
+        res = self.client().get('/api/v1/allShoppingList?fields=title')
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('fields must be a comma separated list of shopping_list_title', str(res.data))
+
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery?include=store')
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual({'message': {'include': 'include must be a comma separated list of items'}},
+                         json.loads(res.data))
+
@@ -2,6 +2,7 @@ import unittest
 import json
 from app import create_app, db
 from app.models import Item, UnitMeasurement
+from tests import item_titles, shopping_lists
 
 
 class ShoppingListAPITestCase(unittest.TestCase):
@@ -190,6 +191,28 @@ class ShoppingListAPITestCase(unittest.TestCase):
         self.assertEqual(res.status_code, 400)
         self.assertIn('invalid literal for int', str(res.data))
 
+    def test_shopping_list_update_error_4(self):
+        """
+        Unittest: Update shopping list: failed
+        Another shopping list already has the title and store
+        :return:
+        """
+        self.client().post(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({'title': 'Grocery', 'store': 'Amazon'}))
+        self.client().post(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({'title': 'Grocery New', 'store': 'Amazon'}))
+
+        res = self.client().put(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({"id": 2, "title": "Grocery", "store": ""}))
+        self.assertEqual(res.status_code, 409)
+        self.assertIn('Shopping List already exist', str(res.data))
+
     def test_shopping_list_delete(self):
         """
         Unittest: Delete shopping list: successful
@@ -248,8 +271,8 @@ class ShoppingListAPITestCase(unittest.TestCase):
             data=json.dumps({"shopping_list_id": 1, "item_id": 1, "quantity": 1}))
 
         self.assertEqual(res.status_code, 201)
-        self.assertIn('"shopping_list_title": "Grocery", "store_name": "Amazon"', str(res.data))
-        self.assertIn('"item_title": "Water Bottle"', str(res.data))
+        self.assertIn(('Grocery', 'Amazon'), shopping_lists(res))
+        self.assertIn('Water Bottle', item_titles(res))
 
     def test_shopping_list_add_item_error_1(self):
         """
@@ -340,3 +363,178 @@ class ShoppingListAPITestCase(unittest.TestCase):
 
         self.assertEqual(res.status_code, 409)
         self.assertIn('Item does not exist', str(res.data))
+
+    def test_shopping_list_add_items(self):
+        """
+        Unittest: Add many items in shopping list: successful
+        Repeated items are added up
+        :return:
+        """
+        self.client().post(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({'title': 'Grocery', 'store': 'Amazon'}))
+
+        res = self.client().put(
+            '/api/v1/shoppingListItems',
+            content_type='application/json',
+            data=json.dumps({"shopping_list_id": 1, "items": [{"item_id": 1, "quantity": 2},
+                                                              {"item_id": 4, "quantity": 1},
+                                                              {"item_id": 1, "quantity": 1}]}))
+
+        self.assertEqual(res.status_code, 201)
+        data = json.loads(res.data)
+        self.assertEqual('Grocery', data['shopping_list_title'])
+        self.assertEqual({'Water Bottle': 3, 'Rice 2 KG Bag': 1},
+                         {item['item_title']: item['quantity'] for item in data['items']})
+        self.assertEqual(300, data['items'][0]['actual_total_price'])
+
+    def test_shopping_list_add_items_error_1(self):
+        """
+        Unittest: Add many items in shopping list: failed
+        Items are not a list of item_id and quantity
+        :return:
+        """
+        res = self.client().put(
+            '/api/v1/shoppingListItems',
+            content_type='application/json',
+            data=json.dumps({"shopping_list_id": 1, "items": [{"item_id": 1}]}))
+
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('items must be a list of item_id and quantity', str(res.data))
+
+        res = self.client().put(
+            '/api/v1/shoppingListItems',
+            content_type='application/json',
+            data=json.dumps({"shopping_list_id": 1, "items": []}))
+
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('items is not provided', str(res.data))
+
+        res = self.client().put(
+            '/api/v1/shoppingListItems',
+            content_type='application/json',
+            data=json.dumps({"shopping_list_id": 1, "items": [{"item_id": None, "quantity": 1}]}))
+
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual({'message': {'items': 'items item_id must be an integer'}}, json.loads(res.data))
+
+        res = self.client().put(
+            '/api/v1/shoppingListItems',
+            content_type='application/json',
+            data=json.dumps({"shopping_list_id": 1, "items": [{"item_id": 1, "quantity": [2]}]}))
+
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual({'message': {'items': 'items quantity must be an integer'}}, json.loads(res.data))
+
+    def test_shopping_list_add_items_error_2(self):
+        """
+        Unittest: Add many items in shopping list: failed
+        One of the items does not exist
+        :return:
+        """
+        self.client().post(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({'title': 'Grocery', 'store': 'Amazon'}))
+
+        res = self.client().put(
+            '/api/v1/shoppingListItems',
+            content_type='application/json',
+            data=json.dumps({"shopping_list_id": 1, "items": [{"item_id": 1, "quantity": 1},
+                                                              {"item_id": 1000, "quantity": 1}]}))
+
+        self.assertEqual(res.status_code, 409)
+        self.assertIn('Item does not exist', str(res.data))
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery')
+        self.assertNotIn('Water Bottle', item_titles(res))
+
+    def test_shopping_lists_creation(self):
+        """
+        Unittest: Add many shopping lists: successful
+        Existing and repeated shopping lists are reported as conflicts
+        :return:
+        """
+        self.client().post(
+            '/api/v1/shoppingList',
+            content_type='application/json',
+            data=json.dumps({'title': 'Grocery', 'store': 'Amazon'}))
+
+        res = self.client().post(
+            '/api/v1/shoppingLists',
+            content_type='application/json',
+            data=json.dumps({'shopping_lists': [{'title': 'Grocery', 'store': 'Amazon'},
+                                                {'title': 'Grocery', 'store': 'Walmart'},
+                                                {'title': 'Custom', 'store': 'Amazon'},
+                                                {'title': 'Grocery', 'store': 'Walmart'}]}))
+        self.assertEqual(res.status_code, 201)
+        data = json.loads(res.data)['shopping_lists']
+        self.assertEqual('Shopping List already exist', data[0]['message'])
+        self.assertEqual([2, 3], [data[1]['shopping_list_id'], data[2]['shopping_list_id']])
+        self.assertEqual('Shopping List already exist', data[3]['message'])
+
+        res = self.client().get('/api/v1/shoppingListByTitle/Grocery')
+        self.assertIn(('Grocery', 'Walmart'), shopping_lists(res))
+
+    def test_shopping_lists_creation_error_1(self):
+        """
+        Unittest: Add many shopping lists: failed
+        Entry without store
+        :return:
+        """
+        res = self.client().post(
+            '/api/v1/shoppingLists',
+            content_type='application/json',
+            data=json.dumps({'shopping_lists': [{'title': 'Grocery', 'store': 'Amazon'}, {'title': 'Custom'}]}))
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('shopping_lists must be a list of title and store', str(res.data))
+
+    def test_shopping_lists_delete(self):
+        """
+        Unittest: Delete many shopping lists: successful
+        Shopping lists which do not exist are reported
+        :return:
+        """
+        self.client().post(
+            '/api/v1/shoppingLists',
+            content_type='application/json',
+            data=json.dumps({'shopping_lists': [{'title': 'Grocery', 'store': 'Amazon'},
+                                                {'title': 'Grocery', 'store': 'Walmart'}]}))
+        self.client().put(
+            '/api/v1/shoppingListItem',
+            content_type='application/json',
+            data=json.dumps({'shopping_list_id': 1, 'item_id': 1, 'quantity': 2}))
+
+        res = self.client().delete(
+            '/api/v1/shoppingLists',
+            content_type='application/json',
+            data=json.dumps({'ids': [1, 5]}))
+        self.assertEqual(res.status_code, 200)
+        data = json.loads(res.data)['shopping_lists']
+        self.assertEqual({'shopping_list_id': 1}, data[0])
+        self.assertEqual('Shopping List does not exist', data[1]['message'])
+
+        res = self.client().get('/api/v1/allShoppingList')
+        self.assertNotIn('Amazon', [store_name for _, store_name in shopping_lists(res)])
+        self.assertIn('Walmart', [store_name for _, store_name in shopping_lists(res)])
+
+    def test_shopping_lists_delete_error_1(self):
+        """
+        Unittest: Delete many shopping lists: failed
+        Empty list of ids
+        :return:
+        """
+        res = self.client().delete(
+            '/api/v1/shoppingLists',
+            content_type='application/json',
+            data=json.dumps({'ids': []}))
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('ids is not provided', str(res.data))
+
+        for ids in ([None], [[1]]):
+            res = self.client().delete(
+                '/api/v1/shoppingLists',
+                content_type='application/json',
+                data=json.dumps({'ids': ids}))
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual({'message': {'ids': 'ids entry must be an integer'}}, json.loads(res.data))
@@ -0,0 +1,140 @@
+import unittest
+import json
+from datetime import datetime
+from app import create_app, db
+from app.models import Item, UnitMeasurement, ShoppingList
+
+
+class ShoppingListSummaryTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Unittest setup method to initialize app in testing mode
+        and create test data: Grocery at Amazon in January with Water Bottle x2 and Rice 1 KG Bag,
+        Custom at Amazon in February with Water Bottle, Empty at Walmart in March without items.
+        :return:
+        """
+        self.app = create_app("testing")
+        self.client = self.app.test_client
+
+        with self.app.app_context():
+            db.create_all()
+            UnitMeasurement.insert_unit_measurement()
+            Item.insert_items()
+            db.session.commit()
+
+        for title, store_name, items in (('Grocery', 'Amazon', [{'item_id': 1, 'quantity': 2},
+                                                                 {'item_id': 2, 'quantity': 1}]),
+                                         ('Custom', 'Amazon', [{'item_id': 1, 'quantity': 1}]),
+                                         ('Empty', 'Walmart', [])):
+            res = self.client().post('/api/v1/shoppingList', content_type='application/json',
+                                     data=json.dumps({'title': title, 'store': store_name}))
+            if items:
+                self.client().put('/api/v1/shoppingListItems', content_type='application/json',
+                                  data=json.dumps({'shopping_list_id': json.loads(res.data)['shopping_list_id'],
+                                                   'items': items}))
+        with self.app.app_context():
+            for shopping_list_id, month in ((1, 1), (2, 2), (3, 3)):
+                ShoppingList.query.get(shopping_list_id).created_time = datetime(2021, month, 15, 12)
+            db.session.commit()
+
+    def tearDown(self):
+        """
+        Unittest tear down method to remove data
+        :return:
+        """
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_store_summary(self):
+        """
+        Unittest: Totals per store, in one query
+        :return:
+        """
+        res = self.client().get('/api/v1/summary/stores')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([{'store_name': 'Amazon', 'shopping_list_count': 2, 'item_count': 3, 'total_quantity': 4,
+                           'actual_total': 500.0, 'discounted_total': 493.0},
+                          {'store_name': 'Walmart', 'shopping_list_count': 1, 'item_count': 0, 'total_quantity': 0,
+                           'actual_total': 0.0, 'discounted_total': 0.0}], json.loads(res.data))
+        # the data version read of the response cache and the report
+        self.assertEqual('2', res.headers['X-DB-Queries'])
+
+    def test_item_summary(self):
+        """
+        Unittest: Totals per item
+        :return:
+        """
+        res = self.client().get('/api/v1/summary/items')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([{'item_id': 1, 'item_title': 'Water Bottle', 'shopping_list_count': 2, 'total_quantity': 3,
+                           'actual_total': 300.0, 'discounted_total': 297.0},
+                          {'item_id': 2, 'item_title': 'Rice 1 KG Bag', 'shopping_list_count': 1,
+                           'total_quantity': 1, 'actual_total': 200.0, 'discounted_total': 196.0}],
+                         json.loads(res.data))
+        # the data version read of the response cache and the report
+        self.assertEqual('2', res.headers['X-DB-Queries'])
+
+    def test_shopping_list_summary(self):
+        """
+        Unittest: Totals per shopping list match the totals kept on the shopping lists, paginated
+        :return:
+        """
+        res = self.client().get('/api/v1/summary/shoppingLists')
+        self.assertEqual(res.status_code, 200)
+        data = json.loads(res.data)
+        self.assertEqual(['Grocery', 'Custom', 'Empty'], [row['shopping_list_title'] for row in data])
+        lists = json.loads(self.client().get('/api/v1/allShoppingList').data)
+        for row, shopping_list in zip(data, lists):
+            for field in ('store_name', 'item_count', 'total_quantity', 'actual_total', 'discounted_total'):
+                self.assertEqual(shopping_list[field], row[field])
+
+        res = self.client().get('/api/v1/summary/shoppingLists?limit=2')
+        page = json.loads(res.data)
+        self.assertEqual(data[:2], page['shopping_lists'])
+        res = self.client().get('/api/v1/summary/shoppingLists?limit=2&cursor=' + page['next_cursor'])
+        self.assertEqual({'shopping_lists': data[2:], 'next_cursor': None}, json.loads(res.data))
+
+    def test_summary_created_time_range(self):
+        """
+        Unittest: created_from is inclusive, created_to is exclusive and a date ends after that day
+        :return:
+        """
+        res = self.client().get('/api/v1/summary/stores?created_from=2021-02-01&created_to=2021-03-15')
+        self.assertEqual([{'store_name': 'Amazon', 'shopping_list_count': 1, 'item_count': 1, 'total_quantity': 1,
+                           'actual_total': 100.0, 'discounted_total': 99.0},
+                          {'store_name': 'Walmart', 'shopping_list_count': 1, 'item_count': 0, 'total_quantity': 0,
+                           'actual_total': 0.0, 'discounted_total': 0.0}], json.loads(res.data))
+
+        res = self.client().get('/api/v1/summary/stores?created_to=2021-03-15T12:00:00')
+        self.assertEqual(['Amazon'], [row['store_name'] for row in json.loads(res.data)])
+
+        res = self.client().get('/api/v1/summary/items?created_to=2021-01-15T13:00:00%2B02:00')
+        self.assertEqual([], json.loads(res.data))
+        res = self.client().get('/api/v1/summary/items?created_to=2021-01-15')
+        self.assertEqual([2, 1], [row['total_quantity'] for row in json.loads(res.data)])
+        res = self.client().get('/api/v1/summary/items?created_to=20210115')
+        self.assertEqual([2, 1], [row['total_quantity'] for row in json.loads(res.data)])
+        res = self.client().get('/api/v1/summary/items?created_to=20210115T000000')
+        self.assertEqual([], json.loads(res.data))
+
+        res = self.client().get('/api/v1/summary/shoppingLists?created_from=2021-01-16T00:00:00')
+        self.assertEqual(['Custom', 'Empty'], [row['shopping_list_title'] for row in json.loads(res.data)])
+
+    def test_summary_error(self):
+        """
+        Unittest: Invalid dates
+        :return:
+        """
+        res = self.client().get('/api/v1/summary/stores?created_from=January')
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual({'message': {'created_from': 'created_from must be an ISO 8601 date or date and time'}},
+                         json.loads(res.data))
+
+        res = self.client().get('/api/v1/summary/shoppingLists?limit=0')
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('limit must be a positive integer', str(res.data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
 import unittest
+from unittest import mock
+from sqlalchemy import event
 from app import create_app, db
-from app.models import Item, UnitMeasurement, ShoppingList
+from app.models import Item, UnitMeasurement, ShoppingList, ShoppingListItems
 from app.service import shopping_service
+from app.service.fieldsets import create_fieldset
 
 
 class ModelTestCase(unittest.TestCase):
@@ -235,4 +238,198 @@ class ModelTestCase(unittest.TestCase):
         """
         res = shopping_service.search_shopping_list_by_item_name_keyword('water')
         self.assertNotIn('test_title', str(res))
-        self.assertNotIn('Water Bottle', str(res))
\ No newline at end of file
+        self.assertNotIn('Water Bottle', str(res))
+
+    def count_queries(self, func, *args):
+        """
+        Helper method to count the statements executed while calling func
+        :param func:
+        :param args:
+        :return: count
+        """
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            func(*args)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        return len(statements)
+
+    def add_shopping_lists_with_items(self, store_name, count):
+        """
+        Helper method to add shopping lists having every item
+        :param store_name:
+        :param count:
+        :return:
+        """
+        items = Item.query.all()
+        for index in range(count):
+            shopping_service.add_shopping_list('test_title', '{}_{}'.format(store_name, index))
+        for shopping_list in ShoppingList.query.filter(ShoppingList.store_name.like(store_name + '%')).all():
+            for item in items:
+                shopping_service.add_item_to_shopping_list(shopping_list, item, 1)
+
+    def test_read_query_count_does_not_grow_with_result_size(self):
+        """
+        Unittest : Read methods issue the same number of queries for one or many shopping lists
+        :return:
+        """
+        self.add_shopping_lists_with_items('first_store', 1)
+        # first keyword searches check once if the full text search tables exist and build the item index
+        shopping_service.search_shopping_list_by_title_keyword('test')
+        shopping_service.search_shopping_list_by_item_name_keyword('water')
+        single = [self.count_queries(shopping_service.get_all_shopping_list),
+                  self.count_queries(shopping_service.get_shopping_list_by_title, 'test_title'),
+                  self.count_queries(shopping_service.search_shopping_list_by_title_keyword, 'test'),
+                  self.count_queries(shopping_service.get_shopping_list_by_item_id, 1),
+                  self.count_queries(shopping_service.search_shopping_list_by_item_name_keyword, 'water')]
+
+        self.add_shopping_lists_with_items('second_store', 5)
+        many = [self.count_queries(shopping_service.get_all_shopping_list),
+                self.count_queries(shopping_service.get_shopping_list_by_title, 'test_title'),
+                self.count_queries(shopping_service.search_shopping_list_by_title_keyword, 'test'),
+                self.count_queries(shopping_service.get_shopping_list_by_item_id, 1),
+                self.count_queries(shopping_service.search_shopping_list_by_item_name_keyword, 'water')]
+
+        self.assertEqual(single, many)
+        # item name searches read the item version first
+        self.assertTrue(max(many[:4]) <= 2)
+        self.assertTrue(many[4] <= 3)
+        self.assertEqual(len(shopping_service.get_all_shopping_list()), 6)
+
+    def test_iter_all_shopping_list(self):
+        """
+        Unittest : Iterate all shopping lists in batches - success
+        :return:
+        """
+        self.add_shopping_lists_with_items('test_store', 3)
+
+        res = list(shopping_service.iter_all_shopping_list(2))
+        self.assertEqual(shopping_service.get_all_shopping_list(), res)
+        self.assertEqual(3, len(res))
+        self.assertEqual(12, len(res[2]['items']))
+
+    def test_search_shopping_list_by_title_keyword_full_text(self):
+        """
+        Unittest : Search shopping list by title with multiple word prefixes, best match first
+        :return:
+        """
+        shopping_service.add_shopping_list('weekly grocery run', 'test_store')
+        shopping_service.add_shopping_list('grocery', 'test_store')
+        shopping_service.add_shopping_list('party snacks', 'test_store')
+
+        res = shopping_service.search_shopping_list_by_title_keyword('groc')
+        self.assertEqual(['grocery', 'weekly grocery run'], [data['shopping_list_title'] for data in res])
+
+        res = shopping_service.search_shopping_list_by_title_keyword('run week')
+        self.assertEqual(['weekly grocery run'], [data['shopping_list_title'] for data in res])
+
+        shopping_service.update_shopping_list(3, 'party drinks', None)
+        self.assertEqual([], shopping_service.search_shopping_list_by_title_keyword('snacks'))
+        self.assertEqual(1, len(shopping_service.search_shopping_list_by_title_keyword('drinks')))
+
+    def test_search_shopping_list_by_keyword_without_full_text(self):
+        """
+        Unittest : Search shopping list by title falls back to LIKE without FTS5
+        :return:
+        """
+        self.add_shooping_list('test_title', 'test_store')
+        shopping_list = ShoppingList.query.filter_by(title='test_title').first()
+        item = Item.query.filter_by(id=1).first()
+        shopping_service.add_item_to_shopping_list(shopping_list, item, 1)
+
+        with mock.patch.object(shopping_service, 'fts_enabled', return_value=False):
+            self.assertIn('test_title', str(shopping_service.search_shopping_list_by_title_keyword('t_ti')))
+            self.assertIn('Water Bottle', str(shopping_service.search_shopping_list_by_item_name_keyword('ter bot')))
+
+    def test_shopping_list_revision(self):
+        """
+        Unittest : Updating a shopping list or adding items bumps its revision,
+        the version of the output also has the titles of the rendered items
+        :return:
+        """
+        self.add_shooping_list('test_title', 'test_store')
+        self.assertEqual(([(1, 1)], []), shopping_service.get_all_shopping_list(revisions_only=True))
+
+        shopping_service.update_shopping_list(1, 'new_title', None)
+        shopping_list = shopping_service.get_shopping_list(1)
+        shopping_service.add_item_to_shopping_list(shopping_list, shopping_service.get_item(1), 1)
+        version = ([(1, 3)], [(1, 'Water Bottle')])
+        self.assertEqual(version, shopping_service.get_shopping_list_by_title('new_title', revisions_only=True))
+        self.assertEqual(version, shopping_service.get_all_shopping_list(1, None, revisions_only=True))
+        data, rendered_version = shopping_service.get_all_shopping_list(1, None, with_version=True)
+        self.assertEqual(version, rendered_version)
+        self.assertEqual(1, len(data['shopping_lists']))
+
+        fieldset = create_fieldset(['shopping_list_title'], None)
+        self.assertEqual(([(1, 3)], []), shopping_service.get_all_shopping_list(revisions_only=True,
+                                                                                fieldset=fieldset))
+        self.assertEqual(([(1, 3)], []), shopping_service.get_all_shopping_list(fieldset=fieldset,
+                                                                                with_version=True)[1])
+
+    def test_add_shopping_lists(self):
+        """
+        Unittest : Add many shopping lists - existing ones are not added again
+        :return:
+        """
+        self.add_shooping_list('test_title', 'test_store')
+        res = shopping_service.add_shopping_lists([('test_title', 'test_store'), ('test_title', 'other_store')])
+        self.assertEqual(["", 2], res)
+        self.assertEqual(2, ShoppingList.query.count())
+        self.assertEqual(1, ShoppingList.query.filter_by(store_name='other_store').first().revision)
+
+    def test_shopping_list_totals(self):
+        """
+        Unittest : Shopping list totals follow the items added to it
+        :return:
+        """
+        self.add_shooping_list('test_title', 'test_store')
+        shopping_list = shopping_service.get_shopping_list(1)
+        shopping_service.add_item_to_shopping_list(shopping_list, shopping_service.get_item(1), 2)
+        shopping_service.add_items_to_shopping_list(shopping_list, [(shopping_service.get_item(1), 1),
+                                                                    (shopping_service.get_item(2), 1)])
+
+        res = shopping_service.get_all_shopping_list()[0]
+        self.assertEqual(2, res['item_count'])
+        self.assertEqual(4, res['total_quantity'])
+        self.assertEqual(sum(item['actual_total_price'] for item in res['items']), res['actual_total'])
+        self.assertEqual(sum(item['discounted_total_price'] for item in res['items']), res['discounted_total'])
+        self.assertEqual(500, res['actual_total'])
+
+    def test_add_items_without_upsert(self):
+        """
+        Unittest : Databases without ON CONFLICT update existing items and insert the missing ones
+        :return:
+        """
+        self.add_shooping_list('test_title', 'test_store')
+        shopping_list = shopping_service.get_shopping_list(1)
+        with mock.patch.dict(shopping_service.upsert_dialects, clear=True):
+            shopping_service.add_item_to_shopping_list(shopping_list, shopping_service.get_item(1), 2)
+            res = shopping_service.add_items_to_shopping_list(shopping_list, [(shopping_service.get_item(1), 1),
+                                                                              (shopping_service.get_item(2), 1)])
+
+        self.assertEqual(2, res['item_count'])
+        self.assertEqual(4, res['total_quantity'])
+        self.assertEqual([3, 1], [item['quantity'] for item in res['items']])
+        self.assertEqual(sum(item['actual_total_price'] for item in res['items']), res['actual_total'])
+        self.assertEqual(sum(item['discounted_total_price'] for item in res['items']), res['discounted_total'])
+
+    def test_delete_shopping_lists(self):
+        """
+        Unittest : Delete many shopping lists with their items without loading the items
+        :return:
+        """
+        self.add_shopping_lists_with_items('first_store', 2)
+        self.add_shopping_lists_with_items('second_store', 1)
+        queries = self.count_queries(shopping_service.delete_shopping_lists, [1, 2])
+        # the lookup, the delete and the data version bump
+        self.assertEqual(3, queries)
+
+        res = shopping_service.delete_shopping_lists([3, 1, 3])
+        self.assertEqual([3, "", 3], res)
+        self.assertEqual(0, ShoppingList.query.count())
+        self.assertEqual(0, ShoppingListItems.query.count())